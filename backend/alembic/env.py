@@ -9,7 +9,7 @@ from alembic import context
 from app.db.session import engine
 from app.db.base import Base
 from app.models.contract import Contract  # noqa
-from app.models.portfolio import PortfolioItem  # noqa
+from app.models.portfolio import PortfolioItem, PortfolioSummary  # noqa
 
 from app.core.config import settings
 
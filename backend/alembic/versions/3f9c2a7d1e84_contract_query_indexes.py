@@ -0,0 +1,55 @@
+"""contract query indexes
+
+Revision ID: 3f9c2a7d1e84
+Revises: 148d21faa559
+Create Date: 2026-10-17 10:12:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1e84'
+down_revision: Union[str, Sequence[str], None] = '148d21faa559'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AVAILABLE = sa.text("status = 'Available'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contracts_status_id', 'contracts', ['status', 'id'], unique=False)
+    op.create_index('ix_contracts_available_price', 'contracts', ['status', 'price_per_mwh', 'id'], unique=False, postgresql_where=AVAILABLE, sqlite_where=AVAILABLE)
+    op.create_index('ix_contracts_available_quantity', 'contracts', ['status', 'quantity_mwh', 'id'], unique=False, postgresql_where=AVAILABLE, sqlite_where=AVAILABLE)
+    op.create_index('ix_contracts_available_delivery_start', 'contracts', ['status', 'delivery_start', 'id'], unique=False, postgresql_where=AVAILABLE, sqlite_where=AVAILABLE)
+    op.create_index('ix_contracts_type_location_start', 'contracts', ['energy_type', 'location', 'delivery_start'], unique=False)
+
+    # Redundant with the primary key or with a leading column of the indexes above.
+    op.drop_index(op.f('ix_contracts_id'), table_name='contracts')
+    op.drop_index(op.f('ix_contracts_status'), table_name='contracts')
+    op.drop_index(op.f('ix_contracts_energy_type'), table_name='contracts')
+    op.drop_index(op.f('ix_contracts_price_per_mwh'), table_name='contracts')
+    op.drop_index(op.f('ix_contracts_quantity_mwh'), table_name='contracts')
+    op.drop_index(op.f('ix_contracts_delivery_start'), table_name='contracts')
+    op.drop_index(op.f('ix_contracts_delivery_end'), table_name='contracts')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_contracts_delivery_end'), 'contracts', ['delivery_end'], unique=False)
+    op.create_index(op.f('ix_contracts_delivery_start'), 'contracts', ['delivery_start'], unique=False)
+    op.create_index(op.f('ix_contracts_quantity_mwh'), 'contracts', ['quantity_mwh'], unique=False)
+    op.create_index(op.f('ix_contracts_price_per_mwh'), 'contracts', ['price_per_mwh'], unique=False)
+    op.create_index(op.f('ix_contracts_energy_type'), 'contracts', ['energy_type'], unique=False)
+    op.create_index(op.f('ix_contracts_status'), 'contracts', ['status'], unique=False)
+    op.create_index(op.f('ix_contracts_id'), 'contracts', ['id'], unique=False)
+
+    op.drop_index('ix_contracts_type_location_start', table_name='contracts')
+    op.drop_index('ix_contracts_available_delivery_start', table_name='contracts', postgresql_where=AVAILABLE, sqlite_where=AVAILABLE)
+    op.drop_index('ix_contracts_available_quantity', table_name='contracts', postgresql_where=AVAILABLE, sqlite_where=AVAILABLE)
+    op.drop_index('ix_contracts_available_price', table_name='contracts', postgresql_where=AVAILABLE, sqlite_where=AVAILABLE)
+    op.drop_index('ix_contracts_status_id', table_name='contracts')
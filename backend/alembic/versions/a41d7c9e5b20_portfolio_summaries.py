@@ -0,0 +1,44 @@
+"""portfolio summaries
+
+Revision ID: a41d7c9e5b20
+Revises: 3f9c2a7d1e84
+Create Date: 2026-10-17 14:02:47.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d7c9e5b20'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('portfolio_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    # The energytype enum already exists on Postgres (created with contracts).
+    sa.Column('energy_type', sa.Enum('Solar', 'Wind', 'NaturalGas', 'Nuclear', 'Coal', 'Hydro', name='energytype').with_variant(postgresql.ENUM(name='energytype', create_type=False), 'postgresql'), nullable=False),
+    sa.Column('contracts', sa.Integer(), nullable=False),
+    sa.Column('capacity_mwh', sa.BigInteger(), nullable=False),
+    sa.Column('cost', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'energy_type')
+    )
+    # Backfill from the existing portfolios.
+    op.execute(
+        "INSERT INTO portfolio_summaries (user_id, energy_type, contracts, capacity_mwh, cost) "
+        "SELECT p.user_id, c.energy_type, count(*), sum(c.quantity_mwh), sum(c.quantity_mwh * c.price_per_mwh) "
+        "FROM portfolio_items p JOIN contracts c ON c.id = p.contract_id "
+        "GROUP BY p.user_id, c.energy_type"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('portfolio_summaries')
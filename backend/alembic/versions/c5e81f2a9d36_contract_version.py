@@ -0,0 +1,30 @@
+"""contract version
+
+Revision ID: c5e81f2a9d36
+Revises: a41d7c9e5b20
+Create Date: 2026-10-17 16:41:09.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81f2a9d36'
+down_revision: Union[str, Sequence[str], None] = 'a41d7c9e5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The server default fills existing rows without rewriting the table on
+    # Postgres 11+.
+    op.add_column('contracts', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contracts', 'version')
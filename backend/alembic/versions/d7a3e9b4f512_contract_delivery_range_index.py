@@ -0,0 +1,49 @@
+"""contract delivery range index
+
+Revision ID: d7a3e9b4f512
+Revises: c5e81f2a9d36
+Create Date: 2026-10-17 19:02:47.511093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3e9b4f512'
+down_revision: Union[str, Sequence[str], None] = 'c5e81f2a9d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DELIVERY_RANGE = sa.text("daterange(delivery_start, delivery_end, '[]')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # daterange() raises on an inverted window, so the index build would
+    # fail on such a row. Refuse to guess which end is wrong.
+    inverted = op.get_bind().execute(
+        sa.text('SELECT id FROM contracts WHERE delivery_start > delivery_end ORDER BY id LIMIT 20')
+    ).scalars().all()
+    if inverted:
+        raise RuntimeError(
+            'contracts with delivery_start after delivery_end must be fixed before this '
+            f'migration (ids: {", ".join(map(str, inverted))})'
+        )
+    if op.get_bind().dialect.name == 'postgresql':
+        # SQLite would need a table rebuild; the API rejects inverted windows there too.
+        op.create_check_constraint('ck_contracts_delivery_window', 'contracts', 'delivery_start <= delivery_end')
+        op.create_index('ix_contracts_delivery_range', 'contracts', [DELIVERY_RANGE], unique=False, postgresql_using='gist')
+    else:
+        op.create_index('ix_contracts_delivery_window', 'contracts', ['delivery_start', 'delivery_end'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_contracts_delivery_range', table_name='contracts', postgresql_using='gist')
+        op.drop_constraint('ck_contracts_delivery_window', 'contracts', type_='check')
+    else:
+        op.drop_index('ix_contracts_delivery_window', table_name='contracts')
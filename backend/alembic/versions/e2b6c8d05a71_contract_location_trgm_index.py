@@ -0,0 +1,34 @@
+"""contract location trigram index
+
+Revision ID: e2b6c8d05a71
+Revises: d7a3e9b4f512
+Create Date: 2026-10-17 20:14:05.630218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6c8d05a71'
+down_revision: Union[str, Sequence[str], None] = 'd7a3e9b4f512'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Other databases search locations in memory (see contracts_locations).
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_contracts_location_trgm', 'contracts', ['location'], unique=False, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_contracts_location_trgm', table_name='contracts', postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
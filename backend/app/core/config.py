@@ -5,12 +5,80 @@ class Settings(BaseSettings):
 
     ENV: str = "dev"
     DATABASE_URL: str
+    # Serve the contracts/portfolio routers from an AsyncSession instead of
+    # the threadpool + blocking Session path.
+    DB_ASYNC: bool = False
+    DATABASE_ASYNC_URL: str | None = None
+    # Connection pool, per worker process: a deployment holds up to
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) Postgres connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # "always" pings on every checkout, "idle" only once a connection has sat
+    # in the pool for DB_POOL_PING_IDLE_SECONDS, "never" relies on recycle.
+    DB_POOL_PRE_PING: str = "idle"
+    DB_POOL_PING_IDLE_SECONDS: float = 30.0
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    # PgBouncer transaction pooling: no client-side pool and no server-side
+    # prepared statements. Set statement_timeout on the role in this mode.
+    DB_PGBOUNCER: bool = False
+    # Comma-separated read replicas for the GET handlers, used round-robin.
+    # A replica is pinged every READ_REPLICA_CHECK_SECONDS and skipped for
+    # READ_REPLICA_RETRY_SECONDS after a failure. After a write, the writing
+    # client and this worker read from the primary for READ_YOUR_WRITES_SECONDS
+    # (keep it above the replication lag).
+    DATABASE_READ_URLS: str = ""
+    READ_REPLICA_CHECK_SECONDS: float = 5.0
+    READ_REPLICA_RETRY_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
     CORS_ORIGINS: str = "http://localhost:5173,https://kgrubic.github.io"
     JWT_SECRET: str = "dev-secret-change-me"
     JWT_EXPIRES_MINUTES: int = 60
+    # Verified tokens are remembered until their exp, keyed by signature.
+    JWT_CACHE_MAX_ENTRIES: int = 4096
+    COUNT_CACHE_TTL_SECONDS: float = 30.0
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+    READ_CACHE_TTL_SECONDS: float = 60.0
+    READ_CACHE_MAX_ENTRIES: int = 256
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 30
+    # Response compression: "gzip", "br" (brotli extra; gzip for clients that
+    # do not accept br) or "off". Bodies below the minimum go out as-is.
+    COMPRESSION: str = "gzip"
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Per-route latency, SQL and pool-wait metrics served at /api/metrics.
+    # Statements at or above SLOW_QUERY_MS are logged to app.db.slow_query.
+    METRICS_ENABLED: bool = True
+    SLOW_QUERY_MS: float | None = None
+    # Contract change feed at /api/contracts/changes. "memory" reaches the
+    # clients of the worker that made the write; "postgres" relays writes
+    # between workers with LISTEN/NOTIFY (needs psycopg 3).
+    CHANGE_FEED_BACKEND: str = "memory"
+    CHANGE_FEED_HISTORY: int = 1000
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0
+    BULK_INGEST_BATCH_SIZE: int = 1000
+    BULK_INGEST_MAX_ERRORS: int = 1000
+    EXPORT_BATCH_SIZE: int = 2000
+    # "sql" queries the database for every contract list; "columnar" serves
+    # lists, counts, price bounds and locations from an in-process NumPy copy
+    # (needs the columnar extra) that is reloaded at most this often.
+    CONTRACTS_READ_ENGINE: str = "sql"
+    COLUMNAR_MAX_AGE_SECONDS: float = 60.0
+    # /contracts/stats rollup: kept current by this worker's writes (and the
+    # change feed), rebuilt from the table at least this often.
+    STATS_CUBE_MAX_AGE_SECONDS: float = 300.0
+    # /contracts/locations/search: "trgm" ranks with pg_trgm (Postgres only),
+    # "memory" with an in-process name index; "auto" picks trgm on Postgres.
+    LOCATION_SEARCH_ENGINE: str = "auto"
 
     @property
     def cors_origins_list(self) -> list[str]:
         return [o.strip() for o in self.CORS_ORIGINS.split(",") if o.strip()]
 
+    @property
+    def read_urls_list(self) -> list[str]:
+        return [u.strip() for u in self.DATABASE_READ_URLS.split(",") if u.strip()]
+
 settings = Settings()
@@ -9,4 +9,6 @@ def setup_cors(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Paging handle for /portfolio/items and the validator for If-None-Match.
+        expose_headers=["X-Next-Before-Id", "ETag"],
     )
@@ -0,0 +1,67 @@
+import secrets
+import time
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+# Write counters are per process, so tags carry the process's boot id: a
+# restarted or different worker can never answer 304 for another's counter.
+_BOOT_ID = secrets.token_hex(4)
+
+
+def version_etag(version: int) -> str:
+    """Weak ETag for data that only changes when ``version`` is bumped.
+
+    Writes made through another worker never bump this process's counter, so
+    the tag also rolls over every HTTP_CACHE_MAX_AGE_SECONDS to bound how long
+    a client can keep revalidating stale data against it.
+    """
+    window = int(time.time() // max(settings.HTTP_CACHE_MAX_AGE_SECONDS, 1))
+    return f'W/"{_BOOT_ID}-{version}-{window}"'
+
+
+def record_etag(key: str, version: int) -> str:
+    """Weak ETag for one stored record with its own version column.
+
+    The version lives in the database, so the tag is the same on every
+    worker and only changes when that record does.
+    """
+    return f'W/"{key}-v{version}"'
+
+
+def cache_headers(etag: str, *, revalidate: bool = False) -> dict[str, str]:
+    """``revalidate`` responses may be stored but are checked on every use."""
+    if revalidate:
+        cache_control = "no-cache"
+    else:
+        cache_control = f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}"
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def set_cache_headers(response: Response, etag: str, *, revalidate: bool = False) -> None:
+    response.headers.update(cache_headers(etag, revalidate=revalidate))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of ``etag`` against the request's If-None-Match."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(request: Request, etag: str, *, revalidate: bool = False) -> Response | None:
+    """A bodyless 304 when the client already holds ``etag``, else None.
+
+    With a ``version_etag``, call it before any database work, so an
+    unchanged resource costs neither a query nor a payload. A ``record_etag``
+    comes from the record itself, so call it after the lookup: a missing
+    record must still be a 404, even for ``If-None-Match: *``.
+    """
+    if not etag_matches(request, etag):
+        return None
+    return Response(status_code=304, headers=cache_headers(etag, revalidate=revalidate))
@@ -0,0 +1,204 @@
+"""Per-route request timing and SQL counters, rendered in Prometheus text format.
+
+``MetricsMiddleware`` opens a ``RequestStats`` for each HTTP request in a
+context variable; the engine hooks in ``app.db.session`` and the timed pool in
+``app.db.pool`` add statement counts, DB time and pool wait to it, and the
+middleware folds it into ``registry`` under the matched route template once
+the response has been sent.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.slow_query")
+
+# Prometheus' default latency buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    __slots__ = ("scope", "statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        """The matched route template, never the raw path, to bound label cardinality."""
+        return route_template(self.scope)
+
+
+def route_template(scope: Scope) -> str:
+    """``/api/contracts/{contract_id}`` for ``/api/contracts/7``.
+
+    Routes of an included router only know their path below the include
+    prefix, so the prefix is taken from the request path: it is whatever
+    precedes the suffix the route's own pattern matches.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + template
+    return template
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def record_statement(seconds: float, statement: str) -> None:
+    """Called by the engine hooks after every cursor execute."""
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += seconds
+    if settings.SLOW_QUERY_MS is not None and seconds * 1000 >= settings.SLOW_QUERY_MS:
+        registry.count_slow_query()
+        logger.warning(
+            "slow query: %.1f ms route=%s sql=%s",
+            seconds * 1000,
+            stats.route if stats is not None else "-",
+            " ".join(statement.split())[:500],
+        )
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+class _RouteMetrics:
+    __slots__ = ("buckets", "count", "seconds", "statements", "db_seconds", "pool_wait_seconds", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.statuses: dict[int, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+        self.slow_queries = 0
+
+    def observe(self, method: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            key = (method, stats.route)
+            m = self._routes.get(key)
+            if m is None:
+                m = self._routes[key] = _RouteMetrics()
+            m.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            m.count += 1
+            m.seconds += seconds
+            m.statements += stats.statements
+            m.db_seconds += stats.db_seconds
+            m.pool_wait_seconds += stats.pool_wait_seconds
+            m.statuses[status] = m.statuses.get(status, 0) + 1
+
+    def count_slow_query(self) -> None:
+        with self._lock:
+            self.slow_queries += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.slow_queries = 0
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            family("http_requests_total", "counter", "Requests by route and status code.")
+            for (method, route), m in routes:
+                for status, n in sorted(m.statuses.items()):
+                    lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {n}')
+
+            family("http_request_duration_seconds", "histogram", "Request latency by route.")
+            for (method, route), m in routes:
+                labels = _labels(method, route)
+                cumulative = 0
+                for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), m.buckets):
+                    cumulative += n
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.seconds:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.count}")
+
+            for name, attr, help_text in (
+                ("http_request_sql_statements_total", "statements", "SQL statements executed while serving the route."),
+                ("http_request_db_seconds_total", "db_seconds", "Time spent in cursor execute while serving the route."),
+                ("http_request_pool_wait_seconds_total", "pool_wait_seconds", "Time spent waiting for a pooled connection."),
+            ):
+                family(name, "counter", help_text)
+                for (method, route), m in routes:
+                    value = getattr(m, attr)
+                    value = f"{value:.6f}" if isinstance(value, float) else value
+                    lines.append(f"{name}{{{_labels(method, route)}}} {value}")
+
+            family("db_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_MS.")
+            lines.append(f"db_slow_queries_total {self.slow_queries}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            registry.observe(scope["method"], status, time.perf_counter() - started, stats)
+
+
+def setup_metrics(app: FastAPI) -> None:
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
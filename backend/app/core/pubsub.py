@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class Event:
+    seq: int
+    data: Any
+
+
+# Put on a subscriber's queue when it fell too far behind; the stream should
+# tell the client to resynchronise and stop.
+LAGGED = object()
+
+
+@dataclass(eq=False)
+class Subscription:
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    lagged: bool = False
+
+
+class Broker:
+    """In-process fan-out of events to asyncio subscribers.
+
+    ``publish`` may be called from any thread (the sync services run on the
+    threadpool); delivery is handed to each subscriber's event loop. The last
+    ``history`` events are kept so a reconnecting subscriber can resume after
+    the sequence number it saw last.
+    """
+
+    def __init__(self, *, history: int = 1000, queue_size: int = 1000):
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+        self._history: deque[Event] = deque(maxlen=history)
+        self._seq = 0
+        self.queue_size = queue_size
+
+    def publish(self, data: Any) -> Event:
+        with self._lock:
+            self._seq += 1
+            event = Event(self._seq, data)
+            self._history.append(event)
+            # Scheduled under the lock so every subscriber sees seq order.
+            for sub in list(self._subscribers):
+                try:
+                    sub.loop.call_soon_threadsafe(self._deliver, sub, event)
+                except RuntimeError:
+                    # The subscriber's loop is closed; it will never unsubscribe.
+                    self._subscribers.discard(sub)
+        return event
+
+    @staticmethod
+    def _deliver(sub: Subscription, event: Event) -> None:
+        if sub.lagged:
+            return
+        if sub.queue.qsize() >= sub.queue.maxsize - 1:
+            sub.lagged = True
+            sub.queue.put_nowait(LAGGED)
+        else:
+            sub.queue.put_nowait(event)
+
+    def subscribe(self, after: int | None = None) -> tuple[Subscription, list[Event] | None]:
+        """Register a subscriber on the running loop.
+
+        Returns it with the retained events after sequence ``after`` (empty
+        when ``after`` is None), or None in place of the backlog when events
+        after ``after`` have already been dropped from history.
+        """
+        sub = Subscription(asyncio.Queue(maxsize=self.queue_size), asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(sub)
+            if after is None or after == self._seq:
+                return sub, []
+            if after > self._seq or not self._history or self._history[0].seq > after + 1:
+                return sub, None
+            return sub, [e for e in self._history if e.seq > after]
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._seq
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
@@ -0,0 +1,41 @@
+import json
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: pip install .[fastjson]
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON-encode plain dicts/lists of rows: dates as ISO strings, enums as
+    their values, Decimal as float. Uses orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse for handlers that build their own payload from row tuples.
+
+    Returning it from a route skips ``response_model`` validation, so the
+    payload must already have the documented shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
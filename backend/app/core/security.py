@@ -1,4 +1,5 @@
 import base64
+import binascii
 import hashlib
 import hmac
 import json
@@ -8,37 +9,54 @@ from typing import Any
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 security = HTTPBearer()
 
 
+_URLSAFE = bytes.maketrans(b"-_", b"+/")
+_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=").decode("ascii")
+
+# Successfully verified tokens: (secret, signature) -> (token, payload, exp).
+# Entries expire with the token, so a hit only skips the HMAC and JSON decode.
+_verified = TTLCache(maxsize=settings.JWT_CACHE_MAX_ENTRIES, ttl=settings.JWT_EXPIRES_MINUTES * 60)
+_signer_state: tuple[str, Any] | None = None
+
+
+def _signer():
+    """HMAC-SHA256 keyed with JWT_SECRET; callers ``copy()`` it per token."""
+    global _signer_state
+    secret = settings.JWT_SECRET
+    if _signer_state is None or _signer_state[0] != secret:
+        _signer_state = (secret, hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256))
+    return _signer_state[1]
+
+
+def _sign(signing_input: bytes) -> bytes:
+    mac = _signer().copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
 def _b64url_encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
 
 def _b64url_decode(data: str) -> bytes:
     padding = "=" * (-len(data) % 4)
-    return base64.urlsafe_b64decode(data + padding)
+    return binascii.a2b_base64((data + padding).encode("ascii").translate(_URLSAFE), strict_mode=True)
 
 
 def create_access_token(sub: str) -> str:
-    header = {"alg": "HS256", "typ": "JWT"}
     payload = {
         "sub": sub,
         "exp": int(time.time()) + settings.JWT_EXPIRES_MINUTES * 60,
     }
 
-    header_b64 = _b64url_encode(json.dumps(header, separators=(",", ":")).encode("utf-8"))
     payload_b64 = _b64url_encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
-    signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
-    signature = hmac.new(
-        settings.JWT_SECRET.encode("utf-8"),
-        signing_input,
-        hashlib.sha256,
-    ).digest()
-    signature_b64 = _b64url_encode(signature)
-    return f"{header_b64}.{payload_b64}.{signature_b64}"
+    signing_input = f"{_HEADER_B64}.{payload_b64}"
+    return f"{signing_input}.{_b64url_encode(_sign(signing_input.encode('ascii')))}"
 
 
 def decode_token(token: str) -> dict[str, Any]:
@@ -47,25 +65,37 @@ def decode_token(token: str) -> dict[str, Any]:
     except ValueError as exc:
         raise HTTPException(status_code=401, detail="Invalid token format") from exc
 
-    signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
-    expected_sig = hmac.new(
-        settings.JWT_SECRET.encode("utf-8"),
-        signing_input,
-        hashlib.sha256,
-    ).digest()
-    if not hmac.compare_digest(_b64url_encode(expected_sig), signature_b64):
+    now = int(time.time())
+    cache_key = (settings.JWT_SECRET, signature_b64)
+    cached = _verified.get(cache_key)
+    # The signature is only the lookup key: the whole token must match too, or
+    # a valid signature could be replayed over a different payload.
+    if cached is not None and hmac.compare_digest(cached[0], token):
+        if cached[2] < now:
+            raise HTTPException(status_code=401, detail="Token expired")
+        return dict(cached[1])
+
+    try:
+        signature = _b64url_decode(signature_b64)
+        signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+    except ValueError as exc:
+        raise HTTPException(status_code=401, detail="Invalid token signature") from exc
+    if not hmac.compare_digest(_sign(signing_input), signature):
         raise HTTPException(status_code=401, detail="Invalid token signature")
 
     try:
         payload = json.loads(_b64url_decode(payload_b64))
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         raise HTTPException(status_code=401, detail="Invalid token payload") from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=401, detail="Invalid token payload")
 
     exp = payload.get("exp")
-    if exp is None or int(exp) < int(time.time()):
+    if exp is None or int(exp) < now:
         raise HTTPException(status_code=401, detail="Token expired")
 
-    return payload
+    _verified.set(cache_key, (token, payload, int(exp)), ttl=int(exp) - now + 1)
+    return dict(payload)
 
 
 def get_current_user(
@@ -0,0 +1,226 @@
+"""Routing of read-only handlers to the DATABASE_READ_URLS replicas.
+
+Read routes depend on ``get_read_db`` / ``get_async_read_db`` instead of the
+primary session. Each request takes the next replica in round-robin order;
+a replica is pinged when it has not been checked for
+READ_REPLICA_CHECK_SECONDS and skipped for READ_REPLICA_RETRY_SECONDS after a
+failed ping. With no replicas configured, none healthy, or a request that
+must see recent writes, the session is opened on the primary.
+
+Recent writes: ``ReadYourWritesMiddleware`` gives any client whose write
+succeeded a short-lived cookie that pins its reads to the primary, and
+every contract write seen by this worker (its own or relayed by the change
+feed) pins the worker's reads for READ_YOUR_WRITES_SECONDS, so a lagging
+replica cannot be cached under the new write generation. Both assume
+replication lag stays below that window. ``X-Read-Consistency: strong``
+forces a primary read for a single request.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from fastapi import FastAPI, Request
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import session
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary"
+CONSISTENCY_HEADER = "x-read-consistency"
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class Replica:
+    def __init__(self, name: str, engine, sessionmaker):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = sessionmaker
+        self.checked_at = float("-inf")
+        self.down_until = float("-inf")
+
+
+class ReplicaSet:
+    """Round-robin choice among the replicas that last answered a ping."""
+
+    def __init__(
+        self,
+        primary,
+        replicas: list[Replica],
+        *,
+        check_interval: float,
+        retry_after: float,
+        primary_window: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.primary_window = primary_window
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._primary_until = float("-inf")
+
+    def note_write(self) -> None:
+        with self._lock:
+            self._primary_until = time.monotonic() + self.primary_window
+
+    def candidates(self, request: Request | None = None) -> list[Replica]:
+        """Replicas to try in order; empty when the read belongs on the primary."""
+        if not self.replicas or time.monotonic() < self._primary_until:
+            return []
+        if request is not None and (
+            request.cookies.get(READ_PRIMARY_COOKIE)
+            or request.headers.get(CONSISTENCY_HEADER, "").lower() == "strong"
+        ):
+            return []
+        now = time.monotonic()
+        start = next(self._next)
+        n = len(self.replicas)
+        ordered = (self.replicas[(start + i) % n] for i in range(n))
+        return [r for r in ordered if r.down_until <= now]
+
+    def claim_check(self, replica: Replica) -> bool:
+        """Whether the caller should ping ``replica`` now. Only one request
+        per interval gets True; the others use the replica meanwhile."""
+        now = time.monotonic()
+        with self._lock:
+            if now - replica.checked_at < self.check_interval:
+                return False
+            replica.checked_at = now
+            return True
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        logger.warning("read replica %s failed its health check: %s", replica.name, error)
+        replica.down_until = time.monotonic() + self.retry_after
+        replica.checked_at = float("-inf")
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        return {r.name: ("down" if r.down_until > now else "up") for r in self.replicas}
+
+
+def _ping(replica: Replica) -> None:
+    with replica.engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+
+
+async def _ping_async(replica: Replica) -> None:
+    async with replica.engine.connect() as conn:
+        await conn.exec_driver_sql("SELECT 1")
+
+
+def _options() -> dict:
+    return dict(
+        check_interval=settings.READ_REPLICA_CHECK_SECONDS,
+        retry_after=settings.READ_REPLICA_RETRY_SECONDS,
+        primary_window=settings.READ_YOUR_WRITES_SECONDS,
+    )
+
+
+def _name(url: str) -> str:
+    return url.partition("@")[2] or url.rpartition("/")[2]
+
+
+def _build_sync() -> ReplicaSet:
+    replicas = []
+    for url in settings.read_urls_list:
+        engine = create_engine(url, **session.engine_options(url))
+        session.install_engine_events(engine)
+        replicas.append(Replica(_name(url), engine, sessionmaker(bind=engine, autoflush=False, autocommit=False)))
+    return ReplicaSet(session.SessionLocal, replicas, **_options())
+
+
+def _build_async() -> ReplicaSet | None:
+    if not settings.DB_ASYNC:
+        return None
+    replicas = []
+    for url in settings.read_urls_list:
+        async_url = session.async_database_url(url)
+        engine = create_async_engine(async_url, **session.engine_options(async_url, is_async=True))
+        session.install_engine_events(engine.sync_engine)
+        replicas.append(Replica(
+            _name(url),
+            engine,
+            async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False),
+        ))
+    return ReplicaSet(session.AsyncSessionLocal, replicas, **_options())
+
+
+read_replicas = _build_sync()
+async_read_replicas = _build_async()
+
+
+def note_write() -> None:
+    """Keep this worker's reads on the primary while replicas catch up."""
+    read_replicas.note_write()
+    if async_read_replicas is not None:
+        async_read_replicas.note_write()
+
+
+def _open(replica_set: ReplicaSet, request: Request | None):
+    for replica in replica_set.candidates(request):
+        if replica_set.claim_check(replica):
+            try:
+                _ping(replica)
+            except Exception as e:
+                replica_set.mark_down(replica, e)
+                continue
+        return replica.sessionmaker()
+    return replica_set.primary()
+
+
+async def _open_async(replica_set: ReplicaSet, request: Request | None):
+    for replica in replica_set.candidates(request):
+        if replica_set.claim_check(replica):
+            try:
+                await _ping_async(replica)
+            except Exception as e:
+                replica_set.mark_down(replica, e)
+                continue
+        return replica.sessionmaker()
+    return replica_set.primary()
+
+
+def get_read_db(request: Request):
+    db = _open(read_replicas, request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    async with await _open_async(async_read_replicas, request) as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client's reads to the primary for a while after it wrote."""
+
+    def __init__(self, app, max_age: float):
+        self.app = app
+        self.cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={max(1, round(max_age))}; Path=/; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def setup_read_replicas(app: FastAPI) -> None:
+    if read_replicas.replicas:
+        app.add_middleware(ReadYourWritesMiddleware, max_age=settings.READ_YOUR_WRITES_SECONDS)
@@ -1,9 +1,106 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.core import metrics
 from app.core.config import settings
+from app.db.pool import TimedAsyncQueuePool, TimedQueuePool
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+def _backend(url: str) -> str:
+    backend = url.partition("://")[0].split("+", 1)[0]
+    return "postgresql" if backend == "postgres" else backend
+
+
+def _driver(url: str) -> str:
+    scheme = url.partition("://")[0]
+    return scheme.split("+", 1)[1] if "+" in scheme else ""
+
+
+def engine_options(url: str, *, is_async: bool = False) -> dict:
+    """``create_engine`` keyword arguments for ``url`` built from the DB_* settings."""
+    if settings.DB_POOL_PRE_PING not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_POOL_PRE_PING must be one of: {', '.join(PRE_PING_STRATEGIES)}")
+
+    options: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING == "always"}
+    if _backend(url) != "postgresql":
+        return options
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns the pooling; prepared statements would land on
+        # whichever server connection the next transaction gets.
+        options["poolclass"] = NullPool
+        driver = _driver(url)
+        if driver == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    return options
+
+
+def install_metrics_events(sync_engine) -> None:
+    """Time every cursor execute into the current request's metrics."""
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info["statement_started_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("statement_started_at", None)
+        if started is not None:
+            metrics.record_statement(time.perf_counter() - started, statement)
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+def install_engine_events(sync_engine) -> None:
+    """Attach the idle pre-ping, statement timeout and metrics hooks to an engine."""
+    if settings.METRICS_ENABLED:
+        install_metrics_events(sync_engine)
+
+    if settings.DB_POOL_PRE_PING == "idle":
+        @event.listens_for(sync_engine.pool, "checkin")
+        def _stamp_checkin(dbapi_connection, connection_record):
+            connection_record.info["checked_in_at"] = time.monotonic()
+
+        @event.listens_for(sync_engine.pool, "checkout")
+        def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+            checked_in_at = connection_record.info.get("checked_in_at")
+            if checked_in_at is None or time.monotonic() - checked_in_at < settings.DB_POOL_PING_IDLE_SECONDS:
+                return
+            try:
+                sync_engine.dialect.do_ping(dbapi_connection)
+            except Exception as e:
+                # The pool discards the connection and retries with a fresh one.
+                raise exc.DisconnectionError() from e
+
+    if (
+        settings.DB_STATEMENT_TIMEOUT_MS
+        and sync_engine.dialect.name == "postgresql"
+        and not settings.DB_PGBOUNCER
+    ):
+        @event.listens_for(sync_engine, "connect")
+        def _set_statement_timeout(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+            cursor.close()
+            dbapi_connection.commit()
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+install_engine_events(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 def get_db():
@@ -12,3 +109,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in ``url`` for its asyncio counterpart."""
+    scheme, sep, rest = url.partition("://")
+    backend = _backend(url)
+    if not sep or backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {scheme!r}")
+    return f"{backend}+{_ASYNC_DRIVERS[backend]}://{rest}"
+
+
+# The async engine is only built when DB_ASYNC is on, so the sync deployment
+# does not need asyncpg/aiosqlite installed.
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    _async_url = settings.DATABASE_ASYNC_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, is_async=True))
+    install_engine_events(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,22 +1,68 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pathlib import Path
 from app.core.config import settings
+from app.core.compression import setup_compression
 from app.core.cors import setup_cors
+from app.core.metrics import setup_metrics
+from app.db.replicas import setup_read_replicas
+from app.db.session import engine
 from app.routers.health import router as health_router
 from app.routers.contracts import router as contracts_router
 from app.routers.portfolio import router as portfolio_router
 from app.routers.auth import router as auth_router
+from app.routers.metrics import router as metrics_router
+from app.services import contracts_feed, portfolio_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    contracts_feed.start()
+    yield
+    contracts_feed.stop()
 
-app = FastAPI(title="Energy Contract Marketplace API")
+
+app = FastAPI(title="Energy Contract Marketplace API", lifespan=lifespan)
 
 setup_cors(app)
+setup_compression(app)
+setup_metrics(app)
+setup_read_replicas(app)
+portfolio_service.check_dialect(engine.dialect.name)
+
+
+def prefer_async_routes(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """Return ``sync_router`` with every route that ``async_router`` also defines
+    swapped for its async handler.
+
+    The sync route order is kept so literal paths such as ``/contracts/locations``
+    are still matched before ``/contracts/{contract_id}``; endpoints that only
+    exist on the sync router keep running on the threadpool.
+    """
+    key = lambda route: (route.path, frozenset(route.methods or ()))  # noqa: E731
+    async_routes = {key(r): r for r in async_router.routes}
+    merged = APIRouter()
+    for route in sync_router.routes:
+        merged.routes.append(async_routes.pop(key(route), route))
+    merged.routes.extend(async_routes.values())
+    return merged
+
+
+if settings.DB_ASYNC:
+    from app.routers.contracts_async import router as contracts_async_router
+    from app.routers.portfolio_async import router as portfolio_async_router
+
+    contracts_router = prefer_async_routes(contracts_router, contracts_async_router)
+    portfolio_router = prefer_async_routes(portfolio_router, portfolio_async_router)
 
 app.include_router(contracts_router, prefix="/api")
 app.include_router(portfolio_router, prefix="/api")
 app.include_router(health_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
 
 
 
@@ -1,7 +1,10 @@
 import enum
 from datetime import date
-from sqlalchemy import Enum, String, Date, Integer, Numeric
+from sqlalchemy import DDL, Boolean, CheckConstraint, Enum, Index, String, Date, Integer, Numeric, and_, event, func, literal, literal_column, null, text
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.elements import ColumnElement, Null
+from sqlalchemy.sql.visitors import InternalTraversal
 
 from app.db.base import Base
 
@@ -18,14 +21,112 @@ class ContractStatus(str, enum.Enum):
     Reserved = "Reserved"
     Sold = "Sold"
 
+# The marketplace lists Available contracts by default, so the sort indexes are
+# partial on that status and end in id to match the keyset/tie-break order.
+_AVAILABLE = text("status = 'Available'")
+
+# Inclusive delivery period as a Postgres range; the GiST index below is on
+# exactly this expression, so overlap filters must spell it the same way.
+DELIVERY_RANGE_SQL = "daterange(delivery_start, delivery_end, '[]')"
+
 class Contract(Base):
     __tablename__ = "contracts"
+    __table_args__ = (
+        # The delivery range index cannot hold an inverted window.
+        CheckConstraint("delivery_start <= delivery_end", name="ck_contracts_delivery_window"),
+        Index("ix_contracts_status_id", "status", "id"),
+        Index(
+            "ix_contracts_available_price",
+            "status", "price_per_mwh", "id",
+            postgresql_where=_AVAILABLE,
+            sqlite_where=_AVAILABLE,
+        ),
+        Index(
+            "ix_contracts_available_quantity",
+            "status", "quantity_mwh", "id",
+            postgresql_where=_AVAILABLE,
+            sqlite_where=_AVAILABLE,
+        ),
+        Index(
+            "ix_contracts_available_delivery_start",
+            "status", "delivery_start", "id",
+            postgresql_where=_AVAILABLE,
+            sqlite_where=_AVAILABLE,
+        ),
+        Index("ix_contracts_type_location_start", "energy_type", "location", "delivery_start"),
+        # Delivery-window overlap filters: a range index on Postgres, and
+        # both endpoints in one B-tree elsewhere so the end test is answered
+        # from the index entries found by the start range.
+        Index(
+            "ix_contracts_delivery_range", text(DELIVERY_RANGE_SQL), postgresql_using="gist"
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_contracts_delivery_window", "delivery_start", "delivery_end").ddl_if(dialect="sqlite"),
+        # Prefix, infix and similarity matches for the location search.
+        Index(
+            "ix_contracts_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    energy_type: Mapped[EnergyType] = mapped_column(Enum(EnergyType), index=True)
-    quantity_mwh: Mapped[int] = mapped_column(Integer, index=True)
-    price_per_mwh: Mapped[float] = mapped_column(Numeric(12, 2), index=True)
-    delivery_start: Mapped[date] = mapped_column(Date, index=True)
-    delivery_end: Mapped[date] = mapped_column(Date, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    energy_type: Mapped[EnergyType] = mapped_column(Enum(EnergyType))
+    quantity_mwh: Mapped[int] = mapped_column(Integer)
+    price_per_mwh: Mapped[float] = mapped_column(Numeric(12, 2))
+    delivery_start: Mapped[date] = mapped_column(Date)
+    delivery_end: Mapped[date] = mapped_column(Date)
     location: Mapped[str] = mapped_column(String(50), index=True)
-    status: Mapped[ContractStatus] = mapped_column(Enum(ContractStatus), index=True, default=ContractStatus.Available)
+    status: Mapped[ContractStatus] = mapped_column(Enum(ContractStatus), default=ContractStatus.Available)
+    # Bumped by every update; PATCH compares it to reject lost updates (409).
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+
+# gin_trgm_ops comes from the pg_trgm extension.
+event.listen(
+    Contract.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class DeliveryOverlaps(ColumnElement[bool]):
+    """Contracts delivering on at least one day of ``[start, end]``; either
+    bound may be None for an open-ended window.
+
+    Postgres compiles it to a ``&&`` test against ``ix_contracts_delivery_range``;
+    other databases get ``delivery_end >= start AND delivery_start <= end``.
+    """
+
+    __visit_name__ = "delivery_overlaps"
+    type = Boolean()
+    # A predicate in its own right: without this, dialects lacking a native
+    # boolean would compare the whole expression to 1.
+    _is_implicitly_boolean = True
+    inherit_cache = True
+    _traverse_internals = [
+        ("start", InternalTraversal.dp_clauseelement),
+        ("end", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, start: date | None, end: date | None):
+        self.start = null() if start is None else literal(start, Date)
+        self.end = null() if end is None else literal(end, Date)
+
+
+@compiles(DeliveryOverlaps)
+def _compile_delivery_overlaps(element, compiler, **kw):
+    clauses = []
+    if not isinstance(element.start, Null):
+        clauses.append(Contract.delivery_end >= element.start)
+    if not isinstance(element.end, Null):
+        clauses.append(Contract.delivery_start <= element.end)
+    # Grouped so the pair stays one predicate inside an OR.
+    return compiler.process(and_(*clauses).self_group(), **kw)
+
+
+@compiles(DeliveryOverlaps, "postgresql")
+def _compile_delivery_overlaps_pg(element, compiler, **kw):
+    bounds = literal_column("'[]'")
+    delivery = func.daterange(Contract.delivery_start, Contract.delivery_end, bounds)
+    return compiler.process(delivery.op("&&")(func.daterange(element.start, element.end, bounds)), **kw)
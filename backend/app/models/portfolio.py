@@ -1,7 +1,10 @@
-from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Enum, ForeignKey, Integer, Numeric, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models.contract import EnergyType
 
 class PortfolioItem(Base):
     __tablename__ = "portfolio_items"
@@ -12,3 +15,17 @@ class PortfolioItem(Base):
     contract_id: Mapped[int] = mapped_column(ForeignKey("contracts.id", ondelete="CASCADE"), index=True)
 
     contract = relationship("Contract")
+
+class PortfolioSummary(Base):
+    """Per-user, per-energy-type running totals behind /portfolio/metrics.
+
+    Maintained with deltas by the portfolio and contract write paths;
+    ``portfolio_service.diff_summary`` checks it against a full recomputation.
+    """
+    __tablename__ = "portfolio_summaries"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    energy_type: Mapped[EnergyType] = mapped_column(Enum(EnergyType), primary_key=True)
+    contracts: Mapped[int] = mapped_column(Integer, default=0)
+    capacity_mwh: Mapped[int] = mapped_column(BigInteger, default=0)
+    cost: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=0)
@@ -1,17 +1,23 @@
 from datetime import date
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.http_cache import cache_headers, not_modified, record_etag, set_cache_headers, version_etag
+from app.core.responses import FastJSONResponse
+from app.db.replicas import get_read_db
 from app.db.session import get_db
 from app.models.contract import EnergyType, ContractStatus
-from app.schemas.contract import ContractCreate, ContractOut, ContractUpdate, ContractListOut, ContractPriceBoundsOut
-from app.services import contracts_service
+from app.schemas.contract import ContractCreate, ContractOut, ContractUpdate, ContractListOut, ContractPriceBoundsOut, ContractFacetsOut, ContractLocationMatch, ContractStatsOut, ContractBulkOut
+from app.services import contracts_export, contracts_feed, contracts_ingest, contracts_service
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
 @router.get("/price-bounds", response_model=ContractPriceBoundsOut)
 def price_bounds(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     energy_type: list[EnergyType] | None = Query(default=None),
     location: list[str] | None = Query(default=None),
     status: ContractStatus | None = ContractStatus.Available,
@@ -19,9 +25,9 @@ def price_bounds(
     qty_max: int | None = None,
     start_from: date | None = None,
     end_to: date | None = None,
+    date_match: str = "within",
 ):
-    return contracts_service.get_price_bounds(
-        db=db,
+    params = dict(
         energy_type=energy_type,
         location=location,
         status=status,
@@ -29,19 +35,187 @@ def price_bounds(
         qty_max=qty_max,
         start_from=start_from,
         end_to=end_to,
+        date_match=date_match,
     )
+    contracts_service.price_bounds_filter_args(**params)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    bounds = contracts_service.get_price_bounds(db=db, **params)
+    set_cache_headers(response, etag)
+    return bounds
+
+@router.get("/facets", response_model=ContractFacetsOut)
+def facets(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+    price_bucket: float = 10,
+    qty_bucket: int = 500,
+):
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+    contracts_service.validate_facet_args(filter_args, price_bucket, qty_bucket)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    facets = contracts_service.get_facets(db=db, **filter_args, price_bucket=price_bucket, qty_bucket=qty_bucket)
+    set_cache_headers(response, etag)
+    return facets
+
+@router.get("/stats", response_model=ContractStatsOut)
+def stats(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+    group_by: list[str] | None = Query(default=None),
+):
+    """Price and MWh statistics per energy type, location and delivery month
+    (or the ``group_by`` subset of those), from the rollup where it can."""
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+    contracts_service.validate_stats_args(filter_args, group_by)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    stats = contracts_service.get_stats(db=db, **filter_args, group_by=group_by)
+    set_cache_headers(response, etag)
+    return stats
 
 @router.get("/locations", response_model=list[str])
-def list_locations(db: Session = Depends(get_db)):
-    return contracts_service.list_locations(db)
+def list_locations(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    locations = contracts_service.list_locations(db)
+    set_cache_headers(response, etag)
+    return locations
+
+@router.get("/locations/search", response_model=list[ContractLocationMatch])
+def search_locations(
+    request: Request,
+    response: Response,
+    q: str = Query(min_length=1, max_length=50),
+    status: ContractStatus | None = ContractStatus.Available,
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """Autocomplete: locations by prefix, word prefix or similarity, with counts."""
+    contracts_service.validate_location_query(q)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    matches = contracts_service.search_locations(db, q, status, limit)
+    set_cache_headers(response, etag)
+    return matches
+
+@router.get("/changes")
+async def contract_changes(request: Request):
+    """Server-sent events for every contract write; see contracts_feed."""
+    return StreamingResponse(
+        contracts_feed.stream(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/export")
+def export_contracts(
+    db: Session = Depends(get_read_db),
+    fmt: str = Query(default="ndjson", alias="format"),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    sort_by: str | None = None,
+    sort_dir: str = "desc",
+    price_min: float | None = None,
+    price_max: float | None = None,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+):
+    return contracts_export.export_contracts(
+        db,
+        fmt,
+        dict(
+            energy_type=energy_type,
+            location=location,
+            status=status,
+            price_min=price_min,
+            price_max=price_max,
+            qty_min=qty_min,
+            qty_max=qty_max,
+            start_from=start_from,
+            end_to=end_to,
+            date_match=date_match,
+        ),
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+    )
 
 @router.post("", response_model=ContractOut, status_code=201)
 def create_contract(payload: ContractCreate, db: Session = Depends(get_db)):
     return contracts_service.create_contract(db, payload)
 
+@router.post("/bulk", response_model=ContractBulkOut)
+async def bulk_create_contracts(
+    request: Request,
+    db: Session = Depends(get_db),
+    fmt: str | None = Query(default=None, alias="format"),
+):
+    fmt = contracts_ingest.format_for(request.headers.get("content-type"), fmt)
+    return await contracts_ingest.ingest_stream(db, fmt, request.stream())
+
 @router.get("", response_model=ContractListOut)
 def list_contracts(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     energy_type: list[EnergyType] | None = Query(default=None),
     location: list[str] | None = Query(default=None),
     status: ContractStatus | None = ContractStatus.Available,
@@ -55,27 +229,51 @@ def list_contracts(
     qty_max: int | None = None,
     start_from: date | None = None,
     end_to: date | None = None,
+    date_match: str = "within",
+    pagination: str = "offset",
+    cursor: str | None = None,
+    count: str | None = None,
 ):
-    return contracts_service.list_contracts(
-        db=db,
+    filter_args = dict(
         energy_type=energy_type,
         location=location,
         status=status,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-        page=page,
-        page_size=page_size,
         price_min=price_min,
         price_max=price_max,
         qty_min=qty_min,
         qty_max=qty_max,
         start_from=start_from,
         end_to=end_to,
+        date_match=date_match,
+    )
+    page_args = dict(
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        page=page,
+        page_size=page_size,
+        pagination=pagination,
+        cursor=cursor,
+        count=count,
     )
+    contracts_service.validate_list_args(filter_args, **page_args)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag, revalidate=True)
+    if cached is not None:
+        return cached
+    payload = contracts_service.list_contracts(db=db, **filter_args, **page_args)
+    # Built from row tuples and already shaped like ContractListOut; skips
+    # response_model validation.
+    return FastJSONResponse(payload, headers=cache_headers(etag, revalidate=True))
 
 @router.get("/{contract_id}", response_model=ContractOut)
-def get_contract(contract_id: int, db: Session = Depends(get_db)):
-    return contracts_service.get_contract(db, contract_id)
+def get_contract(contract_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    contract = contracts_service.get_contract(db, contract_id)
+    etag = record_etag(f"contract-{contract.id}", contract.version)
+    cached = not_modified(request, etag, revalidate=True)
+    if cached is not None:
+        return cached
+    set_cache_headers(response, etag, revalidate=True)
+    return contract
 
 @router.patch("/{contract_id}", response_model=ContractOut)
 def update_contract(contract_id: int, payload: ContractUpdate, db: Session = Depends(get_db)):
@@ -0,0 +1,229 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.http_cache import cache_headers, not_modified, record_etag, set_cache_headers, version_etag
+from app.core.responses import FastJSONResponse
+from app.db.replicas import get_async_read_db
+from app.db.session import get_async_db
+from app.models.contract import EnergyType, ContractStatus
+from app.schemas.contract import ContractCreate, ContractOut, ContractUpdate, ContractListOut, ContractPriceBoundsOut, ContractFacetsOut, ContractLocationMatch, ContractStatsOut
+from app.services import contracts_service, contracts_service_async
+
+router = APIRouter(prefix="/contracts", tags=["contracts"])
+
+@router.get("/price-bounds", response_model=ContractPriceBoundsOut)
+async def price_bounds(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+):
+    params = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+    contracts_service.price_bounds_filter_args(**params)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    bounds = await contracts_service_async.get_price_bounds(db=db, **params)
+    set_cache_headers(response, etag)
+    return bounds
+
+@router.get("/facets", response_model=ContractFacetsOut)
+async def facets(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+    price_bucket: float = 10,
+    qty_bucket: int = 500,
+):
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+    contracts_service.validate_facet_args(filter_args, price_bucket, qty_bucket)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    facets = await contracts_service_async.get_facets(db=db, **filter_args, price_bucket=price_bucket, qty_bucket=qty_bucket)
+    set_cache_headers(response, etag)
+    return facets
+
+@router.get("/stats", response_model=ContractStatsOut)
+async def stats(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+    group_by: list[str] | None = Query(default=None),
+):
+    """Price and MWh statistics per energy type, location and delivery month
+    (or the ``group_by`` subset of those), from the rollup where it can."""
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+    contracts_service.validate_stats_args(filter_args, group_by)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    stats = await contracts_service_async.get_stats(db=db, **filter_args, group_by=group_by)
+    set_cache_headers(response, etag)
+    return stats
+
+@router.get("/locations", response_model=list[str])
+async def list_locations(request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    locations = await contracts_service_async.list_locations(db)
+    set_cache_headers(response, etag)
+    return locations
+
+@router.get("/locations/search", response_model=list[ContractLocationMatch])
+async def search_locations(
+    request: Request,
+    response: Response,
+    q: str = Query(min_length=1, max_length=50),
+    status: ContractStatus | None = ContractStatus.Available,
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Autocomplete: locations by prefix, word prefix or similarity, with counts."""
+    contracts_service.validate_location_query(q)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    matches = await contracts_service_async.search_locations(db, q, status, limit)
+    set_cache_headers(response, etag)
+    return matches
+
+@router.post("", response_model=ContractOut, status_code=201)
+async def create_contract(payload: ContractCreate, db: AsyncSession = Depends(get_async_db)):
+    return await contracts_service_async.create_contract(db, payload)
+
+@router.get("", response_model=ContractListOut)
+async def list_contracts(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    energy_type: list[EnergyType] | None = Query(default=None),
+    location: list[str] | None = Query(default=None),
+    status: ContractStatus | None = ContractStatus.Available,
+    sort_by: str | None = None,
+    sort_dir: str = "desc",
+    page: int = 1,
+    page_size: int = 20,
+    price_min: float | None = None,
+    price_max: float | None = None,
+    qty_min: int | None = None,
+    qty_max: int | None = None,
+    start_from: date | None = None,
+    end_to: date | None = None,
+    date_match: str = "within",
+    pagination: str = "offset",
+    cursor: str | None = None,
+    count: str | None = None,
+):
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+    page_args = dict(
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        page=page,
+        page_size=page_size,
+        pagination=pagination,
+        cursor=cursor,
+        count=count,
+    )
+    contracts_service.validate_list_args(filter_args, **page_args)
+    etag = version_etag(contracts_service.contracts_generation())
+    cached = not_modified(request, etag, revalidate=True)
+    if cached is not None:
+        return cached
+    payload = await contracts_service_async.list_contracts(db=db, **filter_args, **page_args)
+    # Built from row tuples and already shaped like ContractListOut; skips
+    # response_model validation.
+    return FastJSONResponse(payload, headers=cache_headers(etag, revalidate=True))
+
+@router.get("/{contract_id}", response_model=ContractOut)
+async def get_contract(contract_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    contract = await contracts_service_async.get_contract(db, contract_id)
+    etag = record_etag(f"contract-{contract.id}", contract.version)
+    cached = not_modified(request, etag, revalidate=True)
+    if cached is not None:
+        return cached
+    set_cache_headers(response, etag, revalidate=True)
+    return contract
+
+@router.patch("/{contract_id}", response_model=ContractOut)
+async def update_contract(contract_id: int, payload: ContractUpdate, db: AsyncSession = Depends(get_async_db)):
+    return await contracts_service_async.update_contract(db, contract_id, payload)
+
+@router.delete("/{contract_id}", status_code=204)
+async def delete_contract(contract_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await contracts_service_async.delete_contract(db, contract_id)
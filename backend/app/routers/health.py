@@ -1,7 +1,20 @@
 from fastapi import APIRouter
 
+from app.db import replicas, session
+from app.db.pool import pool_status
+
 router = APIRouter(tags=["health"])
 
 @router.get("/health")
 def health():
     return {"ok": True}
+
+@router.get("/health/pool")
+def pool_health():
+    pools = {"sync": pool_status(session.engine.pool)}
+    if session.async_engine is not None:
+        pools["async"] = pool_status(session.async_engine.sync_engine.pool)
+    states = replicas.read_replicas.status()
+    for replica in replicas.read_replicas.replicas:
+        pools[f"replica:{replica.name}"] = {**pool_status(replica.engine.pool), "state": states[replica.name]}
+    return pools
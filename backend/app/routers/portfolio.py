@@ -1,13 +1,12 @@
 import logging
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
 
+from app.db.replicas import get_read_db
 from app.db.session import get_db
-from app.models.portfolio import PortfolioItem
-from app.models.contract import Contract
-from app.schemas.portfolio import PortfolioItemOut, PortfolioMetrics
+from app.schemas.portfolio import PortfolioBatchIn, PortfolioBatchOut, PortfolioItemOut, PortfolioMetrics
 from app.core.security import get_current_user
+from app.services import portfolio_service
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +14,30 @@ router = APIRouter(prefix="/portfolio", tags=["portfolio"])
 
 DEFAULT_USER_ID = 1
 
+@router.post("/items/batch", response_model=PortfolioBatchOut)
+def add_many_to_portfolio(
+    payload: PortfolioBatchIn,
+    db: Session = Depends(get_db),
+    _: dict = Depends(get_current_user),
+):
+    contract_ids = list(dict.fromkeys(payload.contract_ids))
+    added, missing = portfolio_service.add_items(db, DEFAULT_USER_ID, contract_ids)
+    db.commit()
+    logger.info("portfolio.add_many: user_id=%s requested=%s added=%s", DEFAULT_USER_ID, len(contract_ids), len(added))
+    return portfolio_service.batch_results(contract_ids, added, "added", missing)
+
+@router.post("/items/batch/delete", response_model=PortfolioBatchOut)
+def remove_many_from_portfolio(
+    payload: PortfolioBatchIn,
+    db: Session = Depends(get_db),
+    _: dict = Depends(get_current_user),
+):
+    contract_ids = list(dict.fromkeys(payload.contract_ids))
+    removed = portfolio_service.remove_items(db, DEFAULT_USER_ID, contract_ids)
+    db.commit()
+    logger.info("portfolio.remove_many: user_id=%s requested=%s removed=%s", DEFAULT_USER_ID, len(contract_ids), len(removed))
+    return portfolio_service.batch_results(contract_ids, removed, "removed")
+
 @router.post("/items/{contract_id}", status_code=201)
 def add_to_portfolio(
     contract_id: int,
@@ -22,17 +45,13 @@ def add_to_portfolio(
     _: dict = Depends(get_current_user),
 ):
     logger.info("portfolio.add: user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
-    # upsert-ish
-    existing = db.scalar(select(PortfolioItem).where(
-        PortfolioItem.user_id == DEFAULT_USER_ID,
-        PortfolioItem.contract_id == contract_id
-    ))
-    if existing:
+    added, missing = portfolio_service.add_items(db, DEFAULT_USER_ID, [contract_id])
+    if missing:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    if not added:
         logger.info("portfolio.add: already exists user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
         return {"ok": True, "already": True}
 
-    item = PortfolioItem(user_id=DEFAULT_USER_ID, contract_id=contract_id)
-    db.add(item)
     db.commit()
     logger.info("portfolio.add: created user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
     return {"ok": True}
@@ -44,61 +63,37 @@ def remove_from_portfolio(
     _: dict = Depends(get_current_user),
 ):
     logger.info("portfolio.remove: user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
-    item = db.scalar(select(PortfolioItem).where(
-        PortfolioItem.user_id == DEFAULT_USER_ID,
-        PortfolioItem.contract_id == contract_id
-    ))
-    if not item:
+    if not portfolio_service.remove_items(db, DEFAULT_USER_ID, [contract_id]):
         logger.warning("portfolio.remove: not found user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
         return
-    db.delete(item)
     db.commit()
     logger.info("portfolio.remove: deleted user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
 
 @router.get("/items", response_model=list[PortfolioItemOut])
 def list_items(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     _: dict = Depends(get_current_user),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    before_id: int | None = None,
 ):
-    items = db.scalars(
-        select(PortfolioItem).where(PortfolioItem.user_id == DEFAULT_USER_ID)
-        .order_by(PortfolioItem.id.desc())
-    ).all()
+    items = db.scalars(portfolio_service.items_stmt(DEFAULT_USER_ID, limit, before_id)).all()
     if not items:
         logger.info("portfolio.list: empty user_id=%s", DEFAULT_USER_ID)
     else:
         logger.info("portfolio.list: count=%s user_id=%s", len(items), DEFAULT_USER_ID)
+    if limit is not None and len(items) == limit:
+        response.headers["X-Next-Before-Id"] = str(items[-1].id)
     return items
 
 @router.get("/metrics", response_model=PortfolioMetrics)
 def metrics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: dict = Depends(get_current_user),
 ):
-    rows = db.execute(
-        select(Contract.energy_type, Contract.quantity_mwh, Contract.price_per_mwh)
-        .join(PortfolioItem, PortfolioItem.contract_id == Contract.id)
-        .where(PortfolioItem.user_id == DEFAULT_USER_ID)
-    ).all()
-    if not rows:
+    summaries = db.scalars(portfolio_service.summary_rows_stmt(DEFAULT_USER_ID)).all()
+    if not summaries:
         logger.info("portfolio.metrics: empty user_id=%s", DEFAULT_USER_ID)
 
-    total_contracts = len(rows)
-    total_capacity = sum(int(q) for _, q, _ in rows)
-    total_cost = sum(float(q) * float(p) for _, q, p in rows)
-    weighted_avg = (total_cost / total_capacity) if total_capacity else 0.0
-
-    by_type: dict[str, dict[str, float]] = {}
-    for et, q, p in rows:
-        k = str(et.value)
-        by_type.setdefault(k, {"capacity_mwh": 0.0, "cost": 0.0})
-        by_type[k]["capacity_mwh"] += float(q)
-        by_type[k]["cost"] += float(q) * float(p)
+    return portfolio_service.build_metrics_from_summary(summaries)
 
-    return PortfolioMetrics(
-        total_contracts=total_contracts,
-        total_capacity_mwh=total_capacity,
-        total_cost=round(total_cost, 2),
-        weighted_avg_price_per_mwh=round(weighted_avg, 2),
-        by_energy_type=by_type,
-    )
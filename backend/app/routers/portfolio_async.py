@@ -0,0 +1,96 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.replicas import get_async_read_db
+from app.db.session import get_async_db
+from app.schemas.portfolio import PortfolioBatchIn, PortfolioBatchOut, PortfolioItemOut, PortfolioMetrics
+from app.core.security import get_current_user
+from app.routers.portfolio import DEFAULT_USER_ID
+from app.services import portfolio_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/portfolio", tags=["portfolio"])
+
+@router.post("/items/batch", response_model=PortfolioBatchOut)
+async def add_many_to_portfolio(
+    payload: PortfolioBatchIn,
+    db: AsyncSession = Depends(get_async_db),
+    _: dict = Depends(get_current_user),
+):
+    contract_ids = list(dict.fromkeys(payload.contract_ids))
+    added, missing = await db.run_sync(portfolio_service.add_items, DEFAULT_USER_ID, contract_ids)
+    await db.commit()
+    logger.info("portfolio.add_many: user_id=%s requested=%s added=%s", DEFAULT_USER_ID, len(contract_ids), len(added))
+    return portfolio_service.batch_results(contract_ids, added, "added", missing)
+
+@router.post("/items/batch/delete", response_model=PortfolioBatchOut)
+async def remove_many_from_portfolio(
+    payload: PortfolioBatchIn,
+    db: AsyncSession = Depends(get_async_db),
+    _: dict = Depends(get_current_user),
+):
+    contract_ids = list(dict.fromkeys(payload.contract_ids))
+    removed = await db.run_sync(portfolio_service.remove_items, DEFAULT_USER_ID, contract_ids)
+    await db.commit()
+    logger.info("portfolio.remove_many: user_id=%s requested=%s removed=%s", DEFAULT_USER_ID, len(contract_ids), len(removed))
+    return portfolio_service.batch_results(contract_ids, removed, "removed")
+
+@router.post("/items/{contract_id}", status_code=201)
+async def add_to_portfolio(
+    contract_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    _: dict = Depends(get_current_user),
+):
+    logger.info("portfolio.add: user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
+    added, missing = await db.run_sync(portfolio_service.add_items, DEFAULT_USER_ID, [contract_id])
+    if missing:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    if not added:
+        logger.info("portfolio.add: already exists user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
+        return {"ok": True, "already": True}
+
+    await db.commit()
+    logger.info("portfolio.add: created user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
+    return {"ok": True}
+
+@router.delete("/items/{contract_id}", status_code=204)
+async def remove_from_portfolio(
+    contract_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    _: dict = Depends(get_current_user),
+):
+    logger.info("portfolio.remove: user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
+    if not await db.run_sync(portfolio_service.remove_items, DEFAULT_USER_ID, [contract_id]):
+        logger.warning("portfolio.remove: not found user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
+        return
+    await db.commit()
+    logger.info("portfolio.remove: deleted user_id=%s contract_id=%s", DEFAULT_USER_ID, contract_id)
+
+@router.get("/items", response_model=list[PortfolioItemOut])
+async def list_items(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    _: dict = Depends(get_current_user),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    before_id: int | None = None,
+):
+    items = (await db.scalars(portfolio_service.items_stmt(DEFAULT_USER_ID, limit, before_id))).all()
+    if not items:
+        logger.info("portfolio.list: empty user_id=%s", DEFAULT_USER_ID)
+    else:
+        logger.info("portfolio.list: count=%s user_id=%s", len(items), DEFAULT_USER_ID)
+    if limit is not None and len(items) == limit:
+        response.headers["X-Next-Before-Id"] = str(items[-1].id)
+    return items
+
+@router.get("/metrics", response_model=PortfolioMetrics)
+async def metrics(
+    db: AsyncSession = Depends(get_async_read_db),
+    _: dict = Depends(get_current_user),
+):
+    summaries = (await db.scalars(portfolio_service.summary_rows_stmt(DEFAULT_USER_ID))).all()
+    if not summaries:
+        logger.info("portfolio.metrics: empty user_id=%s", DEFAULT_USER_ID)
+    return portfolio_service.build_metrics_from_summary(summaries)
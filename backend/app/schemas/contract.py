@@ -1,5 +1,5 @@
 from datetime import date
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from app.models.contract import EnergyType, ContractStatus
 
 class ContractBase(BaseModel):
@@ -12,7 +12,11 @@ class ContractBase(BaseModel):
     status: ContractStatus = ContractStatus.Available
 
 class ContractCreate(ContractBase):
-    pass
+    @model_validator(mode="after")
+    def _check_delivery_window(self):
+        if self.delivery_start > self.delivery_end:
+            raise ValueError("delivery_start cannot be after delivery_end")
+        return self
 
 class ContractUpdate(BaseModel):
     energy_type: EnergyType | None = None
@@ -22,17 +26,85 @@ class ContractUpdate(BaseModel):
     delivery_end: date | None = None
     location: str | None = None
     status: ContractStatus | None = None
+    # The version the client last read; when given, the update only applies
+    # if nobody has changed the contract since (409 otherwise).
+    version: int | None = None
+
+    # When only one end is given, the service checks it against the stored one.
+    @model_validator(mode="after")
+    def _check_delivery_window(self):
+        if self.delivery_start and self.delivery_end and self.delivery_start > self.delivery_end:
+            raise ValueError("delivery_start cannot be after delivery_end")
+        return self
 
 class ContractOut(ContractBase):
     id: int
+    version: int
     model_config = {"from_attributes": True}
 
 class ContractListOut(BaseModel):
     items: list[ContractOut]
     page: int
     page_size: int
-    total: int
+    total: int | None = None
+    total_exact: bool | None = None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 class ContractPriceBoundsOut(BaseModel):
     min_price: float | None
     max_price: float | None
+
+class ContractHistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+class ContractFacetsOut(BaseModel):
+    # Each facet applies every filter except its own, so the counts show what
+    # selecting another value would return.
+    total: int
+    energy_type: dict[str, int]
+    location: dict[str, int]
+    status: dict[str, int]
+    price: list[ContractHistogramBucket]
+    quantity: list[ContractHistogramBucket]
+
+class ContractLocationMatch(BaseModel):
+    location: str
+    count: int
+
+class ContractStatsGroup(BaseModel):
+    # Only the dimensions named in group_by are set; delivery_month is the
+    # first day of the month delivery starts in.
+    energy_type: EnergyType | None = None
+    location: str | None = None
+    delivery_month: date | None = None
+    contracts: int
+    total_mwh: int
+    avg_price: float
+    weighted_avg_price: float
+    min_price: float
+    p10: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    max_price: float
+
+class ContractStatsOut(BaseModel):
+    # "rollup" when served from the in-memory cube, "sql" when the filters
+    # needed a live query.
+    source: str
+    groups: list[ContractStatsGroup]
+
+class ContractBulkError(BaseModel):
+    line: int
+    errors: list[str]
+
+class ContractBulkOut(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ContractBulkError] = []
+    errors_truncated: bool = False
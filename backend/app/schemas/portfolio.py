@@ -1,6 +1,13 @@
-from pydantic import BaseModel
+from decimal import Decimal
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field, PlainSerializer
 from app.schemas.contract import ContractOut
 
+# Metrics are computed and held as Decimal; only the JSON encoding turns them
+# into numbers, matching what the frontend already reads.
+JsonDecimal = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+
 class PortfolioItemOut(BaseModel):
     id: int
     contract: ContractOut
@@ -9,6 +16,18 @@ class PortfolioItemOut(BaseModel):
 class PortfolioMetrics(BaseModel):
     total_contracts: int
     total_capacity_mwh: int
-    total_cost: float
-    weighted_avg_price_per_mwh: float
-    by_energy_type: dict[str, dict[str, float]]  # {type: {capacity_mwh, cost}}
+    total_cost: JsonDecimal
+    weighted_avg_price_per_mwh: JsonDecimal
+    by_energy_type: dict[str, dict[str, JsonDecimal]]  # {type: {capacity_mwh, cost}}
+
+class PortfolioBatchIn(BaseModel):
+    contract_ids: list[int] = Field(min_length=1, max_length=1000)
+
+class PortfolioBatchResult(BaseModel):
+    contract_id: int
+    # added / removed: changed by this call; unchanged: already held (add) or
+    # not held (remove); not_found: no such contract.
+    status: Literal["added", "removed", "unchanged", "not_found"]
+
+class PortfolioBatchOut(BaseModel):
+    results: list[PortfolioBatchResult]
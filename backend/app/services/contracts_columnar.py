@@ -0,0 +1,422 @@
+"""In-memory columnar copy of the ``contracts`` table for the list endpoints.
+
+Enabled with ``CONTRACTS_READ_ENGINE=columnar``. Each column is a NumPy
+array: enum and location codes, price in integer cents and dates as
+ordinals. Filters become boolean masks. Every sort key keeps a precomputed
+``(key, id)`` permutation, so a page is a masked gather rather than a sort.
+
+The contract write paths in ``contracts_service`` apply each change in
+place. Writes the process cannot see, such as bulk ingest or other workers,
+mark the copy stale, or age it past ``COLUMNAR_MAX_AGE_SECONDS``. Either way
+the next read reloads it. Reloads run one at a time, and arrays read before
+the installed ones are dropped rather than swapped in.
+"""
+import math
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.contract import Contract, ContractStatus, EnergyType
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install .[columnar]
+    np = None
+
+LOAD_COLUMNS = (
+    Contract.id,
+    Contract.energy_type,
+    Contract.quantity_mwh,
+    Contract.price_per_mwh,
+    Contract.delivery_start,
+    Contract.delivery_end,
+    Contract.location,
+    Contract.status,
+    Contract.version,
+)
+
+ENERGY_TYPES = list(EnergyType)
+STATUSES = list(ContractStatus)
+_ENERGY_CODES = {e: i for i, e in enumerate(ENERGY_TYPES)}
+_STATUS_CODES = {s: i for i, s in enumerate(STATUSES)}
+
+# Sort key -> column holding its values; "id" sorts on the id column itself.
+SORT_COLUMNS = {"id": "id", "price": "price", "quantity": "quantity", "date": "start"}
+_DTYPES = {
+    "id": "int64",
+    "energy": "int8",
+    "status": "int8",
+    "location": "int32",
+    "price": "int64",
+    "quantity": "int64",
+    "start": "int32",
+    "end": "int32",
+    "version": "int64",
+    "alive": "bool",
+}
+
+
+def enabled() -> bool:
+    return settings.CONTRACTS_READ_ENGINE == "columnar"
+
+
+def load_stmt():
+    return select(*LOAD_COLUMNS).order_by(Contract.id)
+
+
+def _cents(price) -> int:
+    return int((Decimal(str(price)) * 100).to_integral_value())
+
+
+def _price(cents: int) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def _isin(col, codes: list[int]):
+    # A few equality passes beat np.isin, which sorts, for the short code
+    # lists filters carry.
+    if len(codes) > 8:
+        return np.isin(col, codes)
+    mask = np.zeros(len(col), dtype=bool)
+    for code in set(codes):
+        mask |= col == code
+    return mask
+
+
+def _first_matches(order, mask, count: int):
+    """The first ``count`` entries of ``order`` that pass ``mask``, scanning in
+    growing chunks so a short page off a large table stops early."""
+    found = []
+    got = 0
+    start = 0
+    step = max(1024, 4 * count)
+    while got < count and start < len(order):
+        chunk = order[start : start + step]
+        hits = chunk[mask[chunk]]
+        found.append(hits)
+        got += len(hits)
+        start += step
+        step *= 2
+    return np.concatenate(found) if found else order[:0]
+
+
+class ContractColumns:
+    """Column arrays for every contract, ordered by id, with tombstones for deletes."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._cols: dict = {}
+        self._n = 0
+        self._dead = 0
+        self._orders: dict[str, object] = {}
+        self._locations: list[str] = []
+        self._location_codes: dict[str, int] = {}
+        self._loaded_at: float | None = None
+        # Writes seen, and how many of them the installed arrays reflect; the
+        # copy is stale while the two differ.
+        self._writes = 0
+        self._generation = 0
+        self._reload_lock = threading.Lock()
+        self.loads = 0
+
+    # -- freshness -------------------------------------------------------
+
+    def needs_reload(self) -> bool:
+        with self._lock:
+            return (
+                self._generation != self._writes
+                or self._loaded_at is None
+                or time.monotonic() - self._loaded_at > settings.COLUMNAR_MAX_AGE_SECONDS
+            )
+
+    def begin_reload(self) -> int:
+        """Token for ``load``: writes seen after this point keep the copy stale."""
+        with self._lock:
+            return self._writes
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._writes += 1
+
+    def reload(self, fetch) -> None:
+        """Rebuild from ``fetch()``, rows of ``load_stmt()``, if still needed.
+        One rebuild runs at a time; callers that waited for it find the copy
+        fresh and return without reading the table again."""
+        with self._reload_lock:
+            if not self.needs_reload():
+                return
+            token = self.begin_reload()
+            self.load(fetch(), token)
+
+    def load(self, rows, token: int) -> None:
+        """Replace the arrays with ``rows`` from ``load_stmt()``, read after
+        ``begin_reload`` returned ``token``. Rows older than the installed
+        copy are dropped."""
+        if np is None:
+            raise RuntimeError("CONTRACTS_READ_ENGINE=columnar requires numpy (pip install .[columnar])")
+        rows = list(rows)
+        locations = sorted({r[6] for r in rows})
+        location_codes = {loc: i for i, loc in enumerate(locations)}
+        n = len(rows)
+        cols = {name: np.empty(max(n, 16), dtype=dtype) for name, dtype in _DTYPES.items()}
+        for name, values in (
+            ("id", (r[0] for r in rows)),
+            ("energy", (_ENERGY_CODES[r[1]] for r in rows)),
+            ("quantity", (r[2] for r in rows)),
+            ("price", (_cents(r[3]) for r in rows)),
+            ("start", (r[4].toordinal() for r in rows)),
+            ("end", (r[5].toordinal() for r in rows)),
+            ("location", (location_codes[r[6]] for r in rows)),
+            ("status", (_STATUS_CODES[r[7]] for r in rows)),
+            ("version", (r[8] for r in rows)),
+        ):
+            cols[name][:n] = np.fromiter(values, dtype=cols[name].dtype, count=n)
+        cols["alive"][:n] = True
+
+        with self._lock:
+            if token < self._generation:
+                return
+            self._cols, self._n, self._dead = cols, n, 0
+            self._locations, self._location_codes = locations, location_codes
+            self._orders = {key: self._sorted(key) for key in SORT_COLUMNS}
+            self._loaded_at = time.monotonic()
+            self._generation = token
+            self.loads += 1
+
+    # -- incremental writes ----------------------------------------------
+
+    def _applied_write(self) -> None:
+        # A write applied in place keeps a current copy current.
+        if self._generation == self._writes:
+            self._generation += 1
+        self._writes += 1
+
+    def upsert(self, contract: Contract) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                # Nothing to apply it to, but a first load in flight may miss it.
+                self._writes += 1
+                return
+            self._applied_write()
+            ids = self._cols["id"][: self._n]
+            pos = int(np.searchsorted(ids, contract.id))
+            if pos < self._n and ids[pos] == contract.id:
+                for key in SORT_COLUMNS:
+                    self._unorder(key, pos)
+            else:
+                self._insert_slot(pos)
+            self._write_row(pos, contract)
+            for key in SORT_COLUMNS:
+                self._order(key, pos)
+
+    def delete(self, contract_id: int) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                # Nothing to apply it to, but a first load in flight may miss it.
+                self._writes += 1
+                return
+            self._applied_write()
+            ids = self._cols["id"][: self._n]
+            pos = int(np.searchsorted(ids, contract_id))
+            if pos < self._n and ids[pos] == contract_id and self._cols["alive"][pos]:
+                self._cols["alive"][pos] = False
+                self._dead += 1
+                if self._dead * 2 > self._n:
+                    self._compact()
+
+    def _write_row(self, pos: int, c: Contract) -> None:
+        code = self._location_codes.get(c.location)
+        if code is None:
+            code = len(self._locations)
+            self._locations.append(c.location)
+            self._location_codes[c.location] = code
+        cols = self._cols
+        cols["id"][pos] = c.id
+        cols["energy"][pos] = _ENERGY_CODES[EnergyType(c.energy_type)]
+        cols["status"][pos] = _STATUS_CODES[ContractStatus(c.status)]
+        cols["location"][pos] = code
+        cols["price"][pos] = _cents(c.price_per_mwh)
+        cols["quantity"][pos] = c.quantity_mwh
+        cols["start"][pos] = c.delivery_start.toordinal()
+        cols["end"][pos] = c.delivery_end.toordinal()
+        cols["version"][pos] = c.version
+        if not cols["alive"][pos]:
+            cols["alive"][pos] = True
+            self._dead -= 1
+
+    def _insert_slot(self, pos: int) -> None:
+        n = self._n
+        if n == len(self._cols["id"]):
+            for name, col in self._cols.items():
+                grown = np.empty(2 * len(col), dtype=col.dtype)
+                grown[:n] = col[:n]
+                self._cols[name] = grown
+        if pos < n:
+            # Only happens for an id below the current maximum, e.g. after a
+            # restore; new contracts append.
+            for col in self._cols.values():
+                col[pos + 1 : n + 1] = col[pos:n]
+            for key, order in self._orders.items():
+                order[order >= pos] += 1
+        self._cols["alive"][pos] = False
+        self._dead += 1
+        self._n = n + 1
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self._cols["alive"][: self._n])
+        for name, col in self._cols.items():
+            col[: len(keep)] = col[keep]
+        self._n, self._dead = len(keep), 0
+        self._orders = {key: self._sorted(key) for key in SORT_COLUMNS}
+
+    # -- sort orders -------------------------------------------------------
+
+    def _sorted(self, key: str):
+        n = self._n
+        if key == "id":
+            return np.arange(n, dtype=np.int64)
+        return np.lexsort((self._cols["id"][:n], self._cols[SORT_COLUMNS[key]][:n])).astype(np.int64)
+
+    def _search(self, order, key: str, value: int, contract_id: int, *, right: bool) -> int:
+        """Index into ``order`` of the first row ``> (value, id)`` (``right``)
+        or ``>= (value, id)``; ``order`` is sorted on ``(key, id)``."""
+        values = self._cols[SORT_COLUMNS[key]][order]
+        lo = int(np.searchsorted(values, value, "left"))
+        hi = int(np.searchsorted(values, value, "right"))
+        ids = self._cols["id"][order[lo:hi]]
+        return lo + int(np.searchsorted(ids, contract_id, "right" if right else "left"))
+
+    def _unorder(self, key: str, pos: int) -> None:
+        order = self._orders[key]
+        self._orders[key] = order[order != pos]
+
+    def _order(self, key: str, pos: int) -> None:
+        if key == "id":
+            self._orders[key] = np.arange(self._n, dtype=np.int64)
+            return
+        order = self._orders[key]
+        value = self._cols[SORT_COLUMNS[key]][pos]
+        at = self._search(order, key, value, self._cols["id"][pos], right=False)
+        self._orders[key] = np.insert(order, at, pos)
+
+    # -- reads -------------------------------------------------------------
+
+    def _mask(
+        self,
+        *,
+        energy_type: list[EnergyType] | None,
+        location: list[str] | None,
+        status: ContractStatus | None,
+        price_min: float | None,
+        price_max: float | None,
+        qty_min: int | None,
+        qty_max: int | None,
+        start_from: date | None,
+        end_to: date | None,
+        date_match: str = "within",
+    ):
+        """Boolean mask over the first ``n`` rows; mirrors ``build_filters``."""
+        n = self._n
+        cols = self._cols
+        mask = cols["alive"][:n].copy()
+        if status is not None:
+            mask &= cols["status"][:n] == _STATUS_CODES[status]
+        if energy_type:
+            mask &= _isin(cols["energy"][:n], [_ENERGY_CODES[e] for e in energy_type])
+        if location:
+            codes = [self._location_codes[loc] for loc in location if loc in self._location_codes]
+            mask &= _isin(cols["location"][:n], codes)
+        if price_min is not None:
+            mask &= cols["price"][:n] >= math.ceil(Decimal(str(price_min)) * 100)
+        if price_max is not None:
+            mask &= cols["price"][:n] <= math.floor(Decimal(str(price_max)) * 100)
+        if qty_min is not None:
+            mask &= cols["quantity"][:n] >= qty_min
+        if qty_max is not None:
+            mask &= cols["quantity"][:n] <= qty_max
+        if date_match == "overlaps":
+            # Compare each endpoint with the opposite end of the window.
+            if start_from is not None:
+                mask &= cols["end"][:n] >= start_from.toordinal()
+            if end_to is not None:
+                mask &= cols["start"][:n] <= end_to.toordinal()
+            return mask
+        if start_from is not None:
+            mask &= cols["start"][:n] >= start_from.toordinal()
+        if end_to is not None:
+            mask &= cols["end"][:n] <= end_to.toordinal()
+        return mask
+
+    def count(self, filter_args: dict) -> int:
+        with self._lock:
+            return int(np.count_nonzero(self._mask(**filter_args)))
+
+    def price_bounds(self, filter_args: dict) -> tuple[Decimal | None, Decimal | None]:
+        with self._lock:
+            prices = self._cols["price"][: self._n][self._mask(**filter_args)]
+            if not len(prices):
+                return None, None
+            return _price(prices.min()), _price(prices.max())
+
+    def locations(self) -> list[str]:
+        with self._lock:
+            codes = np.unique(self._cols["location"][: self._n][self._cols["alive"][: self._n]])
+            return sorted(self._locations[c] for c in codes)
+
+    def page(
+        self,
+        filter_args: dict,
+        sort_key: str,
+        sort_dir: str,
+        *,
+        offset: int = 0,
+        limit: int,
+        after: tuple | None = None,
+        backward: bool = False,
+    ) -> tuple[list[Contract], int | None]:
+        """Return ``(contracts, matching)`` for one page.
+
+        With ``after`` this is a keyset page in the same order ``_keyset_stmt``
+        would fetch it, which is reversed when walking ``backward``, and
+        ``matching`` is None.
+        """
+        with self._lock:
+            mask = self._mask(**filter_args)
+            order = self._orders[sort_key]
+            ascending = (sort_dir == "asc") != backward
+            if after is not None:
+                value, last_id = after
+                if sort_key == "price":
+                    value = _cents(value)
+                elif sort_key == "date":
+                    value = value.toordinal()
+                if ascending:
+                    order = order[self._search(order, sort_key, value, last_id, right=True) :]
+                else:
+                    order = order[: self._search(order, sort_key, value, last_id, right=False)]
+            if not ascending:
+                order = order[::-1]
+            selected = _first_matches(order, mask, offset + limit)
+            total = int(np.count_nonzero(mask)) if after is None else None
+            return [self._row(p) for p in selected[offset : offset + limit]], total
+
+    def _row(self, pos) -> Contract:
+        cols = self._cols
+        return Contract(
+            id=int(cols["id"][pos]),
+            energy_type=ENERGY_TYPES[cols["energy"][pos]],
+            quantity_mwh=int(cols["quantity"][pos]),
+            price_per_mwh=_price(cols["price"][pos]),
+            delivery_start=date.fromordinal(int(cols["start"][pos])),
+            delivery_end=date.fromordinal(int(cols["end"][pos])),
+            location=self._locations[cols["location"][pos]],
+            status=STATUSES[cols["status"][pos]],
+            version=int(cols["version"][pos]),
+        )
+
+
+index = ContractColumns()
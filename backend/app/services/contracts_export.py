@@ -0,0 +1,134 @@
+"""Streaming export of filtered contracts as NDJSON, CSV or Arrow IPC.
+
+Rows are read as plain tuples through a server-side cursor and encoded one
+``yield_per`` partition at a time, so memory stays flat however many
+contracts match.
+"""
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Iterator
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.services.contracts_service import (
+    ROW_COLUMNS,
+    ROW_FIELDS,
+    build_filters,
+    order_by,
+    validate_sort_args,
+)
+
+COLUMNS = ROW_COLUMNS
+FIELDS = ROW_FIELDS
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def export_contracts(db: Session, fmt: str, filter_args: dict, sort_by: str | None, sort_dir: str) -> StreamingResponse:
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be one of: ndjson, csv, arrow")
+    sort_key, sort_dir = validate_sort_args(filter_args, sort_by=sort_by, sort_dir=sort_dir)
+    if fmt == "arrow":
+        encode = _arrow_encoder()
+    else:
+        encode = _ndjson if fmt == "ndjson" else _csv
+
+    filters = build_filters(**filter_args)
+    stmt = select(*COLUMNS).where(and_(*filters)) if filters else select(*COLUMNS)
+    stmt = stmt.order_by(*order_by(sort_key, sort_dir)).execution_options(
+        stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE
+    )
+
+    def partitions() -> Iterator[list]:
+        result = db.execute(stmt)
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    return StreamingResponse(
+        encode(partitions()),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="contracts.{fmt}"'},
+    )
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _ndjson(partitions: Iterator[list]) -> Iterator[bytes]:
+    for rows in partitions:
+        yield b"".join(dumps(dict(zip(FIELDS, row))) + b"\n" for row in rows)
+
+
+def _csv(partitions: Iterator[list]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(FIELDS)
+    for rows in partitions:
+        writer.writerows([_plain(v) for v in row] for row in rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _arrow_encoder():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow") from exc
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("energy_type", pa.dictionary(pa.int8(), pa.string())),
+            ("quantity_mwh", pa.int64()),
+            ("price_per_mwh", pa.decimal128(12, 2)),
+            ("delivery_start", pa.date32()),
+            ("delivery_end", pa.date32()),
+            ("location", pa.string()),
+            ("status", pa.dictionary(pa.int8(), pa.string())),
+            ("version", pa.int64()),
+        ]
+    )
+
+    def encode(partitions: Iterator[list]) -> Iterator[bytes]:
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for rows in partitions:
+                columns = list(zip(*rows))
+                columns[1] = [e.value for e in columns[1]]
+                columns[7] = [s.value for s in columns[7]]
+                writer.write_batch(
+                    pa.record_batch(
+                        [pa.array(col, type=f.type) for col, f in zip(columns, schema)],
+                        schema=schema,
+                    )
+                )
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        yield sink.getvalue()
+
+    return encode
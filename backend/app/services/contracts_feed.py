@@ -0,0 +1,196 @@
+"""Server-sent change feed for contracts.
+
+Every committed contract write goes through
+``contracts_service.invalidate_read_caches``, which publishes one change here:
+
+    {"op": "upsert", "contract": {...}}   created or updated, as in list items
+    {"op": "delete", "id": 7}
+    {"op": "reset"}                      unattributed write (bulk ingest);
+                                         refetch instead of applying deltas
+
+``stream`` turns the in-process broker into an SSE body. Event ids carry this
+process's origin id and sequence number, so a reconnecting browser resumes
+from ``Last-Event-ID`` when the events are still retained here and is told to
+reset otherwise.
+
+With CHANGE_FEED_BACKEND=postgres each change is also sent with NOTIFY and
+every worker LISTENs, so clients see writes made through any worker, and the
+receiving worker's read caches and ETags are invalidated the same way as for
+its own writes.
+"""
+import asyncio
+import json
+import logging
+import queue
+import secrets
+import threading
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.pubsub import LAGGED, Broker, Event
+from app.core.responses import dumps
+from app.models.contract import Contract, ContractStatus, EnergyType
+
+try:
+    import psycopg
+except ImportError:  # pragma: no cover - only needed for the postgres backend
+    psycopg = None
+
+logger = logging.getLogger(__name__)
+
+FEED_BACKENDS = ("memory", "postgres")
+CHANNEL = "contract_changes"
+RETRY_MS = 3000
+
+_ORIGIN = secrets.token_hex(4)
+
+broker = Broker(history=settings.CHANGE_FEED_HISTORY)
+_bridge: "_PostgresBridge | None" = None
+
+
+def publish(change: dict) -> Event:
+    data = dumps(change).decode()
+    event = broker.publish(data)
+    if _bridge is not None:
+        _bridge.send(data)
+    return event
+
+
+def contract_from_payload(data: dict) -> Contract:
+    """Rebuild the (transient) contract a remote ``upsert`` carried."""
+    return Contract(
+        id=data["id"],
+        energy_type=EnergyType(data["energy_type"]),
+        quantity_mwh=data["quantity_mwh"],
+        price_per_mwh=Decimal(str(data["price_per_mwh"])),
+        delivery_start=date.fromisoformat(data["delivery_start"]),
+        delivery_end=date.fromisoformat(data["delivery_end"]),
+        location=data["location"],
+        status=ContractStatus(data["status"]),
+        version=data["version"],
+    )
+
+
+def _message(seq: int, data: str) -> str:
+    return f"id: {_ORIGIN}-{seq}\nevent: contract\ndata: {data}\n\n"
+
+
+def _resume_after(last_event_id: str | None) -> tuple[int | None, bool]:
+    """(sequence to resume after, whether the client must reset)."""
+    if not last_event_id:
+        return None, False
+    origin, _, seq = last_event_id.rpartition("-")
+    if origin != _ORIGIN or not seq.isdigit():
+        # Issued by another (or a restarted) worker; its numbers mean nothing here.
+        return None, True
+    return int(seq), False
+
+
+async def stream(last_event_id: str | None = None):
+    after, reset = _resume_after(last_event_id)
+    sub, backlog = broker.subscribe(after)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if reset or backlog is None:
+            yield _message(broker.last_seq, '{"op":"reset"}')
+        else:
+            for event in backlog:
+                yield _message(event.seq, event.data)
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is LAGGED:
+                # Too slow to keep up; make it refetch and reconnect.
+                yield _message(broker.last_seq, '{"op":"reset"}')
+                return
+            yield _message(event.seq, event.data)
+    finally:
+        broker.unsubscribe(sub)
+
+
+def _on_remote(payload: str) -> None:
+    origin, _, data = payload.partition(":")
+    if origin == _ORIGIN:
+        return
+    broker.publish(data)
+    # Imported here: contracts_service publishes through this module.
+    from app.services import contracts_service
+
+    contracts_service.apply_remote_change(json.loads(data))
+
+
+class _PostgresBridge:
+    """Relays changes between workers: one thread NOTIFYs this worker's
+    changes, another LISTENs for everyone's. Each holds its own autocommit
+    connection and reconnects after errors."""
+
+    def __init__(self, url: str):
+        self.conninfo = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._outbox: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, args=(self._notify,), name="contract-feed-notify", daemon=True),
+            threading.Thread(target=self._run, args=(self._listen,), name="contract-feed-listen", daemon=True),
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def send(self, data: str) -> None:
+        self._outbox.put(f"{_ORIGIN}:{data}")
+
+    def _run(self, loop) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    loop(conn)
+            except Exception:
+                logger.exception("contract change feed: %s failed; reconnecting", loop.__name__)
+                self._stop.wait(1.0)
+
+    def _notify(self, conn) -> None:
+        while not self._stop.is_set():
+            try:
+                payload = self._outbox.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            conn.execute("SELECT pg_notify(%s, %s)", (CHANNEL, payload))
+
+    def _listen(self, conn) -> None:
+        conn.execute(f"LISTEN {CHANNEL}")
+        while not self._stop.is_set():
+            for notify in conn.notifies(timeout=1.0):
+                try:
+                    _on_remote(notify.payload)
+                except Exception:
+                    logger.exception("contract change feed: bad notification %r", notify.payload[:200])
+
+
+def start() -> None:
+    """Start the cross-worker relay when CHANGE_FEED_BACKEND=postgres."""
+    global _bridge
+    if settings.CHANGE_FEED_BACKEND not in FEED_BACKENDS:
+        raise ValueError(f"CHANGE_FEED_BACKEND must be one of: {', '.join(FEED_BACKENDS)}")
+    if settings.CHANGE_FEED_BACKEND != "postgres" or _bridge is not None:
+        return
+    if psycopg is None:
+        raise RuntimeError("CHANGE_FEED_BACKEND=postgres requires psycopg 3")
+    _bridge = _PostgresBridge(settings.DATABASE_URL)
+    _bridge.start()
+
+
+def stop() -> None:
+    global _bridge
+    if _bridge is not None:
+        _bridge.stop()
+        _bridge = None
@@ -0,0 +1,193 @@
+"""Bulk contract ingestion from NDJSON or CSV streams.
+
+Rows are validated with ``ContractCreate`` a batch at a time. Valid rows are
+loaded with ``COPY`` on Postgres and executemany inserts elsewhere. Bad rows
+are reported back by line number and do not stop the rest of the load.
+"""
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterable, Iterable
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contract import Contract
+from app.schemas.contract import ContractBulkError, ContractBulkOut, ContractCreate
+from app.services.contracts_service import invalidate_read_caches
+
+FORMATS = ("ndjson", "csv")
+
+_COPY_COLUMNS = (
+    "energy_type",
+    "quantity_mwh",
+    "price_per_mwh",
+    "delivery_start",
+    "delivery_end",
+    "location",
+    "status",
+)
+
+
+_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def format_for(content_type: str | None, requested: str | None) -> str:
+    fmt = requested or _CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=415,
+            detail="Send application/x-ndjson or text/csv, or pass format=ndjson|csv",
+        )
+    return fmt
+
+
+async def ingest_stream(db: Session, fmt: str, chunks: AsyncIterable[bytes]) -> ContractBulkOut:
+    """Split a byte stream into lines and load it batch by batch off the event loop."""
+    ingest = BulkIngest(db, fmt)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tail = ""
+    try:
+        async for chunk in chunks:
+            lines = (tail + decoder.decode(chunk)).split("\n")
+            tail = lines.pop()
+            if lines:
+                await run_in_threadpool(ingest.feed, lines)
+        tail += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8") from exc
+    if tail:
+        await run_in_threadpool(ingest.feed, [tail])
+    return await run_in_threadpool(ingest.finish)
+
+
+class BulkIngest:
+    """Accumulates one load: feed it lines, then call ``finish``."""
+
+    def __init__(self, db: Session, fmt: str):
+        self.db = db
+        self.fmt = fmt
+        self.batch_size = settings.BULK_INGEST_BATCH_SIZE
+        self.result = ContractBulkOut()
+        self._line_no = 0
+        self._header: list[str] | None = None
+        self._pending: list[tuple[int, str]] = []
+
+    def feed(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self._line_no += 1
+            if not line.strip():
+                continue
+            if self.fmt == "csv" and self._header is None:
+                self._header = next(csv.reader([line]))
+                continue
+            self._pending.append((self._line_no, line))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def finish(self) -> ContractBulkOut:
+        self._flush()
+        if self.result.inserted:
+            invalidate_read_caches()
+        return self.result
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        valid: list[tuple[int, dict]] = []
+        for line_no, raw in pending:
+            self.result.received += 1
+            try:
+                valid.append((line_no, ContractCreate.model_validate(self._parse(raw)).model_dump()))
+            except (ValidationError, ValueError) as exc:
+                self._error(line_no, exc)
+        if valid:
+            self._insert(valid)
+
+    def _parse(self, raw: str) -> dict:
+        if self.fmt == "ndjson":
+            row = json.loads(raw)
+            if not isinstance(row, dict):
+                raise ValueError("Expected a JSON object")
+            return row
+        values = next(csv.reader([raw]))
+        if len(values) != len(self._header):
+            raise ValueError(f"Expected {len(self._header)} columns, got {len(values)}")
+        # Empty CSV cells fall back to the schema defaults (e.g. status).
+        return {k: v for k, v in zip(self._header, values) if v != ""}
+
+    def _insert(self, rows: list[tuple[int, dict]]) -> None:
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                _copy_rows(self.db, [r for _, r in rows])
+            else:
+                self.db.execute(insert(Contract), [r for _, r in rows])
+            self.db.commit()
+            self.result.inserted += len(rows)
+        except Exception:
+            self.db.rollback()
+            self._insert_one_by_one(rows)
+
+    def _insert_one_by_one(self, rows: list[tuple[int, dict]]) -> None:
+        # A database error fails the whole batch; retry row by row so only the
+        # offending rows are reported.
+        for line_no, row in rows:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(Contract), [row])
+                self.result.inserted += 1
+            except Exception as exc:
+                self._error(line_no, exc)
+        self.db.commit()
+
+    def _error(self, line_no: int, exc: Exception) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) >= settings.BULK_INGEST_MAX_ERRORS:
+            self.result.errors_truncated = True
+            return
+        if isinstance(exc, ValidationError):
+            messages = [f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in exc.errors()]
+        else:
+            messages = [str(exc).splitlines()[0] if str(exc) else type(exc).__name__]
+        self.result.errors.append(ContractBulkError(line=line_no, errors=messages))
+
+
+def _copy_rows(db: Session, rows: list[dict]) -> None:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for r in rows:
+        writer.writerow(
+            [
+                # Postgres enum labels are the Python member names.
+                r["energy_type"].name,
+                r["quantity_mwh"],
+                r["price_per_mwh"],
+                r["delivery_start"].isoformat(),
+                r["delivery_end"].isoformat(),
+                r["location"],
+                r["status"].name,
+            ]
+        )
+    buf.seek(0)
+
+    sql = f"COPY contracts ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = db.connection().connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buf)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+    finally:
+        cursor.close()
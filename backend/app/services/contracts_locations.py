@@ -0,0 +1,166 @@
+"""Location autocomplete for ``/contracts/locations/search``.
+
+Matches rank in three tiers: names starting with the query, names with a
+later word starting with it ("zone 3" finds "California Zone 3"), and names
+similar to it by trigrams, which catches typos. Within a tier, results are
+ordered by similarity, then by contract count.
+
+With the "trgm" engine (the default on Postgres) the ranking is one query on
+the ``ix_contracts_location_trgm`` GIN index. Otherwise ``LocationIndex``
+answers it in memory. It holds the distinct names in sorted name and word
+lists, searched with bisect, plus a trigram posting list for the fuzzy tier.
+The counts come from the stats cube, which already tracks contracts per
+location. The index is rebuilt only when a location appears or disappears,
+so a keystroke never touches the table.
+"""
+import re
+import threading
+from bisect import bisect_left
+
+from sqlalchemy import String, case, false, func, literal, or_, select
+
+from app.core.config import settings
+from app.models.contract import Contract, ContractStatus
+
+SEARCH_ENGINES = ("auto", "trgm", "memory")
+# pg_trgm's default similarity threshold for the % operator.
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def engine_for(dialect_name: str) -> str:
+    if settings.LOCATION_SEARCH_ENGINE not in SEARCH_ENGINES:
+        raise ValueError(f"LOCATION_SEARCH_ENGINE must be one of: {', '.join(SEARCH_ENGINES)}")
+    if settings.LOCATION_SEARCH_ENGINE == "auto":
+        return "trgm" if dialect_name == "postgresql" else "memory"
+    return settings.LOCATION_SEARCH_ENGINE
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams as pg_trgm extracts them: per lowercased word, padded with
+    two spaces in front and one behind."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_prefix_pattern(q: str) -> str | None:
+    """Regex matching ``q`` at the start of a word after the first, with
+    words split as in ``trigrams``; None when ``q`` cannot start a word.
+
+    Postgres (``~``) and Python's ``re`` read it the same way, so both
+    engines agree on word boundaries.
+    """
+    q = q.strip()
+    if not _WORD.match(q):
+        return None
+    return r"(?i)(\W|_)" + re.escape(q)
+
+
+def _prefix_range(keys: list[tuple[str, str]], prefix: str) -> list[tuple[str, str]]:
+    lo = bisect_left(keys, (prefix,))
+    hi = bisect_left(keys, (prefix + "\U0010ffff",))
+    return keys[lo:hi]
+
+
+class LocationIndex:
+    def __init__(self, names):
+        self._names: list[tuple[str, str]] = sorted((n.lower(), n) for n in names)
+        # The name from each later word start on, so multi-word queries match
+        # too (see ``word_prefix_pattern``).
+        self._words: list[tuple[str, str]] = sorted(
+            (lowered[m.start() :], name)
+            for lowered, name in self._names
+            for m in _WORD.finditer(lowered)
+            if m.start() > 0
+        )
+        self._grams: dict[str, list[str]] = {}
+        self._gram_counts: dict[str, int] = {}
+        for _, name in self._names:
+            grams = trigrams(name)
+            self._gram_counts[name] = len(grams)
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(name)
+
+    def candidates(self, q: str) -> dict[str, tuple[int, float]]:
+        """name -> (tier, similarity) for every name matching ``q``."""
+        q = q.strip().lower()
+        found: dict[str, tuple[int, float]] = {}
+        query_grams = trigrams(q)
+        shared: dict[str, int] = {}
+        for gram in query_grams:
+            for name in self._grams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        similarity = {
+            name: n / (len(query_grams) + self._gram_counts[name] - n) for name, n in shared.items()
+        }
+        for name, sim in similarity.items():
+            if sim >= SIMILARITY_THRESHOLD:
+                found[name] = (2, sim)
+        for _, name in _prefix_range(self._words, q):
+            found[name] = (1, similarity.get(name, 0.0))
+        for _, name in _prefix_range(self._names, q):
+            found[name] = (0, similarity.get(name, 0.0))
+        return found
+
+
+_lock = threading.Lock()
+_index: LocationIndex | None = None
+_index_version: int | None = None
+
+
+def memory_search(cube, q: str, status: ContractStatus | None, limit: int) -> list[dict]:
+    """Top ``limit`` matches from the in-memory index over ``cube``'s locations."""
+    global _index, _index_version
+    with _lock:
+        if _index is None or _index_version != cube.locations_version:
+            _index_version = cube.locations_version
+            _index = LocationIndex(cube.locations())
+        index = _index
+    ranked = []
+    for name, (tier, sim) in index.candidates(q).items():
+        count = cube.location_count(name, status)
+        if count:
+            ranked.append((tier, -sim, -count, name))
+    ranked.sort()
+    return [{"location": name, "count": -count} for _, _, count, name in ranked[:limit]]
+
+
+def _like_escape(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def prefix_filters(q: str):
+    """``(starts, word_starts)``: the first two tiers as SQL predicates."""
+    q = q.strip()
+    pattern = word_prefix_pattern(q)
+    return (
+        Contract.location.ilike(_like_escape(q) + "%", escape="\\"),
+        Contract.location.regexp_match(pattern) if pattern else false(),
+    )
+
+
+def search_stmt(q: str, status: ContractStatus | None, limit: int):
+    """The ranked search as one pg_trgm query (Postgres only)."""
+    q = q.strip()
+    query = literal(q, String)
+    starts, word_starts = prefix_filters(q)
+    similar = Contract.location.op("%", is_comparison=True)(query)
+    filters = [or_(starts, word_starts, similar)]
+    if status is not None:
+        filters.append(Contract.status == status)
+    return (
+        select(Contract.location, func.count().label("count"))
+        .where(*filters)
+        .group_by(Contract.location)
+        .order_by(
+            case((starts, 0), (word_starts, 1), else_=2),
+            func.similarity(Contract.location, query).desc(),
+            func.count().desc(),
+            Contract.location,
+        )
+        .limit(limit)
+    )
@@ -1,16 +1,81 @@
+import base64
+import json
+import threading
 from datetime import date
+from decimal import Decimal
 
 from fastapi import HTTPException
-from sqlalchemy import and_, func, select
+from sqlalchemy import Integer, Numeric, and_, cast, func, literal, null, select, true, tuple_, type_coerce, union_all, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
-from app.models.contract import Contract, ContractStatus, EnergyType
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import replicas
+from app.models.contract import Contract, ContractStatus, DeliveryOverlaps, EnergyType
 from app.schemas.contract import (
     ContractCreate,
-    ContractListOut,
+    ContractFacetsOut,
+    ContractHistogramBucket,
     ContractPriceBoundsOut,
+    ContractStatsOut,
     ContractUpdate,
 )
+from app.services import contracts_columnar, contracts_feed, contracts_locations, contracts_stats, portfolio_service
+
+
+COUNT_STRATEGIES = ("exact", "estimated", "cached")
+# How start_from/end_to match a contract's delivery period: "within" keeps
+# contracts delivered entirely inside the window, "overlaps" those delivering
+# on any day of it (start_from == end_to: active on that date).
+DATE_MATCHES = ("within", "overlaps")
+
+_count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_MAX_ENTRIES,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+# Locations and price bounds only change when contracts are written. Entries
+# are keyed on the write generation, so a write makes every older entry
+# unreachable and the LRU ages them out.
+_read_cache = TTLCache(
+    maxsize=settings.READ_CACHE_MAX_ENTRIES,
+    ttl=settings.READ_CACHE_TTL_SECONDS,
+)
+_generation = 0
+_generation_lock = threading.Lock()
+
+# Read-only list queries select these columns as plain rows rather than ORM
+# entities, and the rows go straight to JSON (see _row_dict).
+ROW_COLUMNS = (
+    Contract.id,
+    Contract.energy_type,
+    Contract.quantity_mwh,
+    Contract.price_per_mwh,
+    Contract.delivery_start,
+    Contract.delivery_end,
+    Contract.location,
+    Contract.status,
+    Contract.version,
+)
+ROW_FIELDS = tuple(c.key for c in ROW_COLUMNS)
+
+SORT_MAP = {
+    "price": Contract.price_per_mwh,
+    "quantity": Contract.quantity_mwh,
+    "date": Contract.delivery_start,
+}
+
+# Facet -> the filter arguments it ignores when counting its own values.
+FACETS = {
+    "energy_type": ("energy_type",),
+    "location": ("location",),
+    "status": ("status",),
+    "price": ("price_min", "price_max"),
+    "quantity": ("qty_min", "qty_max"),
+}
 
 
 def get_price_bounds(
@@ -22,41 +87,141 @@ def get_price_bounds(
     qty_max: int | None,
     start_from: date | None,
     end_to: date | None,
+    date_match: str = "within",
 ) -> ContractPriceBoundsOut:
-    if qty_min is not None and qty_max is not None and qty_min > qty_max:
-        raise HTTPException(status_code=400, detail="qty_min cannot be greater than qty_max")
-    if start_from is not None and end_to is not None and start_from > end_to:
-        raise HTTPException(status_code=400, detail="start_from cannot be after end_to")
-
-    filters = _build_filters(
+    filter_args = price_bounds_filter_args(
         energy_type=energy_type,
         location=location,
         status=status,
-        price_min=None,
-        price_max=None,
         qty_min=qty_min,
         qty_max=qty_max,
         start_from=start_from,
         end_to=end_to,
+        date_match=date_match,
     )
+    if contracts_columnar.enabled():
+        return _to_price_bounds(_columnar(db).price_bounds(filter_args))
 
-    stmt = (
-        select(func.min(Contract.price_per_mwh), func.max(Contract.price_per_mwh)).where(
-            and_(*filters)
-        )
-        if filters
-        else select(func.min(Contract.price_per_mwh), func.max(Contract.price_per_mwh))
+    key = ("price_bounds", contracts_generation(), _filter_key(**filter_args))
+    cached = _read_cache.get(key)
+    if cached is not None:
+        return cached
+
+    bounds = _to_price_bounds(db.execute(_price_bounds_stmt(build_filters(**filter_args))).one())
+    _read_cache.set(key, bounds)
+    return bounds
+
+
+def list_locations(db: Session) -> list[str]:
+    if contracts_columnar.enabled():
+        return _columnar(db).locations()
+    key = ("locations", contracts_generation())
+    cached = _read_cache.get(key)
+    if cached is None:
+        cached = tuple(db.scalars(_locations_stmt()).all())
+        _read_cache.set(key, cached)
+    return list(cached)
+
+
+def search_locations(db: Session, q: str, status: ContractStatus | None, limit: int) -> list[dict]:
+    """Locations matching ``q`` by prefix, word prefix or similarity, with contract counts."""
+    q = validate_location_query(q)
+    if contracts_locations.engine_for(db.get_bind().dialect.name) == "memory":
+        return contracts_locations.memory_search(_stats_cube(db), q, status, limit)
+
+    key = ("location_search", contracts_generation(), q.lower(), status, limit)
+    cached = _read_cache.get(key)
+    if cached is None:
+        rows = db.execute(contracts_locations.search_stmt(q, status, limit)).all()
+        cached = tuple({"location": location, "count": count} for location, count in rows)
+        _read_cache.set(key, cached)
+    return list(cached)
+
+
+def get_facets(
+    db: Session,
+    energy_type: list[EnergyType] | None,
+    location: list[str] | None,
+    status: ContractStatus | None,
+    price_min: float | None,
+    price_max: float | None,
+    qty_min: int | None,
+    qty_max: int | None,
+    start_from: date | None,
+    end_to: date | None,
+    price_bucket: float,
+    qty_bucket: int,
+    date_match: str = "within",
+) -> ContractFacetsOut:
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
     )
-    min_price, max_price = db.execute(stmt).one()
-    return ContractPriceBoundsOut(
-        min_price=float(min_price) if min_price is not None else None,
-        max_price=float(max_price) if max_price is not None else None,
+    validate_facet_args(filter_args, price_bucket, qty_bucket)
+    key = ("facets", contracts_generation(), _filter_key(**filter_args), price_bucket, qty_bucket)
+    cached = _read_cache.get(key)
+    if cached is not None:
+        return cached
+
+    dialect_name = db.get_bind().dialect.name
+    rows = db.execute(_facets_stmt(dialect_name, filter_args, price_bucket, qty_bucket)).all()
+    facets = _to_facets(dialect_name, rows, price_bucket, qty_bucket)
+    _read_cache.set(key, facets)
+    return facets
+
+
+def get_stats(
+    db: Session,
+    energy_type: list[EnergyType] | None,
+    location: list[str] | None,
+    status: ContractStatus | None,
+    price_min: float | None,
+    price_max: float | None,
+    qty_min: int | None,
+    qty_max: int | None,
+    start_from: date | None,
+    end_to: date | None,
+    group_by: list[str] | None,
+    date_match: str = "within",
+) -> ContractStatsOut:
+    filter_args = dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=price_min,
+        price_max=price_max,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
     )
+    groups = validate_stats_args(filter_args, group_by)
+    if contracts_stats.can_serve(filter_args):
+        return ContractStatsOut(source="rollup", groups=_stats_cube(db).stats(filter_args, groups))
 
+    key = ("stats", contracts_generation(), _filter_key(**filter_args), groups)
+    cached = _read_cache.get(key)
+    if cached is not None:
+        return cached
 
-def list_locations(db: Session) -> list[str]:
-    stmt = select(Contract.location).distinct().order_by(Contract.location.asc())
-    return db.scalars(stmt).all()
+    rows = db.execute(contracts_stats.load_stmt(build_filters(**filter_args)))
+    stats = ContractStatsOut(source="sql", groups=contracts_stats.summarize(rows, groups))
+    _read_cache.set(key, stats)
+    return stats
+
+
+def contracts_generation() -> int:
+    """Number of contract writes seen by this process; bumps invalidate read caches."""
+    return _generation
 
 
 def create_contract(db: Session, payload: ContractCreate) -> Contract:
@@ -64,6 +229,7 @@ def create_contract(db: Session, payload: ContractCreate) -> Contract:
     db.add(c)
     db.commit()
     db.refresh(c)
+    invalidate_read_caches(upserted=c)
     return c
 
 
@@ -82,21 +248,13 @@ def list_contracts(
     qty_max: int | None,
     start_from: date | None,
     end_to: date | None,
-) -> ContractListOut:
-    if price_min is not None and price_max is not None and price_min > price_max:
-        raise HTTPException(status_code=400, detail="price_min cannot be greater than price_max")
-    if qty_min is not None and qty_max is not None and qty_min > qty_max:
-        raise HTTPException(status_code=400, detail="qty_min cannot be greater than qty_max")
-    if start_from is not None and end_to is not None and start_from > end_to:
-        raise HTTPException(status_code=400, detail="start_from cannot be after end_to")
-    if sort_dir not in ("asc", "desc"):
-        raise HTTPException(status_code=400, detail="sort_dir must be asc or desc")
-    if page < 1:
-        raise HTTPException(status_code=400, detail="page must be >= 1")
-    if page_size < 1 or page_size > 100:
-        raise HTTPException(status_code=400, detail="page_size must be 1..100")
-
-    filters = _build_filters(
+    pagination: str = "offset",
+    cursor: str | None = None,
+    count: str | None = None,
+    date_match: str = "within",
+) -> dict:
+    """One page of contracts as a JSON-ready dict shaped like ``ContractListOut``."""
+    filter_args = dict(
         energy_type=energy_type,
         location=location,
         status=status,
@@ -106,42 +264,97 @@ def list_contracts(
         qty_max=qty_max,
         start_from=start_from,
         end_to=end_to,
+        date_match=date_match,
     )
+    sort_key, sort_dir = validate_list_args(
+        filter_args,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        page=page,
+        page_size=page_size,
+        pagination=pagination,
+        count=count,
+        cursor=cursor,
+    )
+    if contracts_columnar.enabled():
+        return _columnar_list(
+            _columnar(db), filter_args, sort_key, sort_dir, page, page_size, pagination, cursor, count
+        )
+    filters = build_filters(**filter_args)
 
-    stmt = select(Contract).where(and_(*filters)) if filters else select(Contract)
+    if cursor is not None or pagination == "cursor":
+        stmt, backward = _keyset_stmt(filters, sort_key, sort_dir, page_size, cursor)
+        out = _keyset_page(
+            db.execute(stmt).all(), sort_key, sort_dir, page, page_size, cursor, backward
+        )
+        # Keyset pages skip the count unless the caller explicitly asks for one.
+        if count is not None:
+            out["total"], out["total_exact"] = _count_contracts(db, filters, filter_args, count)
+        return out
 
-    count_stmt = (
-        select(func.count()).select_from(Contract).where(and_(*filters))
-        if filters
-        else select(func.count()).select_from(Contract)
-    )
-    total = db.scalar(count_stmt) or 0
+    total, total_exact = _count_contracts(db, filters, filter_args, count or "exact")
+    items = db.execute(_offset_page_stmt(filters, sort_key, sort_dir, page, page_size)).all()
+    return _list_payload(items, page, page_size, total=total, total_exact=total_exact)
 
-    sort_map = {
-        "price": Contract.price_per_mwh,
-        "quantity": Contract.quantity_mwh,
-        "date": Contract.delivery_start,
-    }
-    if sort_by:
-        if sort_by not in sort_map:
-            raise HTTPException(
-                status_code=400,
-                detail="sort_by must be one of: price, quantity, date",
-            )
-        sort_col = sort_map[sort_by]
-        order = sort_col.asc() if sort_dir == "asc" else sort_col.desc()
-        stmt = stmt.order_by(order)
-    else:
-        stmt = stmt.order_by(Contract.id.desc())
 
-    offset = (page - 1) * page_size
-    items = db.scalars(stmt.offset(offset).limit(page_size)).all()
-    return ContractListOut(
-        items=items,
-        page=page,
-        page_size=page_size,
-        total=total,
+def _count_contracts(db: Session, filters: list, filter_args: dict, strategy: str) -> tuple[int, bool]:
+    """Return ``(total, exact)`` for the filtered contract set."""
+    if strategy == "estimated" and db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(_estimate_stmt(filters)).scalar()
+        return _plan_rows(plan), False
+
+    if strategy == "cached":
+        key = _filter_key(**filter_args)
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached, False
+        total = db.scalar(count_stmt(filters)) or 0
+        _count_cache.set(key, total)
+        return total, True
+
+    return db.scalar(count_stmt(filters)) or 0, True
+
+
+def _columnar(db: Session) -> contracts_columnar.ContractColumns:
+    index = contracts_columnar.index
+    if index.needs_reload():
+        index.reload(lambda: db.execute(contracts_columnar.load_stmt()).all())
+    return index
+
+
+def _stats_cube(db: Session) -> contracts_stats.StatsCube:
+    cube = contracts_stats.cube
+    if cube.needs_reload():
+        cube.reload(lambda: db.execute(contracts_stats.load_stmt()).all())
+    return cube
+
+
+def _columnar_list(
+    index: contracts_columnar.ContractColumns,
+    filter_args: dict,
+    sort_key: str,
+    sort_dir: str,
+    page: int,
+    page_size: int,
+    pagination: str,
+    cursor: str | None,
+    count: str | None,
+) -> dict:
+    """``list_contracts`` answered from the columnar copy; counts are always exact."""
+    if cursor is not None or pagination == "cursor":
+        after, backward = _decode_cursor(cursor, sort_key, sort_dir) if cursor is not None else (None, False)
+        items, _ = index.page(
+            filter_args, sort_key, sort_dir, limit=page_size + 1, after=after, backward=backward
+        )
+        out = _keyset_page(items, sort_key, sort_dir, page, page_size, cursor, backward)
+        if count is not None:
+            out["total"], out["total_exact"] = index.count(filter_args), True
+        return out
+
+    items, total = index.page(
+        filter_args, sort_key, sort_dir, offset=(page - 1) * page_size, limit=page_size
     )
+    return _list_payload(items, page, page_size, total=total, total_exact=True)
 
 
 def get_contract(db: Session, contract_id: int) -> Contract:
@@ -152,15 +365,36 @@ def get_contract(db: Session, contract_id: int) -> Contract:
 
 
 def update_contract(db: Session, contract_id: int, payload: ContractUpdate) -> Contract:
-    c = db.get(Contract, contract_id)
-    if not c:
-        raise HTTPException(status_code=404, detail="Contract not found")
+    values, expected_version = _update_values(payload)
+    if not values:
+        c = get_contract(db, contract_id)
+        _check_version(c.version, expected_version)
+        return c
+
+    dialect = db.get_bind().dialect.name
+    old = None
+    if CONTRIBUTION_FIELDS & values.keys():
+        current = db.execute(_contribution_stmt(contract_id)).one_or_none()
+        _check_version(current and current.version, expected_version)
+        old = _contribution(current)
 
-    for k, v in payload.model_dump(exclude_unset=True).items():
-        setattr(c, k, v)
+    row = db.execute(_update_stmt(contract_id, values, expected_version)).one_or_none()
+    if row is None:
+        db.rollback()
+        current = db.execute(_current_stmt(contract_id)).one_or_none()
+        _check_version(current and current.version, expected_version)
+        _check_delivery_window(values, current)
+        # The row exists at the expected version now, but the update missed it.
+        raise HTTPException(status_code=409, detail="Contract was modified concurrently")
+    c = Contract(**row._mapping)
+    if old is not None:
+        for stmt in portfolio_service.contract_change_stmts(
+            dialect, contract_id, old, portfolio_service.contribution(c)
+        ):
+            db.execute(stmt)
 
     db.commit()
-    db.refresh(c)
+    invalidate_read_caches(upserted=c)
     return c
 
 
@@ -168,11 +402,349 @@ def delete_contract(db: Session, contract_id: int) -> None:
     c = db.get(Contract, contract_id)
     if not c:
         return
+    for stmt in portfolio_service.contract_change_stmts(
+        db.get_bind().dialect.name, c.id, portfolio_service.contribution(c), None
+    ):
+        db.execute(stmt)
     db.delete(c)
     db.commit()
+    invalidate_read_caches(deleted_id=contract_id)
 
 
-def _build_filters(
+def price_bounds_filter_args(
+    *,
+    energy_type: list[EnergyType] | None,
+    location: list[str] | None,
+    status: ContractStatus | None,
+    qty_min: int | None,
+    qty_max: int | None,
+    start_from: date | None,
+    end_to: date | None,
+    date_match: str = "within",
+) -> dict:
+    if qty_min is not None and qty_max is not None and qty_min > qty_max:
+        raise HTTPException(status_code=400, detail="qty_min cannot be greater than qty_max")
+    if start_from is not None and end_to is not None and start_from > end_to:
+        raise HTTPException(status_code=400, detail="start_from cannot be after end_to")
+    _validate_date_match(date_match)
+    return dict(
+        energy_type=energy_type,
+        location=location,
+        status=status,
+        price_min=None,
+        price_max=None,
+        qty_min=qty_min,
+        qty_max=qty_max,
+        start_from=start_from,
+        end_to=end_to,
+        date_match=date_match,
+    )
+
+
+def _price_bounds_stmt(filters: list):
+    stmt = select(func.min(Contract.price_per_mwh), func.max(Contract.price_per_mwh))
+    return stmt.where(and_(*filters)) if filters else stmt
+
+
+def _to_price_bounds(row) -> ContractPriceBoundsOut:
+    min_price, max_price = row
+    return ContractPriceBoundsOut(
+        min_price=float(min_price) if min_price is not None else None,
+        max_price=float(max_price) if max_price is not None else None,
+    )
+
+
+def _locations_stmt():
+    return select(Contract.location).distinct().order_by(Contract.location.asc())
+
+
+def validate_list_args(
+    filter_args: dict,
+    *,
+    sort_by: str | None,
+    sort_dir: str,
+    page: int,
+    page_size: int,
+    pagination: str,
+    count: str | None,
+    cursor: str | None = None,
+) -> tuple[str, str]:
+    """Validate list arguments and return the effective sort key and direction.
+
+    Like the other ``validate_*`` helpers it never touches the database, so
+    routes call it before answering from an ETag: a bad request gets its 400,
+    not a 304."""
+    sort_key, sort_dir = validate_sort_args(filter_args, sort_by=sort_by, sort_dir=sort_dir)
+    if page < 1:
+        raise HTTPException(status_code=400, detail="page must be >= 1")
+    if page_size < 1 or page_size > 100:
+        raise HTTPException(status_code=400, detail="page_size must be 1..100")
+    if pagination not in ("offset", "cursor"):
+        raise HTTPException(status_code=400, detail="pagination must be offset or cursor")
+    if count is not None and count not in COUNT_STRATEGIES:
+        raise HTTPException(status_code=400, detail="count must be exact, estimated or cached")
+    if cursor is not None:
+        _decode_cursor(cursor, sort_key, sort_dir)
+    return sort_key, sort_dir
+
+
+def validate_sort_args(filter_args: dict, *, sort_by: str | None, sort_dir: str) -> tuple[str, str]:
+    """Validate filter ranges and sort arguments; return the effective sort key
+    and direction. Without ``sort_by`` contracts come newest first, whatever
+    ``sort_dir`` says, as they always have."""
+    _validate_filter_ranges(filter_args)
+    if sort_dir not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="sort_dir must be asc or desc")
+    if sort_by and sort_by not in SORT_MAP:
+        raise HTTPException(
+            status_code=400,
+            detail="sort_by must be one of: price, quantity, date",
+        )
+    if not sort_by:
+        return "id", "desc"
+    return sort_by, sort_dir
+
+
+def validate_facet_args(filter_args: dict, price_bucket: float, qty_bucket: int) -> None:
+    _validate_filter_ranges(filter_args)
+    if price_bucket <= 0 or qty_bucket <= 0:
+        raise HTTPException(status_code=400, detail="price_bucket and qty_bucket must be > 0")
+
+
+def validate_stats_args(filter_args: dict, group_by: list[str] | None) -> tuple[str, ...]:
+    """Validate stats arguments and return the effective grouping."""
+    _validate_filter_ranges(filter_args)
+    return _stats_groups(group_by)
+
+
+def _stats_groups(group_by: list[str] | None) -> tuple[str, ...]:
+    if not group_by:
+        return contracts_stats.STATS_GROUPS
+    unknown = set(group_by) - set(contracts_stats.STATS_GROUPS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by must be among: {', '.join(contracts_stats.STATS_GROUPS)}",
+        )
+    return tuple(g for g in contracts_stats.STATS_GROUPS if g in group_by)
+
+
+def _validate_filter_ranges(filter_args: dict) -> None:
+    price_min, price_max = filter_args["price_min"], filter_args["price_max"]
+    qty_min, qty_max = filter_args["qty_min"], filter_args["qty_max"]
+    start_from, end_to = filter_args["start_from"], filter_args["end_to"]
+    if price_min is not None and price_max is not None and price_min > price_max:
+        raise HTTPException(status_code=400, detail="price_min cannot be greater than price_max")
+    if qty_min is not None and qty_max is not None and qty_min > qty_max:
+        raise HTTPException(status_code=400, detail="qty_min cannot be greater than qty_max")
+    if start_from is not None and end_to is not None and start_from > end_to:
+        raise HTTPException(status_code=400, detail="start_from cannot be after end_to")
+    _validate_date_match(filter_args["date_match"])
+
+
+def validate_location_query(q: str) -> str:
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="q must not be blank")
+    return q
+
+
+def _validate_date_match(date_match: str) -> None:
+    if date_match not in DATE_MATCHES:
+        raise HTTPException(status_code=400, detail="date_match must be within or overlaps")
+
+
+def count_stmt(filters: list):
+    stmt = select(func.count()).select_from(Contract)
+    return stmt.where(and_(*filters)) if filters else stmt
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement whose filter values stay bound
+    parameters, so they are never parsed as SQL (or as ``:name`` binds)."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt):
+        self.stmt = stmt
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+def _estimate_stmt(filters: list):
+    # Planner row estimate for the filtered scan; cheap, but only as good as
+    # the table statistics.
+    return _Explain(select(Contract.id).where(and_(*filters)) if filters else select(Contract.id))
+
+
+def _plan_rows(plan) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _facet_filters(filter_args: dict, facet: str) -> list:
+    return build_filters(**{**filter_args, **{k: None for k in FACETS[facet]}})
+
+
+def _bucket(dialect_name: str, col, width):
+    # Widths are inlined so the select list and GROUP BY render identically.
+    if dialect_name == "postgresql":
+        return cast(func.floor(col / literal(width, Numeric(), literal_execute=True)), Integer)
+    return cast(col / literal(width, literal_execute=True), Integer)  # values are positive: truncation floors
+
+
+def _facets_stmt(dialect_name: str, filter_args: dict, price_bucket: float, qty_bucket: int):
+    """One statement returning every facet's counts.
+
+    On Postgres this is a single scan grouped by GROUPING SETS, each count
+    restricted with FILTER to the predicates of the other facets. Elsewhere
+    it is a UNION ALL of one GROUP BY per facet.
+    """
+    dims = {
+        "energy_type": Contract.energy_type,
+        "location": Contract.location,
+        "status": Contract.status,
+        "price": _bucket(dialect_name, Contract.price_per_mwh, price_bucket),
+        "quantity": _bucket(dialect_name, Contract.quantity_mwh, qty_bucket),
+    }
+    if dialect_name == "postgresql":
+        shared = build_filters(**{**filter_args, **{k: None for keys in FACETS.values() for k in keys}})
+        stmt = select(
+            *(dim.label(name) for name, dim in dims.items()),
+            *(func.grouping(dim).label(f"{name}_grouping") for name, dim in dims.items()),
+            *(func.count().filter(and_(true(), *_facet_filters(filter_args, name))).label(f"{name}_count") for name in dims),
+            func.count().filter(and_(true(), *build_filters(**filter_args))).label("total_count"),
+        ).select_from(Contract)
+        stmt = stmt.where(and_(*shared)) if shared else stmt
+        return stmt.group_by(func.grouping_sets(*dims.values(), tuple_()))
+
+    def branch(facet: str | None):
+        cols = [literal(facet or "total").label("facet")]
+        cols += [
+            (dim if name == facet else type_coerce(null(), dim.type)).label(name) for name, dim in dims.items()
+        ]
+        filters = _facet_filters(filter_args, facet) if facet else build_filters(**filter_args)
+        stmt = select(*cols, func.count().label("count")).select_from(Contract)
+        stmt = stmt.where(and_(*filters)) if filters else stmt
+        return stmt.group_by(dims[facet]) if facet else stmt
+
+    return union_all(*(branch(name) for name in dims), branch(None))
+
+
+def _to_facets(dialect_name: str, rows, price_bucket: float, qty_bucket: int) -> ContractFacetsOut:
+    counts: dict[str, dict] = {name: {} for name in FACETS}
+    total = 0
+    for row in rows:
+        m = row._mapping
+        if dialect_name == "postgresql":
+            facet = next((name for name in FACETS if not m[f"{name}_grouping"]), None)
+            count = m[f"{facet}_count"] if facet else m["total_count"]
+        else:
+            facet = m["facet"] if m["facet"] != "total" else None
+            count = m["count"]
+        if facet is None:
+            total = count
+        elif count:
+            counts[facet][m[facet]] = count
+
+    def histogram(buckets: dict, width) -> list[ContractHistogramBucket]:
+        return [
+            ContractHistogramBucket(lower=b * width, upper=(b + 1) * width, count=n)
+            for b, n in sorted(buckets.items())
+        ]
+
+    return ContractFacetsOut(
+        total=total,
+        energy_type={e.value: n for e, n in sorted(counts["energy_type"].items(), key=lambda i: i[0].value)},
+        location=dict(sorted(counts["location"].items())),
+        status={s.value: n for s, n in sorted(counts["status"].items(), key=lambda i: i[0].value)},
+        price=histogram(counts["price"], price_bucket),
+        quantity=histogram(counts["quantity"], qty_bucket),
+    )
+
+
+def _offset_page_stmt(filters: list, sort_key: str, sort_dir: str, page: int, page_size: int):
+    stmt = select(*ROW_COLUMNS).where(and_(*filters)) if filters else select(*ROW_COLUMNS)
+    stmt = stmt.order_by(*order_by(sort_key, sort_dir))
+    return stmt.offset((page - 1) * page_size).limit(page_size)
+
+
+def _keyset_stmt(
+    filters: list, sort_key: str, sort_dir: str, page_size: int, cursor: str | None
+) -> tuple:
+    """Return ``(stmt, backward)`` for one keyset page; fetches one extra row to detect more."""
+    backward = False
+    if cursor is not None:
+        after, backward = _decode_cursor(cursor, sort_key, sort_dir)
+        filters = [*filters, _keyset_predicate(sort_key, sort_dir, after, backward)]
+
+    # Walking backwards is the forward query with the order flipped; the page
+    # is reversed again in _keyset_page so items come out in the requested order.
+    order_dir = sort_dir
+    if backward:
+        order_dir = "asc" if sort_dir == "desc" else "desc"
+
+    stmt = select(*ROW_COLUMNS).where(and_(*filters)) if filters else select(*ROW_COLUMNS)
+    return stmt.order_by(*order_by(sort_key, order_dir)).limit(page_size + 1), backward
+
+
+def _keyset_page(
+    items: list,
+    sort_key: str,
+    sort_dir: str,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+    backward: bool,
+) -> dict:
+    has_more = len(items) > page_size
+    items = list(items[:page_size])
+    if backward:
+        items.reverse()
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        if has_more or backward:
+            next_cursor = _encode_cursor(sort_key, sort_dir, items[-1], backward=False)
+        if (has_more and backward) or (cursor is not None and not backward):
+            prev_cursor = _encode_cursor(sort_key, sort_dir, items[0], backward=True)
+
+    return _list_payload(items, page, page_size, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def _row_dict(item) -> dict:
+    if isinstance(item, Row):
+        return dict(zip(ROW_FIELDS, item))
+    return {f: getattr(item, f) for f in ROW_FIELDS}
+
+
+def _list_payload(
+    items: list,
+    page: int,
+    page_size: int,
+    *,
+    total: int | None = None,
+    total_exact: bool | None = None,
+    next_cursor: str | None = None,
+    prev_cursor: str | None = None,
+) -> dict:
+    return {
+        "items": [_row_dict(i) for i in items],
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_exact": total_exact,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
+
+
+def build_filters(
     *,
     energy_type: list[EnergyType] | None,
     location: list[str] | None,
@@ -183,6 +755,7 @@ def _build_filters(
     qty_max: int | None,
     start_from: date | None,
     end_to: date | None,
+    date_match: str = "within",
 ) -> list:
     filters: list = []
     if status is not None:
@@ -199,8 +772,189 @@ def _build_filters(
         filters.append(Contract.quantity_mwh >= qty_min)
     if qty_max is not None:
         filters.append(Contract.quantity_mwh <= qty_max)
+    if date_match == "overlaps":
+        if start_from is not None or end_to is not None:
+            filters.append(DeliveryOverlaps(start_from, end_to))
+        return filters
     if start_from is not None:
         filters.append(Contract.delivery_start >= start_from)
     if end_to is not None:
         filters.append(Contract.delivery_end <= end_to)
     return filters
+
+
+def _filter_key(
+    *,
+    energy_type: list[EnergyType] | None,
+    location: list[str] | None,
+    status: ContractStatus | None,
+    price_min: float | None,
+    price_max: float | None,
+    qty_min: int | None,
+    qty_max: int | None,
+    start_from: date | None,
+    end_to: date | None,
+    date_match: str = "within",
+) -> tuple:
+    """Hashable, order-insensitive key for the arguments of ``build_filters``."""
+    return (
+        tuple(sorted({e.value for e in energy_type})) if energy_type else None,
+        tuple(sorted(set(location))) if location else None,
+        status.value if status is not None else None,
+        price_min,
+        price_max,
+        qty_min,
+        qty_max,
+        start_from,
+        end_to,
+        date_match,
+    )
+
+
+# Fields that feed holders' portfolio summaries (see portfolio_service.contribution).
+CONTRIBUTION_FIELDS = frozenset({"energy_type", "quantity_mwh", "price_per_mwh"})
+
+
+def _update_values(payload: ContractUpdate) -> tuple[dict, int | None]:
+    values = payload.model_dump(exclude_unset=True)
+    return values, values.pop("version", None)
+
+
+def _update_stmt(contract_id: int, values: dict, expected_version: int | None):
+    """Apply ``values`` and bump the version in one statement, returning the
+    new row; with ``expected_version`` it is a compare-and-swap that matches
+    no row when someone else updated the contract first. It also matches no
+    row when a single new delivery date would invert the stored window."""
+    stmt = update(Contract).where(Contract.id == contract_id)
+    if expected_version is not None:
+        stmt = stmt.where(Contract.version == expected_version)
+    # Moving one end of the delivery window must not pass the stored other end.
+    if values.get("delivery_start") is not None and "delivery_end" not in values:
+        stmt = stmt.where(Contract.delivery_end >= values["delivery_start"])
+    if values.get("delivery_end") is not None and "delivery_start" not in values:
+        stmt = stmt.where(Contract.delivery_start <= values["delivery_end"])
+    return stmt.values(**values, version=Contract.version + 1).returning(*ROW_COLUMNS)
+
+
+def _contribution_stmt(contract_id: int):
+    # Locked, so the contribution read here is still the one the update
+    # replaces when the summaries are adjusted.
+    return (
+        select(Contract.energy_type, Contract.quantity_mwh, Contract.price_per_mwh, Contract.version)
+        .where(Contract.id == contract_id)
+        .with_for_update()
+    )
+
+
+def _contribution(row) -> portfolio_service.Contribution:
+    return row.energy_type, int(row.quantity_mwh), Decimal(str(row.price_per_mwh))
+
+
+def _current_stmt(contract_id: int):
+    return select(Contract.version, Contract.delivery_start, Contract.delivery_end).where(Contract.id == contract_id)
+
+
+def _check_version(current: int | None, expected: int | None) -> None:
+    """404 for a missing contract, 409 when it is not at ``expected``."""
+    if current is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    if expected is not None and current != expected:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Contract was modified concurrently (version {current}, expected {expected})",
+        )
+
+
+def _check_delivery_window(values: dict, current) -> None:
+    """422 when ``values`` would move the stored delivery window's start past its end."""
+    start = values.get("delivery_start", current.delivery_start)
+    end = values.get("delivery_end", current.delivery_end)
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=422, detail="delivery_start cannot be after delivery_end")
+
+
+def invalidate_read_caches(
+    *, upserted: Contract | None = None, deleted_id: int | None = None, publish: bool = True
+) -> None:
+    """Called after every committed contract write. Pass the written contract
+    (refreshed) or the deleted id when known so the columnar copy can apply it
+    in place and the change feed can carry it; otherwise it reloads on the
+    next read and feed clients are told to refetch."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    _count_cache.clear()
+    replicas.note_write()
+    if upserted is not None:
+        contracts_columnar.index.upsert(upserted)
+        contracts_stats.cube.upsert(upserted)
+        change = {"op": "upsert", "contract": _row_dict(upserted)}
+    elif deleted_id is not None:
+        contracts_columnar.index.delete(deleted_id)
+        contracts_stats.cube.delete(deleted_id)
+        change = {"op": "delete", "id": deleted_id}
+    else:
+        contracts_columnar.index.mark_stale()
+        contracts_stats.cube.mark_stale()
+        change = {"op": "reset"}
+    if publish:
+        contracts_feed.publish(change)
+
+
+def apply_remote_change(change: dict) -> None:
+    """Invalidate for a write another worker made, relayed by the change feed."""
+    if change["op"] == "upsert":
+        invalidate_read_caches(upserted=contracts_feed.contract_from_payload(change["contract"]), publish=False)
+    elif change["op"] == "delete":
+        invalidate_read_caches(deleted_id=change["id"], publish=False)
+    else:
+        invalidate_read_caches(publish=False)
+
+
+def order_by(sort_key: str, sort_dir: str) -> list:
+    # Contract.id breaks ties so that both offset and keyset pages are stable.
+    cols = [Contract.id] if sort_key == "id" else [SORT_MAP[sort_key], Contract.id]
+    return [c.asc() if sort_dir == "asc" else c.desc() for c in cols]
+
+
+def _keyset_predicate(sort_key: str, sort_dir: str, after: tuple, backward: bool):
+    value, last_id = after
+    forward_gt = (sort_dir == "asc") != backward
+    if sort_key == "id":
+        return Contract.id > last_id if forward_gt else Contract.id < last_id
+    row = tuple_(SORT_MAP[sort_key], Contract.id)
+    bound = tuple_(value, last_id)
+    return row > bound if forward_gt else row < bound
+
+
+def _encode_cursor(sort_key: str, sort_dir: str, contract: Contract, *, backward: bool) -> str:
+    value = contract.id if sort_key == "id" else getattr(contract, SORT_MAP[sort_key].key)
+    if isinstance(value, date):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    raw = json.dumps(
+        {"s": sort_key, "d": sort_dir, "v": value, "i": contract.id, "b": backward},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort_key: str, sort_dir: str) -> tuple[tuple, bool]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if data["s"] != sort_key or data["d"] != sort_dir:
+            raise HTTPException(status_code=400, detail="cursor does not match sort order")
+        value = data["v"]
+        if sort_key == "price":
+            value = Decimal(value)
+        elif sort_key == "date":
+            value = date.fromisoformat(value)
+        else:
+            value = int(value)
+        return (value, int(data["i"])), bool(data["b"])
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
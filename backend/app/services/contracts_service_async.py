@@ -0,0 +1,94 @@
+"""AsyncSession entry points for ``contracts_service``.
+
+Each call runs the sync implementation on the request's session through
+``AsyncSession.run_sync``; its statements still await the async driver, and
+validation, caching and the write hooks exist once. Only reloading the
+columnar copy or the stats cube is done here: the rows are fetched on the
+session and the snapshot is built on the threadpool, so a reload does not
+stall the event loop.
+"""
+import asyncio
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.contract import Contract, ContractStatus
+from app.schemas.contract import (
+    ContractCreate,
+    ContractFacetsOut,
+    ContractPriceBoundsOut,
+    ContractStatsOut,
+    ContractUpdate,
+)
+from app.services import contracts_columnar, contracts_locations, contracts_service, contracts_stats
+
+# Held while a snapshot reloads, so concurrent requests wait for one reload
+# instead of each fetching the whole table.
+_reload_lock = asyncio.Lock()
+
+
+async def _refresh(db: AsyncSession, snapshot, stmt) -> None:
+    """Reload ``snapshot`` (the columnar copy or the stats cube) from ``stmt`` if stale."""
+    if not snapshot.needs_reload():
+        return
+    async with _reload_lock:
+        if snapshot.needs_reload():
+            token = snapshot.begin_reload()
+            rows = (await db.execute(stmt)).all()
+            await run_in_threadpool(snapshot.load, rows, token)
+
+
+async def _refresh_columnar(db: AsyncSession) -> None:
+    if contracts_columnar.enabled():
+        await _refresh(db, contracts_columnar.index, contracts_columnar.load_stmt())
+
+
+async def _refresh_stats_cube(db: AsyncSession) -> None:
+    await _refresh(db, contracts_stats.cube, contracts_stats.load_stmt())
+
+
+async def get_price_bounds(db: AsyncSession, **kwargs) -> ContractPriceBoundsOut:
+    await _refresh_columnar(db)
+    return await db.run_sync(contracts_service.get_price_bounds, **kwargs)
+
+
+async def list_locations(db: AsyncSession) -> list[str]:
+    await _refresh_columnar(db)
+    return await db.run_sync(contracts_service.list_locations)
+
+
+async def search_locations(db: AsyncSession, q: str, status: ContractStatus | None, limit: int) -> list[dict]:
+    if contracts_locations.engine_for(db.get_bind().dialect.name) == "memory":
+        await _refresh_stats_cube(db)
+    return await db.run_sync(contracts_service.search_locations, q, status, limit)
+
+
+async def get_facets(db: AsyncSession, **kwargs) -> ContractFacetsOut:
+    return await db.run_sync(contracts_service.get_facets, **kwargs)
+
+
+async def get_stats(db: AsyncSession, **kwargs) -> ContractStatsOut:
+    if contracts_stats.can_serve(kwargs):
+        await _refresh_stats_cube(db)
+    return await db.run_sync(contracts_service.get_stats, **kwargs)
+
+
+async def list_contracts(db: AsyncSession, **kwargs) -> dict:
+    await _refresh_columnar(db)
+    return await db.run_sync(contracts_service.list_contracts, **kwargs)
+
+
+async def create_contract(db: AsyncSession, payload: ContractCreate) -> Contract:
+    return await db.run_sync(contracts_service.create_contract, payload)
+
+
+async def get_contract(db: AsyncSession, contract_id: int) -> Contract:
+    return await db.run_sync(contracts_service.get_contract, contract_id)
+
+
+async def update_contract(db: AsyncSession, contract_id: int, payload: ContractUpdate) -> Contract:
+    return await db.run_sync(contracts_service.update_contract, contract_id, payload)
+
+
+async def delete_contract(db: AsyncSession, contract_id: int) -> None:
+    await db.run_sync(contracts_service.delete_contract, contract_id)
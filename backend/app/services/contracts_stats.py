@@ -0,0 +1,299 @@
+"""Price and quantity statistics rollup for ``/contracts/stats``.
+
+The cube keeps one cell per (energy type, location, delivery month, status)
+with the contract count, total MWh, price sums and a count per distinct
+price in cents. Any grouping of those dimensions is a merge of cells, and
+percentiles are exact without touching the rows: a cell holds as many
+entries as it has distinct prices.
+
+It is maintained like the columnar copy. The first read loads it. The
+contract write paths in ``contracts_service`` apply each change in place,
+using the contribution remembered per id to retract the old values. Writes
+the process cannot see mark it stale, and the next read reloads it, as does
+age past STATS_CUBE_MAX_AGE_SECONDS.
+
+It also counts contracts per location and status for the location search
+(``contracts_locations``), which needs the same per-id bookkeeping.
+
+The cube answers filters on its own dimensions, with a "within" ``start_from``
+on the first of a month. Price, quantity and ``end_to`` filters, and
+delivery-window overlaps, are answered by ``summarize`` over the matching
+rows from a live query.
+"""
+import math
+import threading
+import time
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import and_, select
+
+from app.core.config import settings
+from app.models.contract import Contract, ContractStatus, EnergyType
+
+STATS_GROUPS = ("energy_type", "location", "delivery_month")
+# Interpolated like Postgres percentile_cont.
+PERCENTILES = {"p10": 0.10, "p25": 0.25, "median": 0.50, "p75": 0.75, "p90": 0.90}
+
+LOAD_COLUMNS = (
+    Contract.id,
+    Contract.energy_type,
+    Contract.location,
+    Contract.delivery_start,
+    Contract.status,
+    Contract.price_per_mwh,
+    Contract.quantity_mwh,
+)
+
+
+def load_stmt(filters: list | None = None):
+    stmt = select(*LOAD_COLUMNS)
+    return stmt.where(and_(*filters)) if filters else stmt
+
+
+def can_serve(filter_args: dict) -> bool:
+    """Whether the cube alone answers ``filter_args`` (see ``build_filters``)."""
+    start_from = filter_args["start_from"]
+    if filter_args.get("date_match") == "overlaps" and start_from is not None:
+        return False
+    return (
+        all(filter_args[k] is None for k in ("price_min", "price_max", "qty_min", "qty_max", "end_to"))
+        and (start_from is None or start_from.day == 1)
+    )
+
+
+def _cents(price) -> int:
+    return int((Decimal(str(price)) * 100).to_integral_value())
+
+
+class _Cell:
+    __slots__ = ("count", "mwh", "price_sum", "value_sum", "prices")
+
+    def __init__(self):
+        self.count = 0
+        self.mwh = 0
+        self.price_sum = 0  # cents
+        self.value_sum = 0  # cents * MWh
+        self.prices: Counter[int] = Counter()
+
+    def add(self, cents: int, qty: int, sign: int = 1) -> None:
+        self.count += sign
+        self.mwh += sign * qty
+        self.price_sum += sign * cents
+        self.value_sum += sign * cents * qty
+        self.prices[cents] += sign
+        if not self.prices[cents]:
+            del self.prices[cents]
+
+    def merge(self, other: "_Cell") -> None:
+        self.count += other.count
+        self.mwh += other.mwh
+        self.price_sum += other.price_sum
+        self.value_sum += other.value_sum
+        self.prices.update(other.prices)
+
+
+def _nth(ordered: list[tuple[int, int]], n: int) -> int:
+    """The ``n``-th smallest price (0-based) from ``(price, count)`` pairs."""
+    seen = 0
+    for value, count in ordered:
+        seen += count
+        if seen > n:
+            return value
+    return ordered[-1][0]
+
+
+def _percentile(ordered: list[tuple[int, int]], count: int, q: float) -> float:
+    rank = q * (count - 1)
+    lo = math.floor(rank)
+    low = _nth(ordered, lo)
+    high = _nth(ordered, lo + 1) if rank > lo else low
+    return round((low + (high - low) * (rank - lo)) / 100, 2)
+
+
+def _summary(keys: dict, cell: _Cell) -> dict:
+    ordered = sorted(cell.prices.items())
+    return {
+        **keys,
+        "contracts": cell.count,
+        "total_mwh": cell.mwh,
+        "avg_price": round(cell.price_sum / cell.count / 100, 2),
+        "weighted_avg_price": round(cell.value_sum / cell.mwh / 100, 2),
+        "min_price": ordered[0][0] / 100,
+        **{name: _percentile(ordered, cell.count, q) for name, q in PERCENTILES.items()},
+        "max_price": ordered[-1][0] / 100,
+    }
+
+
+class StatsCube:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._cells: dict[tuple, _Cell] = {}
+        # id -> (cell key, cents, MWh): what to retract when the row changes.
+        self._rows: dict[int, tuple[tuple, int, int]] = {}
+        self._location_counts: dict[str, Counter[ContractStatus]] = {}
+        # Bumped whenever a location appears or disappears.
+        self.locations_version = 0
+        self._loaded_at: float | None = None
+        # Writes seen, and how many of them the loaded cells reflect; the
+        # cube is stale while the two differ.
+        self._writes = 0
+        self._generation = 0
+        self._reload_lock = threading.Lock()
+        self.loads = 0
+
+    # -- freshness -------------------------------------------------------
+
+    def needs_reload(self) -> bool:
+        with self._lock:
+            return (
+                self._generation != self._writes
+                or self._loaded_at is None
+                or time.monotonic() - self._loaded_at > settings.STATS_CUBE_MAX_AGE_SECONDS
+            )
+
+    def begin_reload(self) -> int:
+        """Token for ``load``: writes seen after this point keep the cube stale."""
+        with self._lock:
+            return self._writes
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            self._writes += 1
+
+    def reload(self, fetch) -> None:
+        """Rebuild from ``fetch()``, rows of ``load_stmt()``, if still needed,
+        one rebuild at a time (see ``ContractColumns.reload``)."""
+        with self._reload_lock:
+            if not self.needs_reload():
+                return
+            token = self.begin_reload()
+            self.load(fetch(), token)
+
+    def load(self, rows, token: int) -> None:
+        """Rebuild from ``rows`` of ``load_stmt()``, read after ``begin_reload``
+        returned ``token``. Rows older than the loaded cells are dropped."""
+        cells: dict[tuple, _Cell] = {}
+        contributions = {}
+        location_counts: dict[str, Counter[ContractStatus]] = {}
+        for contract_id, energy_type, location, start, status, price, qty in rows:
+            key = (EnergyType(energy_type), location, start.replace(day=1), ContractStatus(status))
+            cents = _cents(price)
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = _Cell()
+            cell.add(cents, qty)
+            contributions[contract_id] = (key, cents, qty)
+            location_counts.setdefault(location, Counter())[key[3]] += 1
+        with self._lock:
+            if token < self._generation:
+                return
+            self._cells, self._rows = cells, contributions
+            self._location_counts = location_counts
+            self.locations_version += 1
+            self._loaded_at = time.monotonic()
+            self._generation = token
+            self.loads += 1
+
+    # -- incremental writes ----------------------------------------------
+
+    def upsert(self, c: Contract) -> None:
+        key = (EnergyType(c.energy_type), c.location, c.delivery_start.replace(day=1), ContractStatus(c.status))
+        with self._lock:
+            if self._loaded_at is None:
+                # Nothing to apply it to, but a first load in flight may miss it.
+                self._writes += 1
+                return
+            self._applied_write()
+            self._retract(c.id)
+            self._add(c.id, key, _cents(c.price_per_mwh), c.quantity_mwh)
+
+    def delete(self, contract_id: int) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                self._writes += 1
+                return
+            self._applied_write()
+            self._retract(contract_id)
+
+    def _applied_write(self) -> None:
+        # A write applied in place keeps a current cube current.
+        if self._generation == self._writes:
+            self._generation += 1
+        self._writes += 1
+
+    def _add(self, contract_id: int, key: tuple, cents: int, qty: int) -> None:
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = _Cell()
+        cell.add(cents, qty)
+        self._rows[contract_id] = (key, cents, qty)
+        location, status = key[1], key[3]
+        if location not in self._location_counts:
+            self._location_counts[location] = Counter()
+            self.locations_version += 1
+        self._location_counts[location][status] += 1
+
+    def _retract(self, contract_id: int) -> None:
+        old = self._rows.pop(contract_id, None)
+        if old is None:
+            return
+        key, cents, qty = old
+        cell = self._cells[key]
+        cell.add(cents, qty, -1)
+        if not cell.count:
+            del self._cells[key]
+        counts = self._location_counts[key[1]]
+        counts[key[3]] -= 1
+        if not counts.total():
+            del self._location_counts[key[1]]
+            self.locations_version += 1
+
+    # -- reads -------------------------------------------------------------
+
+    def stats(self, filter_args: dict, group_by: tuple[str, ...]) -> list[dict]:
+        """One summary per group of the cells passing ``filter_args``, which
+        ``can_serve`` must accept."""
+        status = filter_args["status"]
+        energy_types = set(filter_args["energy_type"] or ())
+        locations = set(filter_args["location"] or ())
+        start_from = filter_args["start_from"]
+        groups: dict[tuple, _Cell] = {}
+        with self._lock:
+            for (energy_type, location, month, cell_status), cell in self._cells.items():
+                if (
+                    (status is not None and cell_status != status)
+                    or (energy_types and energy_type not in energy_types)
+                    or (locations and location not in locations)
+                    or (start_from is not None and month < start_from)
+                ):
+                    continue
+                values = {"energy_type": energy_type, "location": location, "delivery_month": month}
+                key = tuple(values[name] for name in group_by)
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _Cell()
+                group.merge(cell)
+        return [_summary(dict(zip(group_by, key)), cell) for key, cell in sorted(groups.items())]
+
+    def locations(self) -> list[str]:
+        with self._lock:
+            return list(self._location_counts)
+
+    def location_count(self, location: str, status: ContractStatus | None) -> int:
+        with self._lock:
+            counts = self._location_counts.get(location)
+            if counts is None:
+                return 0
+            return counts.total() if status is None else counts[status]
+
+
+def summarize(rows, group_by: tuple[str, ...]) -> list[dict]:
+    """Summaries for ``rows`` of a filtered ``load_stmt``, as ``StatsCube.stats`` gives them."""
+    cube = StatsCube()
+    cube.load(rows, cube.begin_reload())
+    return cube.stats(dict(status=None, energy_type=None, location=None, start_from=None), group_by)
+
+
+cube = StatsCube()
@@ -0,0 +1,292 @@
+from decimal import Decimal
+
+from sqlalchemy import Numeric, cast, delete, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.contract import Contract, EnergyType
+from app.models.portfolio import PortfolioItem, PortfolioSummary
+from app.schemas.portfolio import PortfolioBatchOut, PortfolioBatchResult, PortfolioMetrics
+
+CENTS = Decimal("0.01")
+
+# (energy_type, quantity_mwh, price_per_mwh): the part of a contract that
+# contributes to portfolio metrics.
+Contribution = tuple[EnergyType, int, Decimal]
+
+
+def items_stmt(user_id: int, limit: int | None = None, before_id: int | None = None):
+    """Newest-first portfolio items with their contracts joined in the same query."""
+    stmt = (
+        select(PortfolioItem)
+        .where(PortfolioItem.user_id == user_id)
+        .options(joinedload(PortfolioItem.contract, innerjoin=True))
+        .order_by(PortfolioItem.id.desc())
+    )
+    if before_id is not None:
+        stmt = stmt.where(PortfolioItem.id < before_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def build_metrics(rows) -> PortfolioMetrics:
+    """Turn per-energy-type ``(energy_type, contracts, capacity_mwh, cost)``
+    rows into portfolio metrics, keeping Decimal precision."""
+    by_type: dict[str, dict[str, Decimal]] = {}
+    total_contracts, total_capacity, total_cost = 0, 0, Decimal(0)
+    for energy_type, contracts, capacity, cost in rows:
+        by_type[energy_type.value] = {
+            "capacity_mwh": Decimal(capacity),
+            "cost": Decimal(cost).quantize(CENTS),
+        }
+        total_contracts += contracts
+        total_capacity += int(capacity)
+        total_cost += Decimal(cost)
+    weighted_avg = total_cost / total_capacity if total_capacity else Decimal(0)
+
+    return PortfolioMetrics(
+        total_contracts=total_contracts,
+        total_capacity_mwh=total_capacity,
+        total_cost=total_cost.quantize(CENTS),
+        weighted_avg_price_per_mwh=weighted_avg.quantize(CENTS),
+        by_energy_type=by_type,
+    )
+
+
+def contribution(contract: Contract) -> Contribution:
+    return contract.energy_type, int(contract.quantity_mwh), Decimal(str(contract.price_per_mwh))
+
+
+def summary_rows_stmt(user_id: int):
+    return select(PortfolioSummary).where(
+        PortfolioSummary.user_id == user_id, PortfolioSummary.contracts > 0
+    )
+
+
+def build_metrics_from_summary(summaries) -> PortfolioMetrics:
+    return build_metrics(
+        [(s.energy_type, s.contracts, s.capacity_mwh, s.cost) for s in summaries]
+    )
+
+
+# Portfolio and summary writes are ON CONFLICT upserts.
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def check_dialect(dialect_name: str) -> None:
+    """Called at startup, so an unsupported database fails there rather than
+    on the first portfolio write."""
+    if dialect_name not in UPSERT_INSERTS:
+        raise RuntimeError(
+            f"Portfolio writes need ON CONFLICT upserts, supported on: {', '.join(UPSERT_INSERTS)} "
+            f"(got {dialect_name})"
+        )
+
+
+def _insert(dialect_name: str, model):
+    return UPSERT_INSERTS[dialect_name](model)
+
+
+def _add_to_summary(stmt):
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "energy_type"],
+        set_={
+            "contracts": PortfolioSummary.contracts + stmt.excluded.contracts,
+            "capacity_mwh": PortfolioSummary.capacity_mwh + stmt.excluded.capacity_mwh,
+            "cost": PortfolioSummary.cost + stmt.excluded.cost,
+        },
+    )
+
+
+SUMMARY_COLUMNS = ["user_id", "energy_type", "contracts", "capacity_mwh", "cost"]
+
+
+def summary_delta_stmt(
+    dialect_name: str,
+    contrib: Contribution,
+    sign: int,
+    *,
+    user_id: int | None = None,
+    contract_id: int | None = None,
+):
+    """Add ``sign`` times a contract's contribution to one user's summary, or
+    to every user holding ``contract_id``, in a single upsert."""
+    energy_type, quantity, price = contrib
+    capacity = sign * quantity
+    cost = (sign * quantity * price).quantize(CENTS)
+
+    stmt = _insert(dialect_name, PortfolioSummary)
+    if user_id is not None:
+        stmt = stmt.values(
+            user_id=user_id, energy_type=energy_type, contracts=sign, capacity_mwh=capacity, cost=cost
+        )
+    else:
+        stmt = stmt.from_select(
+            SUMMARY_COLUMNS,
+            select(
+                PortfolioItem.user_id,
+                cast(literal(energy_type, PortfolioSummary.energy_type.type), PortfolioSummary.energy_type.type),
+                literal(sign),
+                literal(capacity),
+                cast(literal(cost, Numeric(18, 2)), Numeric(18, 2)),
+            ).where(PortfolioItem.contract_id == contract_id),
+        )
+    return _add_to_summary(stmt)
+
+
+def summary_batch_delta_stmt(dialect_name: str, user_id: int, contract_ids: list[int], sign: int):
+    """Add (or with ``sign=-1`` subtract) the contributions of several
+    contracts to one user's summary, grouped by energy type in one upsert."""
+    return _add_to_summary(
+        _insert(dialect_name, PortfolioSummary).from_select(
+            SUMMARY_COLUMNS,
+            select(
+                literal(user_id),
+                Contract.energy_type,
+                sign * func.count(),
+                sign * func.sum(Contract.quantity_mwh),
+                sign * func.sum(Contract.quantity_mwh * Contract.price_per_mwh, type_=Numeric(18, 2)),
+            )
+            .where(Contract.id.in_(contract_ids))
+            .group_by(Contract.energy_type),
+        )
+    )
+
+
+def add_items_stmt(dialect_name: str, user_id: int, contract_ids: list[int]):
+    """Insert portfolio items for the existing contracts among ``contract_ids``,
+    skipping ones already held; returns the contract ids actually added."""
+    stmt = _insert(dialect_name, PortfolioItem).from_select(
+        ["user_id", "contract_id"],
+        select(literal(user_id), Contract.id).where(Contract.id.in_(contract_ids)),
+    )
+    return stmt.on_conflict_do_nothing(index_elements=["user_id", "contract_id"]).returning(
+        PortfolioItem.contract_id
+    )
+
+
+def remove_items_stmt(user_id: int, contract_ids: list[int]):
+    """Delete a user's items for ``contract_ids``; returns the contract ids removed."""
+    return (
+        delete(PortfolioItem)
+        .where(PortfolioItem.user_id == user_id, PortfolioItem.contract_id.in_(contract_ids))
+        .returning(PortfolioItem.contract_id)
+    )
+
+
+def existing_contracts_stmt(contract_ids: list[int]):
+    return select(Contract.id).where(Contract.id.in_(contract_ids))
+
+
+def add_items(db: Session, user_id: int, contract_ids: list[int]) -> tuple[set[int], set[int]]:
+    """Add contracts in one INSERT ... ON CONFLICT DO NOTHING and fold the
+    added ones into the summary; returns the (added, not found) contract ids.
+    The caller commits."""
+    dialect = db.get_bind().dialect.name
+    added = set(db.scalars(add_items_stmt(dialect, user_id, contract_ids)))
+    missing = set()
+    if len(added) < len(contract_ids):
+        rest = [cid for cid in contract_ids if cid not in added]
+        missing = set(rest) - set(db.scalars(existing_contracts_stmt(rest)))
+    if added:
+        db.execute(summary_batch_delta_stmt(dialect, user_id, list(added), 1))
+    return added, missing
+
+
+def remove_items(db: Session, user_id: int, contract_ids: list[int]) -> set[int]:
+    """Remove contracts in one DELETE and take them out of the summary;
+    returns the contract ids removed. The caller commits."""
+    removed = set(db.scalars(remove_items_stmt(user_id, contract_ids)))
+    if removed:
+        db.execute(summary_batch_delta_stmt(db.get_bind().dialect.name, user_id, list(removed), -1))
+    return removed
+
+
+def batch_results(
+    contract_ids: list[int], changed: set[int], status: str, missing: set[int] = frozenset()
+) -> PortfolioBatchOut:
+    """Per-id outcome of a batch call: ``status`` for the ids the statement
+    touched, ``not_found`` for unknown contracts, ``unchanged`` otherwise."""
+    return PortfolioBatchOut(
+        results=[
+            PortfolioBatchResult(
+                contract_id=cid,
+                status=status if cid in changed else "not_found" if cid in missing else "unchanged",
+            )
+            for cid in contract_ids
+        ]
+    )
+
+
+def contract_change_stmts(
+    dialect_name: str, contract_id: int, old: Contribution | None, new: Contribution | None
+) -> list:
+    """Summary updates for every holder of a contract that changed or was deleted."""
+    if old == new:
+        return []
+    stmts = []
+    if old is not None:
+        stmts.append(summary_delta_stmt(dialect_name, old, -1, contract_id=contract_id))
+    if new is not None:
+        stmts.append(summary_delta_stmt(dialect_name, new, 1, contract_id=contract_id))
+    return stmts
+
+
+def _recomputed_stmt(user_id: int | None):
+    stmt = (
+        select(
+            PortfolioItem.user_id,
+            Contract.energy_type,
+            func.count().label("contracts"),
+            func.sum(Contract.quantity_mwh).label("capacity_mwh"),
+            func.sum(Contract.quantity_mwh * Contract.price_per_mwh, type_=Numeric(18, 2)).label("cost"),
+        )
+        .join(Contract, Contract.id == PortfolioItem.contract_id)
+        .group_by(PortfolioItem.user_id, Contract.energy_type)
+    )
+    if user_id is not None:
+        stmt = stmt.where(PortfolioItem.user_id == user_id)
+    return stmt
+
+
+def diff_summary(db: Session, user_id: int | None = None) -> list[dict]:
+    """Compare the maintained summary with a full recomputation.
+
+    Returns one entry per (user_id, energy_type) that disagrees; empty means
+    consistent.
+    """
+    expected = {
+        (r.user_id, r.energy_type): (r.contracts, int(r.capacity_mwh), Decimal(r.cost).quantize(CENTS))
+        for r in db.execute(_recomputed_stmt(user_id))
+    }
+    stored_stmt = select(PortfolioSummary).where(PortfolioSummary.contracts != 0)
+    if user_id is not None:
+        stored_stmt = stored_stmt.where(PortfolioSummary.user_id == user_id)
+    stored = {
+        (s.user_id, s.energy_type): (s.contracts, int(s.capacity_mwh), Decimal(s.cost).quantize(CENTS))
+        for s in db.scalars(stored_stmt)
+    }
+
+    diffs = []
+    for key in sorted(expected.keys() | stored.keys(), key=lambda k: (k[0], k[1].value)):
+        if expected.get(key) != stored.get(key):
+            diffs.append(
+                {
+                    "user_id": key[0],
+                    "energy_type": key[1].value,
+                    "expected": expected.get(key),
+                    "stored": stored.get(key),
+                }
+            )
+    return diffs
+
+
+def rebuild_summary(db: Session, user_id: int | None = None) -> None:
+    """Replace the maintained summary with a full recomputation."""
+    stmt = delete(PortfolioSummary)
+    if user_id is not None:
+        stmt = stmt.where(PortfolioSummary.user_id == user_id)
+    db.execute(stmt)
+    db.execute(PortfolioSummary.__table__.insert().from_select(SUMMARY_COLUMNS, _recomputed_stmt(user_id)))
+    db.commit()
@@ -0,0 +1,91 @@
+"""Token throughput: create_access_token / decode_token against the previous
+implementation, which re-keyed the HMAC and compared base64 strings on every
+call.
+
+    python benchmarks/bench_jwt.py --iterations 100000
+
+"decode_cached" is the steady state for a dashboard client that keeps
+presenting the same token. "decode_uncached" clears the verified-token cache
+before each call, so it measures the precomputed-HMAC path plus the cost of
+filling the cache.
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def baseline_create(sub: str) -> str:
+    header = {"alg": "HS256", "typ": "JWT"}
+    payload = {"sub": sub, "exp": int(time.time()) + settings.JWT_EXPIRES_MINUTES * 60}
+    header_b64 = _b64url_encode(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+    payload_b64 = _b64url_encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+    signature = hmac.new(settings.JWT_SECRET.encode("utf-8"), signing_input, hashlib.sha256).digest()
+    return f"{header_b64}.{payload_b64}.{_b64url_encode(signature)}"
+
+
+def baseline_decode(token: str) -> dict:
+    header_b64, payload_b64, signature_b64 = token.split(".")
+    signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+    expected = hmac.new(settings.JWT_SECRET.encode("utf-8"), signing_input, hashlib.sha256).digest()
+    if not hmac.compare_digest(_b64url_encode(expected), signature_b64):
+        raise ValueError("bad signature")
+    payload = json.loads(_b64url_decode(payload_b64))
+    if int(payload["exp"]) < int(time.time()):
+        raise ValueError("expired")
+    return payload
+
+
+def ops_per_second(fn, iterations: int) -> int:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return int(iterations / (time.perf_counter() - started))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    token = security.create_access_token("demo")
+
+    def uncached():
+        security._verified.clear()
+        security.decode_token(token)
+
+    results = {
+        "create_baseline_ops": ops_per_second(lambda: baseline_create("demo"), n),
+        "create_ops": ops_per_second(lambda: security.create_access_token("demo"), n),
+        "decode_baseline_ops": ops_per_second(lambda: baseline_decode(token), n),
+        "decode_uncached_ops": ops_per_second(uncached, n),
+        "decode_cached_ops": ops_per_second(lambda: security.decode_token(token), n),
+    }
+    print(json.dumps({"iterations": n, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Compare the maintained portfolio summary with a full recomputation.
+
+Usage:
+    python check_portfolio_summary.py [--user-id N] [--rebuild]
+
+Exits non-zero when the summary has drifted and --rebuild was not given.
+"""
+import argparse
+import sys
+
+from app.db.session import SessionLocal
+from app.services import portfolio_service
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the summary from portfolio_items")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        diffs = portfolio_service.diff_summary(db, args.user_id)
+        for d in diffs:
+            print(f"user={d['user_id']} type={d['energy_type']} expected={d['expected']} stored={d['stored']}")
+        if not diffs:
+            print("Portfolio summary is consistent.")
+            return 0
+        if args.rebuild:
+            portfolio_service.rebuild_summary(db, args.user_id)
+            print(f"Rebuilt portfolio summary ({len(diffs)} rows differed).")
+            return 0
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(run())
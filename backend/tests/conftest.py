@@ -2,29 +2,33 @@ import os
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
 
 from app.db.base import Base  # noqa: E402
-from app.db.session import get_db  # noqa: E402
+from app.db.replicas import get_read_db  # noqa: E402
+from app.db.session import get_db, install_metrics_events  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models import contract as _contract_model  # noqa: F401,E402
 from app.models import portfolio as _portfolio_model  # noqa: F401,E402
+from app.services import contracts_service  # noqa: E402
 
 engine = create_engine(
     "sqlite+pysqlite:///:memory:",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+install_metrics_events(engine)
 TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
 @pytest.fixture(scope="function")
 def client():
     Base.metadata.create_all(bind=engine)
+    contracts_service.invalidate_read_caches()
 
     def override_get_db():
         db = TestingSessionLocal()
@@ -34,7 +38,31 @@ def client():
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def sql_statements():
+    """Collects every SQL statement the test engine executes while active."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def db_session(client):
+    """A session on the same in-memory database the ``client`` app uses."""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.replicas import get_async_read_db
+from app.db.session import async_database_url, get_async_db
+from app.main import prefer_async_routes
+from app.routers.contracts import router as contracts_router
+from app.routers.contracts_async import router as contracts_async_router
+from app.routers.portfolio import router as portfolio_router
+from app.routers.portfolio_async import router as portfolio_async_router
+from app.services import contracts_columnar, contracts_service, contracts_stats
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    url = f"sqlite+pysqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    contracts_service.invalidate_read_caches()
+
+    engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(prefer_async_routes(contracts_router, contracts_async_router), prefix="/api")
+    app.include_router(prefer_async_routes(portfolio_router, portfolio_async_router), prefix="/api")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+
+
+def test_async_database_url():
+    assert async_database_url("postgresql+psycopg2://u:p@db:5432/energy") == (
+        "postgresql+asyncpg://u:p@db:5432/energy"
+    )
+    assert async_database_url("sqlite+pysqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+
+
+def test_async_routes_keep_literal_paths_ahead_of_ids():
+    merged = prefer_async_routes(contracts_router, contracts_async_router)
+    paths = [r.path for r in merged.routes]
+    assert paths.index("/contracts/locations") < paths.index("/contracts/{contract_id}")
+    assert paths.index("/contracts/changes") < paths.index("/contracts/{contract_id}")
+    modules = {r.path + str(sorted(r.methods)): r.endpoint.__module__ for r in merged.routes}
+    assert modules["/contracts['GET']"] == "app.routers.contracts_async"
+    assert modules["/contracts/{contract_id}['PATCH']"] == "app.routers.contracts_async"
+    # Endpoints without an async counterpart stay on the sync router.
+    assert modules["/contracts/bulk['POST']"] == "app.routers.contracts"
+
+
+def test_async_contracts_and_portfolio(async_client):
+    payload = {
+        "energy_type": "Solar",
+        "quantity_mwh": 500,
+        "price_per_mwh": 45.5,
+        "delivery_start": "2026-03-01",
+        "delivery_end": "2026-05-31",
+        "location": "California",
+    }
+    created = async_client.post("/api/contracts", json=payload)
+    assert created.status_code == 201
+    contract_id = created.json()["id"]
+
+    listed = async_client.get("/api/contracts", params={"count": "cached"}).json()
+    list_etag = async_client.get("/api/contracts").headers["etag"]
+    bad_sort = async_client.get("/api/contracts", params={"sort_by": "name"}, headers={"If-None-Match": list_etag})
+    assert bad_sort.status_code == 400
+    assert listed["total"] == 1 and [c["id"] for c in listed["items"]] == [contract_id]
+    assert async_client.get("/api/contracts/locations").json() == ["California"]
+    matches = async_client.get("/api/contracts/locations/search", params={"q": "cali"}).json()
+    assert matches == [{"location": "California", "count": 1}]
+    assert async_client.get("/api/contracts/price-bounds").json()["max_price"] == 45.5
+    stats = async_client.get("/api/contracts/stats", params={"group_by": "location"}).json()
+    assert stats["source"] == "rollup" and stats["groups"][0]["total_mwh"] == 500
+    etag = async_client.get(f"/api/contracts/{contract_id}").headers["etag"]
+    assert async_client.get(f"/api/contracts/{contract_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert async_client.get("/api/contracts/99999", headers={"If-None-Match": "*"}).status_code == 404
+
+    updated = async_client.patch(f"/api/contracts/{contract_id}", json={"quantity_mwh": 600})
+    assert updated.json()["quantity_mwh"] == 600
+    assert async_client.patch(f"/api/contracts/{contract_id}", json={"status": "Sold", "version": 1}).status_code == 409
+
+    headers = {"Authorization": f"Bearer {create_access_token('demo')}"}
+    assert async_client.post(f"/api/portfolio/items/{contract_id}", headers=headers).status_code == 201
+    assert async_client.post("/api/portfolio/items/99999", headers=headers).status_code == 404
+    items = async_client.get("/api/portfolio/items", headers=headers).json()
+    assert [i["contract"]["id"] for i in items] == [contract_id]
+    metrics = async_client.get("/api/portfolio/metrics", headers=headers).json()
+    assert metrics["total_capacity_mwh"] == 600
+    assert async_client.delete(f"/api/portfolio/items/{contract_id}", headers=headers).status_code == 204
+
+    batch = {"contract_ids": [contract_id, 999]}
+    added = async_client.post("/api/portfolio/items/batch", headers=headers, json=batch).json()
+    assert [r["status"] for r in added["results"]] == ["added", "not_found"]
+    removed = async_client.post("/api/portfolio/items/batch/delete", headers=headers, json=batch).json()
+    assert [r["status"] for r in removed["results"]] == ["removed", "unchanged"]
+
+    assert async_client.delete(f"/api/contracts/{contract_id}").status_code == 204
+    assert async_client.get(f"/api/contracts/{contract_id}").status_code == 404
+
+
+def test_async_snapshot_reloads_run_off_the_event_loop(async_client, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(settings, "CONTRACTS_READ_ENGINE", "columnar")
+    payload = {
+        "energy_type": "Wind",
+        "quantity_mwh": 100,
+        "price_per_mwh": 30,
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-03-31",
+        "location": "Texas",
+    }
+    assert async_client.post("/api/contracts", json=payload).status_code == 201
+    contracts_service.invalidate_read_caches()
+
+    on_loop = []
+    for snapshot in (contracts_columnar.index, contracts_stats.cube):
+        load = snapshot.load
+
+        def recording_load(rows, token, load=load):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            load(rows, token)
+
+        monkeypatch.setattr(snapshot, "load", recording_load)
+
+    assert async_client.get("/api/contracts").json()["total"] == 1
+    assert async_client.get("/api/contracts/stats").json()["source"] == "rollup"
+    assert on_loop == [False, False]
@@ -0,0 +1,53 @@
+import json
+
+
+def _row(**overrides):
+    row = {
+        "energy_type": "Wind",
+        "quantity_mwh": 100,
+        "price_per_mwh": 40.5,
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "Texas",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_bulk_ndjson_reports_bad_rows_and_loads_the_rest(client):
+    lines = [json.dumps(_row(quantity_mwh=i + 1)) for i in range(5)]
+    lines.insert(2, json.dumps(_row(quantity_mwh=-3)))
+    lines.insert(4, "{not json")
+    body = "\n".join(lines) + "\n"
+
+    res = client.post("/api/contracts/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert res.status_code == 200
+    out = res.json()
+    assert (out["received"], out["inserted"], out["failed"]) == (7, 5, 2)
+    assert [e["line"] for e in out["errors"]] == [3, 5]
+    assert "quantity_mwh" in out["errors"][0]["errors"][0]
+
+    listed = client.get("/api/contracts", params={"page_size": 100}).json()
+    assert listed["total"] == 5
+
+
+def test_bulk_csv(client):
+    body = (
+        "energy_type,quantity_mwh,price_per_mwh,delivery_start,delivery_end,location,status\n"
+        "Solar,500,45.50,2026-03-01,2026-05-31,California,\n"
+        "Natural Gas,800,52.00,2026-02-15,2026-08-15,\"Northeast, US\",Reserved\n"
+        "Solar,500,45.50,2026-03-01\n"
+    )
+    res = client.post("/api/contracts/bulk?format=csv", content=body)
+    out = res.json()
+    assert (out["inserted"], out["failed"]) == (2, 1)
+    assert out["errors"][0]["line"] == 4
+
+    reserved = client.get("/api/contracts", params={"status": "Reserved"}).json()["items"]
+    assert reserved[0]["location"] == "Northeast, US"
+    assert reserved[0]["energy_type"] == "Natural Gas"
+
+
+def test_bulk_rejects_unknown_format(client):
+    res = client.post("/api/contracts/bulk", content="x", headers={"Content-Type": "text/plain"})
+    assert res.status_code == 415
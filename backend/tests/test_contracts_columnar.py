@@ -0,0 +1,223 @@
+import random
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.models.contract import Contract, ContractStatus, EnergyType
+from app.services import contracts_columnar, contracts_service
+
+pytest.importorskip("numpy")
+
+LOCATIONS = ["Texas", "California", "Ohio", "New York", "Arizona"]
+
+
+def _seed(db, n=400, seed=7):
+    rng = random.Random(seed)
+    db.execute(
+        insert(Contract),
+        [
+            dict(
+                energy_type=rng.choice(list(EnergyType)),
+                quantity_mwh=rng.choice([100, 250, 500, 1000, rng.randrange(1, 5000)]),
+                price_per_mwh=rng.choice([40, 40.5, 55.25, round(rng.uniform(10, 99), 2)]),
+                delivery_start=date(2026, 1, 1) + timedelta(days=rng.randrange(60)),
+                delivery_end=date(2026, 6, 1) + timedelta(days=rng.randrange(200)),
+                location=rng.choice(LOCATIONS),
+                status=rng.choice(list(ContractStatus)),
+            )
+            for _ in range(n)
+        ],
+    )
+    db.commit()
+    contracts_service.invalidate_read_caches()
+
+
+def _random_args(rng):
+    args = dict(
+        energy_type=rng.sample(list(EnergyType), rng.randrange(3)) or None,
+        location=(rng.sample(LOCATIONS, rng.randrange(3)) + rng.choice([[], ["Nowhere"]])) or None,
+        status=rng.choice([None, *ContractStatus]),
+        price_min=rng.choice([None, 40, 40.25, 55.25]),
+        price_max=rng.choice([None, 55.25, 70.005, 99]),
+        qty_min=rng.choice([None, 100, 300]),
+        qty_max=rng.choice([None, 1000, 4000]),
+        start_from=rng.choice([None, date(2026, 1, 15)]),
+        end_to=rng.choice([None, date(2026, 10, 1)]),
+        date_match=rng.choice(["within", "overlaps"]),
+    )
+    if args["price_min"] is not None and args["price_max"] is not None and args["price_min"] > args["price_max"]:
+        args["price_max"] = None
+    return args
+
+
+def _both(monkeypatch, fn):
+    monkeypatch.setattr(settings, "CONTRACTS_READ_ENGINE", "sql")
+    expected = fn()
+    monkeypatch.setattr(settings, "CONTRACTS_READ_ENGINE", "columnar")
+    return expected, fn()
+
+
+def _assert_equivalent(db, monkeypatch, rng, rounds=60):
+    for _ in range(rounds):
+        args = _random_args(rng)
+        sort_by = rng.choice([None, "price", "quantity", "date"])
+        sort_dir = rng.choice(["asc", "desc"])
+        page_size = rng.choice([1, 7, 25])
+
+        def offset_page(page=rng.randrange(1, 4)):
+            return contracts_service.list_contracts(
+                db, sort_by=sort_by, sort_dir=sort_dir, page=page, page_size=page_size, **args
+            )
+
+        expected, actual = _both(monkeypatch, offset_page)
+        assert actual == expected
+
+        cursor = None
+        for _ in range(3):
+            def keyset_page():
+                return contracts_service.list_contracts(
+                    db, sort_by=sort_by, sort_dir=sort_dir, page=1, page_size=page_size,
+                    pagination="cursor", cursor=cursor, count="exact", **args,
+                )
+
+            expected, actual = _both(monkeypatch, keyset_page)
+            assert actual == expected
+            cursor = expected["next_cursor"]
+            if rng.random() < 0.3 and expected["prev_cursor"]:
+                cursor = expected["prev_cursor"]
+            if cursor is None:
+                break
+
+        bounds_args = {k: v for k, v in args.items() if k not in ("price_min", "price_max")}
+        expected, actual = _both(
+            monkeypatch, lambda: contracts_service.get_price_bounds(db, **bounds_args)
+        )
+        assert actual == expected
+
+    expected, actual = _both(monkeypatch, lambda: contracts_service.list_locations(db))
+    assert actual == expected
+
+
+def test_columnar_matches_sql(client, db_session, monkeypatch):
+    _seed(db_session)
+    _assert_equivalent(db_session, monkeypatch, random.Random(1))
+
+
+def test_columnar_applies_writes_in_place(client, db_session, monkeypatch):
+    _seed(db_session, n=150)
+    monkeypatch.setattr(settings, "CONTRACTS_READ_ENGINE", "columnar")
+    client.get("/api/contracts")
+    loads = contracts_columnar.index.loads
+
+    rng = random.Random(3)
+    ids = [c["id"] for c in client.get("/api/contracts", params={"page_size": 100}).json()["items"]]
+    for contract_id in rng.sample(ids, 40):
+        client.patch(
+            f"/api/contracts/{contract_id}",
+            json={"price_per_mwh": rng.choice([40, 61.1]), "location": rng.choice(LOCATIONS + ["Maine"])},
+        )
+    for contract_id in rng.sample(ids, 20):
+        client.delete(f"/api/contracts/{contract_id}")
+    for _ in range(10):
+        client.post(
+            "/api/contracts",
+            json={
+                "energy_type": "Hydro",
+                "quantity_mwh": 300,
+                "price_per_mwh": 40,
+                "delivery_start": "2026-02-01",
+                "delivery_end": "2026-08-01",
+                "location": "Maine",
+            },
+        )
+    client.get("/api/contracts")
+    assert contracts_columnar.index.loads == loads
+
+    _assert_equivalent(db_session, monkeypatch, random.Random(4), rounds=30)
+    assert contracts_columnar.index.loads == loads
+
+
+def test_columnar_reloads_after_unattributed_write(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "CONTRACTS_READ_ENGINE", "columnar")
+    assert client.get("/api/contracts/locations").json() == []
+    # Rows written behind the service's back, as bulk ingest does.
+    _seed(db_session, n=20)
+    assert client.get("/api/contracts/locations").json() == sorted(LOCATIONS)
+
+
+def test_upsert_below_max_id_keeps_orders():
+    def contract(i, price):
+        return Contract(
+            id=i, energy_type=EnergyType.Solar, quantity_mwh=10 * i, price_per_mwh=price,
+            delivery_start=date(2026, 1, i), delivery_end=date(2026, 2, 1),
+            location="Texas", status=ContractStatus.Available, version=1,
+        )
+
+    index = contracts_columnar.ContractColumns()
+    rows = [contract(i, p) for i, p in ((1, 30), (3, 10), (5, 20))]
+    index.load([tuple(getattr(c, col.key) for col in contracts_columnar.LOAD_COLUMNS) for c in rows], 0)
+    index.upsert(contract(2, 15))
+    index.delete(3)
+
+    args = contracts_service.price_bounds_filter_args(
+        energy_type=None, location=None, status=None, qty_min=None, qty_max=None, start_from=None, end_to=None
+    )
+    ids = lambda key, d: [c.id for c in index.page(args, key, d, limit=10)[0]]  # noqa: E731
+    assert ids("id", "asc") == [1, 2, 5]
+    assert ids("price", "asc") == [2, 5, 1]
+    assert ids("quantity", "desc") == [5, 2, 1]
+    assert index.price_bounds(args) == (Decimal("15.00"), Decimal("30.00"))
+
+
+def _load_row(i, price=30):
+    return (i, EnergyType.Solar, 10, Decimal(price), date(2026, 1, 1), date(2026, 2, 1), "Texas",
+            ContractStatus.Available, 1)
+
+
+def test_concurrent_stale_reads_reload_once():
+    index = contracts_columnar.ContractColumns()
+    fetches = []
+
+    def fetch():
+        fetches.append(threading.current_thread().name)
+        time.sleep(0.05)  # long enough for every reader to pile up on the lock
+        return [_load_row(1)]
+
+    readers = [threading.Thread(target=index.reload, args=(fetch,)) for _ in range(8)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+    assert len(fetches) == 1 and index.loads == 1
+    assert not index.needs_reload()
+
+
+def test_older_snapshot_never_replaces_a_newer_one():
+    index = contracts_columnar.ContractColumns()
+    index.load([_load_row(1)], index.begin_reload())
+    index.mark_stale()
+    slow_token = index.begin_reload()  # a reload that started before the next write
+    index.mark_stale()
+    index.load([_load_row(1), _load_row(2)], index.begin_reload())
+
+    index.load([_load_row(1)], slow_token)
+    assert index.loads == 2 and not index.needs_reload()
+    args = contracts_service.price_bounds_filter_args(
+        energy_type=None, location=None, status=None, qty_min=None, qty_max=None, start_from=None, end_to=None
+    )
+    assert [c.id for c in index.page(args, "id", "asc", limit=10)[0]] == [1, 2]
+
+    # A write applied in place keeps the copy current; a load read before it
+    # is dropped, and one of a copy that missed writes leaves it stale.
+    token = index.begin_reload()
+    index.delete(2)
+    index.load([_load_row(1), _load_row(2)], token)
+    assert index.loads == 2 and not index.needs_reload()
+    index.mark_stale()
+    index.load([_load_row(1)], token + 1)
+    assert index.needs_reload()
@@ -39,3 +39,84 @@ def test_contracts_crud(client):
 
     missing_res = client.get(f"/api/contracts/{contract_id}")
     assert missing_res.status_code == 404
+
+
+def test_list_fast_path_matches_response_model(client, monkeypatch):
+    from app.core import responses
+    from app.schemas.contract import ContractListOut
+
+    payload = {
+        "energy_type": "Natural Gas",
+        "quantity_mwh": 800,
+        "price_per_mwh": 52.1,
+        "delivery_start": "2026-02-15",
+        "delivery_end": "2026-08-15",
+        "location": "Northeast",
+    }
+    created = client.post("/api/contracts", json=payload).json()
+
+    body = client.get("/api/contracts").json()
+    assert body == ContractListOut.model_validate(body).model_dump(mode="json")
+    assert body["items"] == [created]
+
+    monkeypatch.setattr(responses, "orjson", None)
+    assert client.get("/api/contracts").json() == body
+
+
+def test_update_is_compare_and_swap(client, sql_statements):
+    payload = {
+        "energy_type": "Wind",
+        "quantity_mwh": 300,
+        "price_per_mwh": 40,
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "Texas",
+    }
+    contract_id = client.post("/api/contracts", json=payload).json()["id"]
+    assert client.get(f"/api/contracts/{contract_id}").json()["version"] == 1
+
+    sql_statements.clear()
+    reserved = client.patch(f"/api/contracts/{contract_id}", json={"status": "Reserved", "version": 1})
+    assert reserved.status_code == 200
+    assert reserved.json()["status"] == "Reserved" and reserved.json()["version"] == 2
+    assert [s.split()[0] for s in sql_statements if not s.startswith(("BEGIN", "COMMIT"))] == ["UPDATE"]
+
+    # A second reserver that read version 1 loses instead of overwriting.
+    stale = client.patch(f"/api/contracts/{contract_id}", json={"status": "Sold", "version": 1})
+    assert stale.status_code == 409
+    assert client.get(f"/api/contracts/{contract_id}").json()["status"] == "Reserved"
+    stale = client.patch(f"/api/contracts/{contract_id}", json={"price_per_mwh": 99, "version": 1})
+    assert stale.status_code == 409
+    assert client.patch(f"/api/contracts/{contract_id}", json={"version": 1}).status_code == 409
+
+    # Without a version the update is unconditional, as before.
+    sold = client.patch(f"/api/contracts/{contract_id}", json={"status": "Sold", "price_per_mwh": 41})
+    assert sold.json()["version"] == 3 and sold.json()["price_per_mwh"] == 41
+
+    listed = client.get("/api/contracts", params={"status": "Sold"}).json()["items"]
+    assert [(c["id"], c["version"]) for c in listed] == [(contract_id, 3)]
+
+    assert client.patch("/api/contracts/999", json={"status": "Sold", "version": 1}).status_code == 404
+    assert client.patch("/api/contracts/999", json={"price_per_mwh": 50}).status_code == 404
+
+
+def test_update_that_misses_an_existing_row_conflicts(client, monkeypatch):
+    from sqlalchemy import false
+
+    from app.services import contracts_service
+
+    payload = {
+        "energy_type": "Wind",
+        "quantity_mwh": 300,
+        "price_per_mwh": 40,
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": "Texas",
+    }
+    contract_id = client.post("/api/contracts", json=payload).json()["id"]
+    update_stmt = contracts_service._update_stmt
+    # Force the compare-and-swap to miss while the version still matches.
+    monkeypatch.setattr(contracts_service, "_update_stmt", lambda *a: update_stmt(*a).where(false()))
+    res = client.patch(f"/api/contracts/{contract_id}", json={"status": "Sold", "version": 1})
+    assert res.status_code == 409
+    assert client.get(f"/api/contracts/{contract_id}").json()["version"] == 1
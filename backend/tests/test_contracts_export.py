@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def seeded(client, monkeypatch):
+    # Small batches so the export spans several partitions.
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 3)
+    lines = [
+        json.dumps(
+            {
+                "energy_type": "Natural Gas" if i % 2 else "Solar",
+                "quantity_mwh": 100 + i,
+                "price_per_mwh": 40 + i / 4,
+                "delivery_start": "2026-01-01",
+                "delivery_end": "2026-06-30",
+                "location": "Texas",
+                "status": "Sold" if i == 0 else "Available",
+            }
+        )
+        for i in range(10)
+    ]
+    res = client.post("/api/contracts/bulk?format=ndjson", content="\n".join(lines))
+    assert res.json()["inserted"] == 10
+    return client
+
+
+def test_export_ndjson_matches_list(seeded):
+    res = seeded.get("/api/contracts/export", params={"sort_by": "price", "sort_dir": "asc"})
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+
+    listed = seeded.get("/api/contracts", params={"sort_by": "price", "sort_dir": "asc", "page_size": 100})
+    assert rows == listed.json()["items"]
+    assert len(rows) == 9
+
+
+def test_export_csv(seeded):
+    res = seeded.get("/api/contracts/export", params={"format": "csv", "energy_type": "Natural Gas"})
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert len(rows) == 5
+    assert {r["energy_type"] for r in rows} == {"Natural Gas"}
+
+
+def test_export_arrow(seeded):
+    pa = pytest.importorskip("pyarrow")
+    res = seeded.get("/api/contracts/export", params={"format": "arrow", "status": "Sold"})
+    table = pa.ipc.open_stream(res.content).read_all()
+    assert table.num_rows == 1
+    assert table.column("energy_type").to_pylist() == ["Solar"]
+    # Same columns as the NDJSON and CSV exports.
+    ndjson = json.loads(seeded.get("/api/contracts/export", params={"status": "Sold"}).text)
+    assert table.column_names == list(ndjson)
+    assert table.column("version").to_pylist() == [ndjson["version"]]
+
+
+def test_export_rejects_unknown_format(seeded):
+    assert seeded.get("/api/contracts/export", params={"format": "xml"}).status_code == 400
@@ -0,0 +1,94 @@
+from collections import Counter
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import contracts_service
+
+CONTRACTS = [
+    # energy_type, location, status, quantity, price
+    ("Solar", "Texas", "Available", 120, 40.25),
+    ("Solar", "Ohio", "Available", 600, 55.00),
+    ("Wind", "Texas", "Sold", 1100, 38.10),
+    ("Wind", "Texas", "Available", 480, 61.90),
+    ("Natural Gas", "Ohio", "Reserved", 900, 49.99),
+    ("Hydro", "Maine", "Available", 300, 12.00),
+]
+
+
+def _seed(client):
+    for energy_type, location, status, qty, price in CONTRACTS:
+        payload = {
+            "energy_type": energy_type,
+            "quantity_mwh": qty,
+            "price_per_mwh": price,
+            "delivery_start": "2026-03-01",
+            "delivery_end": "2026-09-30",
+            "location": location,
+            "status": status,
+        }
+        assert client.post("/api/contracts", json=payload).status_code == 201
+
+
+def test_facets_exclude_their_own_filter(client, sql_statements):
+    _seed(client)
+    sql_statements.clear()
+    res = client.get(
+        "/api/contracts/facets",
+        params={"energy_type": "Solar", "location": "Texas", "price_min": 30},
+    )
+    assert res.status_code == 200
+    assert len(sql_statements) == 1
+    facets = res.json()
+
+    # Default status filter is Available, and every facet keeps the others.
+    assert facets["total"] == 1
+    assert facets["energy_type"] == {"Solar": 1, "Wind": 1}
+    assert facets["location"] == {"Ohio": 1, "Texas": 1}
+    assert facets["status"] == {"Available": 1}
+    assert facets["price"] == [{"lower": 40.0, "upper": 50.0, "count": 1}]
+    assert facets["quantity"] == [{"lower": 0.0, "upper": 500.0, "count": 1}]
+
+
+def test_facets_histograms_and_cache(client, sql_statements):
+    _seed(client)
+    params = {"status": "Available", "price_bucket": 20, "qty_bucket": 1000}
+    facets = client.get("/api/contracts/facets", params=params).json()
+
+    available = [c for c in CONTRACTS if c[2] == "Available"]
+    assert facets["total"] == len(available)
+    assert facets["energy_type"] == dict(sorted(Counter(c[0] for c in available).items()))
+    assert facets["status"] == {"Available": 4, "Reserved": 1, "Sold": 1}
+    assert facets["price"] == [
+        {"lower": 0.0, "upper": 20.0, "count": 1},
+        {"lower": 40.0, "upper": 60.0, "count": 2},
+        {"lower": 60.0, "upper": 80.0, "count": 1},
+    ]
+    assert facets["quantity"] == [{"lower": 0.0, "upper": 1000.0, "count": 4}]
+
+    sql_statements.clear()
+    again = client.get("/api/contracts/facets", params=params)
+    assert again.json() == facets
+    assert sql_statements == []
+    assert again.headers["etag"]
+
+
+def test_facets_validation(client):
+    assert client.get("/api/contracts/facets", params={"price_bucket": 0}).status_code == 400
+    assert client.get("/api/contracts/facets", params={"qty_min": 5, "qty_max": 1}).status_code == 400
+
+
+def test_postgres_facets_use_grouping_sets():
+    filter_args = dict(
+        energy_type=None, location=["Texas"], status=None, price_min=10.0, price_max=None,
+        qty_min=None, qty_max=None, start_from=date(2026, 1, 1), end_to=None,
+    )
+    sql = str(
+        contracts_service._facets_stmt("postgresql", filter_args, 10, 500).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "GROUPING SETS" in sql
+    assert "FILTER (WHERE" in sql
+    # Only the filter that no facet owns stays in the shared WHERE clause.
+    assert "WHERE contracts.delivery_start >= '2026-01-01'" in sql
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from app.core.pubsub import LAGGED, Broker
+from app.services import contracts_feed, contracts_service
+
+PAYLOAD = {
+    "energy_type": "Hydro",
+    "quantity_mwh": 250,
+    "price_per_mwh": 41.25,
+    "delivery_start": "2026-06-01",
+    "delivery_end": "2026-11-30",
+    "location": "New York",
+}
+
+
+def _parse(message: str) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields["id"], json.loads(fields["data"])
+
+
+async def _next(gen):
+    return await asyncio.wait_for(anext(gen), timeout=5)
+
+
+def test_feed_streams_writes_and_resumes(client):
+    async def run():
+        feed = contracts_feed.stream()
+        assert (await _next(feed)).startswith("retry:")
+
+        created = await asyncio.to_thread(client.post, "/api/contracts", json=PAYLOAD)
+        contract_id = created.json()["id"]
+        await asyncio.to_thread(client.patch, f"/api/contracts/{contract_id}", json={"status": "Reserved"})
+        await asyncio.to_thread(client.delete, f"/api/contracts/{contract_id}")
+
+        messages = [_parse(await _next(feed)) for _ in range(3)]
+        await feed.aclose()
+        assert [m["op"] for _, m in messages] == ["upsert", "upsert", "delete"]
+        assert messages[0][1]["contract"] == {**created.json(), "status": "Available"}
+        assert messages[1][1]["contract"]["status"] == "Reserved"
+        assert messages[1][1]["contract"]["version"] == 2
+        assert messages[2][1] == {"op": "delete", "id": contract_id}
+
+        # Reconnecting after the first event replays the two that followed.
+        resumed = contracts_feed.stream(messages[0][0])
+        await _next(resumed)
+        assert [_parse(await _next(resumed)) for _ in range(2)] == messages[1:]
+        await resumed.aclose()
+
+        # An id from another worker cannot be resumed.
+        foreign = contracts_feed.stream("0000-5")
+        await _next(foreign)
+        assert _parse(await _next(foreign))[1] == {"op": "reset"}
+        await foreign.aclose()
+
+    asyncio.run(run())
+    assert contracts_feed.broker.subscribers == 0
+
+
+def test_broker_backlog_and_lag():
+    async def run():
+        broker = Broker(history=3, queue_size=3)
+        for i in range(5):
+            broker.publish(i)
+        # Sequence numbers start at 1; history keeps seqs 3-5 (data 2-4).
+        _, backlog = broker.subscribe(after=3)
+        assert [e.data for e in backlog] == [3, 4]
+        _, backlog = broker.subscribe(after=2)
+        assert [e.data for e in backlog] == [2, 3, 4]
+        _, backlog = broker.subscribe(after=1)
+        assert backlog is None
+        _, backlog = broker.subscribe(after=9)
+        assert backlog is None
+
+        sub, backlog = broker.subscribe()
+        assert backlog == []
+        for i in range(5):
+            broker.publish(i)
+        await asyncio.sleep(0)
+        received = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        assert [e.data for e in received[:-1]] == [0, 1] and received[-1] is LAGGED
+
+    asyncio.run(run())
+
+
+def test_remote_change_invalidates_and_fans_out(client):
+    created = client.post("/api/contracts", json=PAYLOAD).json()
+    generation = contracts_service.contracts_generation()
+    last_seq = contracts_feed.broker.last_seq
+
+    contracts_feed._on_remote(f"{contracts_feed._ORIGIN}:" + json.dumps({"op": "reset"}))
+    assert contracts_service.contracts_generation() == generation
+
+    change = {"op": "upsert", "contract": {**created, "status": "Sold", "version": 2}}
+    contracts_feed._on_remote("other:" + json.dumps(change))
+    assert contracts_service.contracts_generation() == generation + 1
+    assert contracts_feed.broker.last_seq == last_seq + 1
+    # A relayed change is not relayed again.
+    assert json.loads(contracts_feed.broker._history[-1].data) == change
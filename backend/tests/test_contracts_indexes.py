@@ -0,0 +1,260 @@
+import os
+import random
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.contract import Contract, ContractStatus, EnergyType
+from app.services import contracts_service
+
+ROWS = 50_000
+LOCATIONS = ["California", "Texas", "Northeast", "Midwest", "Arizona", "Nevada", "Wyoming", "Oklahoma"]
+
+
+def _rows() -> list[dict]:
+    rng = random.Random(42)
+    statuses = [ContractStatus.Available] * 6 + [ContractStatus.Reserved, ContractStatus.Sold]
+    rows = []
+    for _ in range(ROWS):
+        start = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        rows.append(
+            dict(
+                energy_type=rng.choice(list(EnergyType)),
+                quantity_mwh=rng.randrange(100, 5000),
+                price_per_mwh=round(rng.uniform(20, 90), 2),
+                delivery_start=start,
+                delivery_end=start + timedelta(days=rng.randrange(30, 365)),
+                location=rng.choice(LOCATIONS),
+                status=rng.choice(statuses),
+            )
+        )
+    return rows
+
+
+@pytest.fixture(scope="module")
+def large_db():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Contract), _rows())
+        conn.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+def _query_plans(engine, fn, **kwargs):
+    """Run a service call and return the EXPLAIN QUERY PLAN of every statement it issued."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as db:
+            fn(db, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    with engine.connect() as conn:
+        return [
+            [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {stmt}", params)]
+            for stmt, params in captured
+        ]
+
+
+def _assert_index_only(plans):
+    assert plans
+    for plan in plans:
+        for step in plan:
+            if "contracts" in step and step.startswith("SCAN"):
+                assert "USING" in step and "INDEX" in step, plan
+            assert "USE TEMP B-TREE" not in step, plan
+
+
+FILTERS = dict(
+    energy_type=None,
+    location=None,
+    status=ContractStatus.Available,
+    price_min=None,
+    price_max=None,
+    qty_min=None,
+    qty_max=None,
+    start_from=None,
+    end_to=None,
+)
+
+
+@pytest.mark.parametrize("sort_by", [None, "price", "quantity", "date"])
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+@pytest.mark.parametrize("pagination", ["offset", "cursor"])
+def test_list_contracts_uses_indexes(large_db, sort_by, sort_dir, pagination):
+    plans = _query_plans(
+        large_db,
+        contracts_service.list_contracts,
+        **FILTERS,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        page=1,
+        page_size=20,
+        pagination=pagination,
+    )
+    _assert_index_only(plans)
+    assert any("ix_contracts_" in step for plan in plans for step in plan)
+
+
+def test_list_contracts_type_and_location_filter_uses_composite_index(large_db):
+    filters = {**FILTERS, "status": None, "energy_type": [EnergyType.Solar], "location": ["Texas"]}
+    plans = _query_plans(
+        large_db,
+        contracts_service.list_contracts,
+        **filters,
+        sort_by=None,
+        sort_dir="desc",
+        page=1,
+        page_size=20,
+    )
+    assert any("ix_contracts_type_location_start" in step for plan in plans for step in plan)
+
+
+def test_price_bounds_uses_index(large_db):
+    kwargs = {k: v for k, v in FILTERS.items() if k not in ("price_min", "price_max")}
+    plans = _query_plans(large_db, contracts_service.get_price_bounds, **kwargs)
+    _assert_index_only(plans)
+    assert any("COVERING INDEX ix_contracts_available_price" in step for plan in plans for step in plan)
+
+
+def test_locations_uses_index(large_db):
+    plans = _query_plans(large_db, contracts_service.list_locations)
+    _assert_index_only(plans)
+    assert any("COVERING INDEX ix_contracts_location" in step for plan in plans for step in plan)
+
+
+def test_overlap_count_uses_delivery_window_index(large_db):
+    filters = {
+        **FILTERS, "status": None, "start_from": date(2026, 6, 1), "end_to": date(2026, 6, 1), "date_match": "overlaps",
+    }
+    plans = _query_plans(
+        large_db,
+        contracts_service.list_contracts,
+        **filters,
+        sort_by=None,
+        sort_dir="desc",
+        page=1,
+        page_size=20,
+        count="exact",
+    )
+    assert any("COVERING INDEX ix_contracts_delivery_window" in step for plan in plans for step in plan), plans
+
+
+# The same plans on Postgres, where the partial indexes matter most. Set
+# TEST_POSTGRES_URL to a database the tests may use; the table is built in a
+# throwaway schema that is dropped afterwards.
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+@pytest.fixture(scope="module")
+def postgres_db():
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    schema = f"test_indexes_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(TEST_POSTGRES_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(
+        TEST_POSTGRES_URL,
+        connect_args={"options": f"-csearch_path={schema},public"},
+        isolation_level="AUTOCOMMIT",
+    )
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.connect() as conn:
+            conn.execute(insert(Contract), _rows())
+            conn.execute(text("VACUUM ANALYZE contracts"))
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+def _postgres_plans(engine, fn, **kwargs):
+    """Run a service call and return the plan nodes of every SELECT it issued."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as db:
+            fn(db, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    def nodes(node):
+        yield node
+        for child in node.get("Plans", []):
+            yield from nodes(child)
+
+    with engine.connect() as conn:
+        return [
+            list(nodes(conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {stmt}", params).scalar()[0]["Plan"]))
+            for stmt, params in captured
+        ]
+
+
+SORT_INDEXES = {
+    "price": "ix_contracts_available_price",
+    "quantity": "ix_contracts_available_quantity",
+    "date": "ix_contracts_available_delivery_start",
+}
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize("sort_by", [None, "price", "quantity", "date"])
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+def test_postgres_list_and_count_use_indexes(postgres_db, sort_by, sort_dir):
+    plans = _postgres_plans(
+        postgres_db,
+        contracts_service.list_contracts,
+        **FILTERS,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        page=1,
+        page_size=20,
+        count="exact",
+    )
+    count_plan, page_plan = plans
+    for plan in plans:
+        scans = [n for n in plan if n.get("Relation Name") == "contracts"]
+        assert scans and all(n["Node Type"] != "Seq Scan" for n in scans), plan
+        assert all(n["Node Type"] not in ("Sort", "Incremental Sort") for n in plan), plan
+    # The count is answered from one of the partial indexes on Available rows
+    # or (status, id); an unsorted page may as well walk the primary key back.
+    assert any(n.get("Index Name", "").startswith("ix_contracts_") for n in count_plan), count_plan
+    if sort_by:
+        assert any(n.get("Index Name") == SORT_INDEXES[sort_by] for n in page_plan), page_plan
+
+
+@pytest.mark.postgres
+def test_postgres_type_and_location_filter_uses_composite_index(postgres_db):
+    filters = {**FILTERS, "status": None, "energy_type": [EnergyType.Solar], "location": ["Texas"]}
+    plans = _postgres_plans(
+        postgres_db,
+        contracts_service.list_contracts,
+        **filters,
+        sort_by=None,
+        sort_dir="desc",
+        page=1,
+        page_size=20,
+        count="exact",
+    )
+    count_plan = plans[0]
+    assert any(n.get("Index Name") == "ix_contracts_type_location_start" for n in count_plan), count_plan
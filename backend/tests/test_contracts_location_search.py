@@ -0,0 +1,97 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import case, create_engine, insert, or_, select
+from sqlalchemy.dialects import postgresql
+
+from app.models.contract import Contract, ContractStatus, EnergyType
+from app.services import contracts_locations
+
+LOCATIONS = ["California", "California Zone 3", "California Zone 3", "Texas", "Texas Zone 1", "New York"]
+
+
+def _create(client, location: str, status: str = "Available") -> None:
+    res = client.post("/api/contracts", json={
+        "energy_type": "Wind",
+        "quantity_mwh": 100,
+        "price_per_mwh": 30,
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-03-31",
+        "location": location,
+        "status": status,
+    })
+    assert res.status_code == 201
+
+
+def _search(client, q: str, **params) -> list[tuple[str, int]]:
+    res = client.get("/api/contracts/locations/search", params={"q": q, **params})
+    assert res.status_code == 200, res.text
+    return [(m["location"], m["count"]) for m in res.json()]
+
+
+def test_prefix_word_and_fuzzy_matches(client):
+    for location in LOCATIONS:
+        _create(client, location)
+    _create(client, "Nevada", status="Sold")
+
+    assert _search(client, "cal") == [("California", 1), ("California Zone 3", 2)]
+    assert _search(client, "CALIFORNIA z")[0] == ("California Zone 3", 2)
+    assert _search(client, "zone 3")[0] == ("California Zone 3", 2)
+    assert _search(client, "york") == [("New York", 1)]
+    assert ("Texas", 1) in _search(client, "texs")
+    assert _search(client, "cal", limit=1) == [("California", 1)]
+
+    assert _search(client, "nev") == []
+    assert _search(client, "nev", status="Sold") == [("Nevada", 1)]
+    assert client.get("/api/contracts/locations/search", params={"q": "  "}).status_code == 400
+
+
+def test_keystrokes_do_not_query_the_table(client, sql_statements):
+    for location in LOCATIONS:
+        _create(client, location)
+    _search(client, "c")
+    sql_statements.clear()
+    for prefix in ("ca", "cal", "cali", "calif"):
+        assert _search(client, prefix)[0] == ("California", 1)
+    assert sql_statements == []
+
+    # Writes keep the index current without a reload.
+    _create(client, "Calgary")
+    sql_statements.clear()
+    assert ("Calgary", 1) in _search(client, "calg")
+    assert sql_statements == []
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('Cat food') on Postgres.
+    assert contracts_locations.trigrams("Cat food") == {
+        "  c", " ca", "cat", "at ", "  f", " fo", "foo", "ood", "od ",
+    }
+
+
+def test_trgm_statement_uses_the_index_operators():
+    sql = str(contracts_locations.search_stmt("cal_", ContractStatus.Available, 5).compile(dialect=postgresql.dialect()))
+    assert "contracts.location %% " in sql and "ILIKE" in sql and "similarity(" in sql
+
+
+WORD_NAMES = ["C-City", "ABC-C-Cat", "Foo_Bar", "-Lead Zone", "New York", "California Zone 3", "Zone 3"]
+
+
+@pytest.mark.parametrize("q", ["c-c", "C", "bar", "lead", "york", "zone 3", "-c", "a.c", "new"])
+def test_sql_and_memory_split_words_alike(q):
+    # The SQL predicates run on SQLite (regexp via Python's re) against the
+    # in-memory index; Postgres gets the same ILIKE and regex pattern.
+    engine = create_engine("sqlite://")
+    Contract.__table__.create(engine)
+    starts, word_starts = contracts_locations.prefix_filters(q)
+    with engine.begin() as conn:
+        conn.execute(insert(Contract), [
+            dict(energy_type=EnergyType.Wind, quantity_mwh=1, price_per_mwh=1, location=name,
+                 delivery_start=date(2026, 1, 1), delivery_end=date(2026, 1, 31))
+            for name in WORD_NAMES
+        ])
+        sql = dict(conn.execute(
+            select(Contract.location, case((starts, 0), else_=1)).where(or_(starts, word_starts))
+        ).all())
+    memory = contracts_locations.LocationIndex(WORD_NAMES).candidates(q)
+    assert sql == {name: tier for name, (tier, _) in memory.items() if tier < 2}
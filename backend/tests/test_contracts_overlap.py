@@ -0,0 +1,75 @@
+import json
+
+PERIODS = {
+    "q1": ("2026-01-01", "2026-03-31"),
+    "feb": ("2026-02-01", "2026-02-28"),
+    "spring": ("2026-03-15", "2026-06-15"),
+    "autumn": ("2026-09-01", "2026-11-30"),
+}
+
+
+def _seed(client) -> dict[int, str]:
+    names = {}
+    for name, (start, end) in PERIODS.items():
+        res = client.post("/api/contracts", json={
+            "energy_type": "Solar",
+            "quantity_mwh": 100,
+            "price_per_mwh": 40,
+            "delivery_start": start,
+            "delivery_end": end,
+            "location": name,
+        })
+        names[res.json()["id"]] = name
+    return names
+
+
+def _matching(client, names, **params) -> set[str]:
+    res = client.get("/api/contracts", params={"page_size": 100, **params})
+    assert res.status_code == 200, res.text
+    return {names[c["id"]] for c in res.json()["items"]}
+
+
+def test_overlap_and_active_on_filters(client):
+    names = _seed(client)
+    window = {"start_from": "2026-02-15", "end_to": "2026-04-01"}
+    assert _matching(client, names, **window) == set()
+    assert _matching(client, names, **window, date_match="overlaps") == {"q1", "feb", "spring"}
+
+    # Bounds are inclusive: q1 is still active on its last day.
+    assert _matching(client, names, start_from="2026-03-31", end_to="2026-03-31", date_match="overlaps") == {"q1", "spring"}
+    assert _matching(client, names, start_from="2026-06-16", date_match="overlaps") == {"autumn"}
+    assert _matching(client, names, end_to="2026-01-31", date_match="overlaps") == {"q1"}
+
+    bounds = client.get("/api/contracts/price-bounds", params={**window, "date_match": "overlaps"}).json()
+    assert bounds == {"min_price": 40.0, "max_price": 40.0}
+    stats = client.get(
+        "/api/contracts/stats", params={**window, "date_match": "overlaps", "group_by": "energy_type"}
+    ).json()
+    assert stats["source"] == "sql" and stats["groups"][0]["contracts"] == 3
+
+
+def test_unknown_date_match_is_rejected(client):
+    res = client.get("/api/contracts", params={"start_from": "2026-01-01", "date_match": "touches"})
+    assert res.status_code == 400
+
+
+def test_inverted_delivery_windows_are_rejected(client):
+    names = _seed(client)
+    q1 = next(i for i, name in names.items() if name == "q1")
+    inverted = {"delivery_start": "2026-05-01", "delivery_end": "2026-04-01"}
+    res = client.post("/api/contracts", json={
+        "energy_type": "Solar", "quantity_mwh": 100, "price_per_mwh": 40, "location": "x", **inverted,
+    })
+    assert res.status_code == 422
+    assert client.patch(f"/api/contracts/{q1}", json=inverted).status_code == 422
+
+    # One end alone is checked against the stored other end.
+    assert client.patch(f"/api/contracts/{q1}", json={"delivery_start": "2026-04-01"}).status_code == 422
+    assert client.patch(f"/api/contracts/{q1}", json={"delivery_end": "2025-12-31"}).status_code == 422
+    assert client.get(f"/api/contracts/{q1}").json()["version"] == 1
+    moved = client.patch(f"/api/contracts/{q1}", json={"delivery_start": "2026-03-31", "version": 1})
+    assert moved.status_code == 200 and moved.json()["delivery_start"] == "2026-03-31"
+
+    line = json.dumps({"energy_type": "Solar", "quantity_mwh": 1, "price_per_mwh": 1, "location": "x", **inverted})
+    out = client.post("/api/contracts/bulk?format=ndjson", content=line).json()
+    assert out["failed"] == 1 and "delivery_start" in out["errors"][0]["errors"][0]
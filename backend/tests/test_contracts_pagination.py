@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+
+def _seed(client, n=25):
+    for i in range(n):
+        payload = {
+            "energy_type": "Solar" if i % 2 else "Wind",
+            "quantity_mwh": 100 + (i % 5) * 10,
+            "price_per_mwh": 40 + (i % 7),
+            "delivery_start": str(date(2026, 1, 1) + timedelta(days=i % 4)),
+            "delivery_end": str(date(2026, 12, 31)),
+            "location": "Texas",
+            "status": "Available",
+        }
+        assert client.post("/api/contracts", json=payload).status_code == 201
+
+
+def _walk(client, params):
+    ids = []
+    res = client.get("/api/contracts", params={**params, "pagination": "cursor"}).json()
+    assert res["total"] is None
+    assert res["prev_cursor"] is None
+    pages = [res]
+    ids.extend(c["id"] for c in res["items"])
+    while res["next_cursor"]:
+        res = client.get("/api/contracts", params={**params, "cursor": res["next_cursor"]}).json()
+        pages.append(res)
+        ids.extend(c["id"] for c in res["items"])
+    return ids, pages
+
+
+def test_keyset_matches_offset_order(client):
+    _seed(client)
+    for sort_by in (None, "price", "quantity", "date"):
+        for sort_dir in ("asc", "desc"):
+            params = {"sort_dir": sort_dir, "page_size": 7}
+            if sort_by:
+                params["sort_by"] = sort_by
+
+            offset_ids = []
+            for page in range(1, 5):
+                res = client.get("/api/contracts", params={**params, "page": page}).json()
+                assert res["total"] == 25
+                offset_ids.extend(c["id"] for c in res["items"])
+
+            keyset_ids, pages = _walk(client, params)
+            assert keyset_ids == offset_ids
+            assert len(pages) == 4
+
+
+def test_unsorted_lists_stay_newest_first(client):
+    # Without sort_by, sort_dir is ignored as it was before keyset paging, so
+    # existing page links keep their order.
+    _seed(client, n=5)
+    for sort_dir in ("asc", "desc"):
+        offset = client.get("/api/contracts", params={"sort_dir": sort_dir}).json()
+        assert [c["id"] for c in offset["items"]] == [5, 4, 3, 2, 1]
+        keyset_ids, _ = _walk(client, {"sort_dir": sort_dir, "page_size": 2})
+        assert keyset_ids == [5, 4, 3, 2, 1]
+
+
+def test_keyset_prev_cursor_returns_previous_page(client):
+    _seed(client)
+    params = {"sort_by": "price", "sort_dir": "asc", "page_size": 5}
+    _, pages = _walk(client, params)
+
+    back = client.get("/api/contracts", params={**params, "cursor": pages[2]["prev_cursor"]}).json()
+    assert [c["id"] for c in back["items"]] == [c["id"] for c in pages[1]["items"]]
+    assert back["next_cursor"] is not None
+
+    first = client.get("/api/contracts", params={**params, "cursor": pages[1]["prev_cursor"]}).json()
+    assert [c["id"] for c in first["items"]] == [c["id"] for c in pages[0]["items"]]
+    assert first["prev_cursor"] is None
+
+
+def test_keyset_rejects_mismatched_cursor(client):
+    _seed(client, n=3)
+    res = client.get(
+        "/api/contracts",
+        params={"sort_by": "price", "page_size": 1, "pagination": "cursor"},
+    ).json()
+    bad = client.get("/api/contracts", params={"sort_by": "date", "cursor": res["next_cursor"]})
+    assert bad.status_code == 400
+    assert client.get("/api/contracts", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_count_strategies(client):
+    _seed(client, n=4)
+
+    exact = client.get("/api/contracts", params={"count": "exact"}).json()
+    assert exact["total"] == 4 and exact["total_exact"] is True
+
+    # SQLite has no planner estimates, so "estimated" falls back to an exact count.
+    estimated = client.get("/api/contracts", params={"count": "estimated"}).json()
+    assert estimated["total"] == 4 and estimated["total_exact"] is True
+
+    first = client.get("/api/contracts", params={"count": "cached"}).json()
+    assert first["total"] == 4 and first["total_exact"] is True
+    second = client.get("/api/contracts", params={"count": "cached"}).json()
+    assert second["total"] == 4 and second["total_exact"] is False
+
+    _seed(client, n=1)
+    after_write = client.get("/api/contracts", params={"count": "cached"}).json()
+    assert after_write["total"] == 5 and after_write["total_exact"] is True
+
+    assert client.get("/api/contracts", params={"count": "bogus"}).status_code == 400
+
+
+def test_estimate_keeps_filter_values_as_parameters():
+    from sqlalchemy.dialects.postgresql import asyncpg, psycopg2
+
+    from app.models.contract import EnergyType
+    from app.services import contracts_service
+
+    filters = contracts_service.build_filters(
+        energy_type=[EnergyType.NaturalGas], location=["New :York"], status=None,
+        price_min=None, price_max=None, qty_min=None, qty_max=None,
+        start_from=None, end_to=None, date_match="within",
+    )
+    for dialect in (psycopg2.dialect(), asyncpg.dialect()):
+        compiled = contracts_service._estimate_stmt(filters).compile(dialect=dialect)
+        sql = str(compiled)
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT contracts.id")
+        assert "York" not in sql and compiled.params["location_1"] == ["New :York"]
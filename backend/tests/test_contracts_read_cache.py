@@ -0,0 +1,35 @@
+def _create(client, location, price):
+    payload = {
+        "energy_type": "Wind",
+        "quantity_mwh": 100,
+        "price_per_mwh": price,
+        "delivery_start": "2026-01-01",
+        "delivery_end": "2026-06-30",
+        "location": location,
+        "status": "Available",
+    }
+    assert client.post("/api/contracts", json=payload).status_code == 201
+
+
+def test_locations_and_price_bounds_are_cached_until_write(client, sql_statements):
+    _create(client, "Texas", 40)
+
+    sql_statements.clear()
+    first = client.get("/api/contracts/locations")
+    bounds = client.get("/api/contracts/price-bounds")
+    issued = len(sql_statements)
+    assert issued == 2
+    again = client.get("/api/contracts/locations")
+    bounds_again = client.get("/api/contracts/price-bounds")
+    assert len(sql_statements) == issued
+
+    assert first.json() == ["Texas"]
+    assert first.headers["etag"] == again.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+    assert bounds.json() == bounds_again.json() == {"min_price": 40.0, "max_price": 40.0}
+
+    _create(client, "Arizona", 55)
+    updated = client.get("/api/contracts/locations")
+    assert updated.json() == ["Arizona", "Texas"]
+    assert updated.headers["etag"] != first.headers["etag"]
+    assert client.get("/api/contracts/price-bounds").json()["max_price"] == 55.0
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from app.services import contracts_stats
+
+CONTRACTS = [
+    ("Solar", "California", "2026-03-05", 100, 40.0),
+    ("Solar", "California", "2026-03-20", 300, 50.0),
+    ("Solar", "California", "2026-03-28", 200, 45.0),
+    ("Solar", "Texas", "2026-04-02", 400, 30.0),
+    ("Wind", "Texas", "2026-04-10", 500, 60.0),
+]
+
+
+def _create(client, energy_type, location, start, qty, price):
+    res = client.post("/api/contracts", json={
+        "energy_type": energy_type,
+        "quantity_mwh": qty,
+        "price_per_mwh": price,
+        "delivery_start": start,
+        "delivery_end": "2026-12-31",
+        "location": location,
+    })
+    assert res.status_code == 201
+    return res.json()
+
+
+def test_stats_rollup_groups_and_updates_in_place(client):
+    created = [_create(client, *c) for c in CONTRACTS]
+
+    res = client.get("/api/contracts/stats")
+    assert res.status_code == 200 and res.headers["etag"]
+    body = res.json()
+    assert body["source"] == "rollup"
+    first = body["groups"][0]
+    assert (first["energy_type"], first["location"], first["delivery_month"]) == ("Solar", "California", "2026-03-01")
+    assert first["contracts"] == 3 and first["total_mwh"] == 600
+    assert first["avg_price"] == 45.0 and first["median"] == 45.0
+    assert first["weighted_avg_price"] == round((40 * 100 + 50 * 300 + 45 * 200) / 600, 2)
+    assert (first["min_price"], first["p25"], first["p75"], first["max_price"]) == (40.0, 42.5, 47.5, 50.0)
+
+    solar = client.get("/api/contracts/stats", params={"group_by": "energy_type", "energy_type": "Solar"}).json()
+    assert solar["groups"] == [{
+        **solar["groups"][0],
+        "energy_type": "Solar", "location": None, "delivery_month": None,
+        "contracts": 4, "total_mwh": 1000, "median": 42.5,
+    }]
+
+    loads = contracts_stats.cube.loads
+    client.patch(f"/api/contracts/{created[0]['id']}", json={"status": "Sold"})
+    client.patch(f"/api/contracts/{created[3]['id']}", json={"price_per_mwh": 35.0})
+    client.delete(f"/api/contracts/{created[4]['id']}")
+    groups = client.get("/api/contracts/stats", params={"group_by": "location"}).json()["groups"]
+    assert [(g["location"], g["contracts"], g["min_price"]) for g in groups] == [
+        ("California", 2, 45.0),
+        ("Texas", 1, 35.0),
+    ]
+    sold = client.get("/api/contracts/stats", params={"status": "Sold", "group_by": "energy_type"}).json()
+    assert [(g["energy_type"], g["total_mwh"]) for g in sold["groups"]] == [("Solar", 100)]
+    assert contracts_stats.cube.loads == loads
+
+
+def test_stats_falls_back_to_sql_for_other_filters(client):
+    for c in CONTRACTS:
+        _create(client, *c)
+
+    rollup = client.get("/api/contracts/stats", params={"start_from": "2026-04-01"}).json()
+    assert rollup["source"] == "rollup"
+    # Price filters (and mid-month start dates) need the rows.
+    live = client.get("/api/contracts/stats", params={"start_from": "2026-04-01", "price_min": 0}).json()
+    assert live == {**rollup, "source": "sql"}
+    live = client.get("/api/contracts/stats", params={"qty_max": 300, "group_by": "energy_type"}).json()
+    assert live["source"] == "sql"
+    assert [(g["energy_type"], g["contracts"], g["median"]) for g in live["groups"]] == [("Solar", 3, 45.0)]
+
+
+def test_stats_rejects_unknown_groups(client):
+    res = client.get("/api/contracts/stats", params={"group_by": "price"})
+    assert res.status_code == 400
+
+
+def test_stale_cube_reloads_once_and_keeps_the_newest_rows():
+    cube = contracts_stats.StatsCube()
+    fetches = []
+
+    def fetch():
+        fetches.append(threading.current_thread().name)
+        time.sleep(0.05)  # long enough for every reader to pile up on the lock
+        return []
+
+    readers = [threading.Thread(target=cube.reload, args=(fetch,)) for _ in range(8)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+    assert len(fetches) == 1 and cube.loads == 1
+
+    slow_token = cube.begin_reload()
+    cube.mark_stale()
+    cube.load([], cube.begin_reload())
+    cube.load([], slow_token)  # read before the write; dropped
+    assert cube.loads == 2 and not cube.needs_reload()
@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.pool import TimedQueuePool, pool_status
+from app.db.session import engine_options
+
+
+def test_engine_options_for_postgres(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 2)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "never")
+
+    options = engine_options("postgresql+psycopg2://u:p@db/energy")
+    assert options["poolclass"] is TimedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (3, 2)
+    assert options["pool_pre_ping"] is False
+
+    assert "pool_size" not in engine_options("sqlite+pysqlite:///:memory:")
+
+
+def test_engine_options_for_pgbouncer(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+
+    options = engine_options("postgresql+psycopg://u:p@bouncer/energy")
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"prepare_threshold": None}
+
+    options = engine_options("postgresql+asyncpg://u:p@bouncer/energy", is_async=True)
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+
+def test_engine_options_rejects_unknown_pre_ping(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "sometimes")
+    with pytest.raises(ValueError):
+        engine_options("postgresql+psycopg2://u:p@db/energy")
+
+
+def test_timed_pool_reports_saturation_and_timeouts():
+    pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1, timeout=0.05)
+    first, second = pool.connect(), pool.connect()
+
+    stats = pool_status(pool)
+    assert stats["checked_out"] == 2
+    assert stats["saturation"] == 1.0
+    assert stats["checkouts"] == 2
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    stats = pool_status(pool)
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
+
+    first.close()
+    second.close()
+    assert pool_status(pool)["checked_out"] == 0
+
+
+def test_pool_health_endpoint(client):
+    res = client.get("/api/health/pool")
+    assert res.status_code == 200
+    assert "sync" in res.json()
@@ -0,0 +1,110 @@
+import pytest
+
+from app.core.compression import accepted_encodings
+
+PAYLOAD = {
+    "energy_type": "Wind",
+    "quantity_mwh": 100,
+    "price_per_mwh": 40,
+    "delivery_start": "2026-01-01",
+    "delivery_end": "2026-06-30",
+    "location": "Texas",
+}
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/contracts", "/api/contracts/locations", "/api/contracts/price-bounds"],
+)
+def test_if_none_match_skips_database(client, sql_statements, path):
+    contract_id = client.post("/api/contracts", json=PAYLOAD).json()["id"]
+    path = path.format(id=contract_id)
+
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+
+    sql_statements.clear()
+    again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert sql_statements == []
+
+    assert client.patch(f"/api/contracts/{contract_id}", json={"price_per_mwh": 55}).status_code == 200
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/api/contracts", {"sort_by": "name"}),
+        ("/api/contracts", {"cursor": "not-a-cursor"}),
+        ("/api/contracts", {"price_min": 50, "price_max": 10}),
+        ("/api/contracts/price-bounds", {"qty_min": 5, "qty_max": 1}),
+        ("/api/contracts/facets", {"price_bucket": 0}),
+        ("/api/contracts/stats", {"group_by": "status"}),
+        ("/api/contracts/locations/search", {"q": "  "}),
+    ],
+)
+def test_invalid_requests_are_rejected_before_if_none_match(client, path, params):
+    etag = client.get("/api/contracts").headers["etag"]
+    res = client.get(path, params=params, headers={"If-None-Match": etag})
+    assert res.status_code == 400
+
+
+def test_contract_etag_follows_its_version(client):
+    contract_id = client.post("/api/contracts", json=PAYLOAD).json()["id"]
+    other_id = client.post("/api/contracts", json=PAYLOAD).json()["id"]
+    path = f"/api/contracts/{contract_id}"
+    etag = client.get(path).headers["etag"]
+
+    # Writes to other contracts leave it valid; its own change replaces it.
+    client.patch(f"/api/contracts/{other_id}", json={"price_per_mwh": 55})
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+    client.patch(path, json={"price_per_mwh": 55})
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
+
+    # Existence is checked first, and a list tag does not validate a contract.
+    assert client.get("/api/contracts/99999", headers={"If-None-Match": "*"}).status_code == 404
+    assert client.get(path, headers={"If-None-Match": "*"}).status_code == 304
+    list_etag = client.get("/api/contracts").headers["etag"]
+    assert client.get(path, headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_revalidated_resources(client):
+    contract_id = client.post("/api/contracts", json=PAYLOAD).json()["id"]
+    listed = client.get("/api/contracts")
+    assert listed.headers["cache-control"] == "no-cache"
+    assert client.get(f"/api/contracts/{contract_id}").headers["cache-control"] == "no-cache"
+    assert "max-age" in client.get("/api/contracts/locations").headers["cache-control"]
+
+    etag = listed.headers["etag"]
+    assert client.get("/api/contracts", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get("/api/contracts", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert client.get("/api/contracts/999").status_code == 404
+
+
+def test_large_responses_are_gzipped(client):
+    for _ in range(30):
+        client.post("/api/contracts", json=PAYLOAD)
+
+    large = client.get("/api/contracts", params={"page_size": 30}, headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in large.headers["vary"].lower()
+    assert len(large.json()["items"]) == 30
+
+    small = client.get("/api/contracts/locations", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    identity = client.get("/api/contracts", params={"page_size": 30}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert accepted_encodings("gzip;q=0.0") == set()
+    assert accepted_encodings("") == set()
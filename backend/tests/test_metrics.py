@@ -0,0 +1,59 @@
+import logging
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+PAYLOAD = {
+    "energy_type": "Solar",
+    "quantity_mwh": 100,
+    "price_per_mwh": 40,
+    "delivery_start": "2026-01-01",
+    "delivery_end": "2026-06-30",
+    "location": "Texas",
+}
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_by_route(client):
+    registry.clear()
+    contract_id = client.post("/api/contracts", json=PAYLOAD).json()["id"]
+    client.get("/api/contracts")
+    client.get("/api/contracts")
+    client.get(f"/api/contracts/{contract_id}")
+    client.get("/api/contracts/999")
+    client.get("/api/no-such-route")
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+
+    listed = 'method="GET",route="/api/contracts"'
+    assert samples[f"http_request_duration_seconds_count{{{listed}}}"] == 2
+    assert samples[f'http_request_duration_seconds_bucket{{{listed},le="+Inf"}}'] == 2
+    assert samples[f"http_request_sql_statements_total{{{listed}}}"] >= 4
+    assert samples[f"http_request_db_seconds_total{{{listed}}}"] > 0
+    assert f"http_request_pool_wait_seconds_total{{{listed}}}" in samples
+
+    detail = 'method="GET",route="/api/contracts/{contract_id}"'
+    assert samples[f'http_requests_total{{{detail},status="200"}}'] == 1
+    assert samples[f'http_requests_total{{{detail},status="404"}}'] == 1
+    assert samples['http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert samples['http_request_sql_statements_total{method="POST",route="/api/contracts"}'] > 0
+
+
+def test_slow_query_log(client, monkeypatch, caplog):
+    registry.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+        client.get("/api/contracts")
+    assert any("route=/api/contracts " in r.getMessage() for r in caplog.records)
+    assert _samples(client.get("/api/metrics").text)["db_slow_queries_total"] >= 1
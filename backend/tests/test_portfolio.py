@@ -0,0 +1,168 @@
+import pytest
+from sqlalchemy import update
+
+from app.core.security import create_access_token
+from app.models.portfolio import PortfolioSummary
+from app.services import portfolio_service
+
+# GET /api/portfolio/items must load items and their contracts in one query,
+# whatever the portfolio size.
+MAX_LIST_STATEMENTS = 1
+
+
+@pytest.fixture
+def auth():
+    return {"Authorization": f"Bearer {create_access_token('demo')}"}
+
+
+def _create_contracts(client, n):
+    ids = []
+    for i in range(n):
+        payload = {
+            "energy_type": "Solar" if i % 2 else "Hydro",
+            "quantity_mwh": 100 + i,
+            "price_per_mwh": 40.25,
+            "delivery_start": "2026-01-01",
+            "delivery_end": "2026-06-30",
+            "location": "Texas",
+        }
+        ids.append(client.post("/api/contracts", json=payload).json()["id"])
+    return ids
+
+
+def test_list_items_is_a_single_query(client, auth, sql_statements):
+    ids = _create_contracts(client, 25)
+    for contract_id in ids:
+        assert client.post(f"/api/portfolio/items/{contract_id}", headers=auth).status_code == 201
+
+    sql_statements.clear()
+    res = client.get("/api/portfolio/items", headers=auth)
+    assert res.status_code == 200
+    assert len(res.json()) == 25
+    assert len(sql_statements) <= MAX_LIST_STATEMENTS
+    assert {i["contract"]["id"] for i in res.json()} == set(ids)
+
+
+def test_list_items_pagination(client, auth):
+    ids = _create_contracts(client, 7)
+    for contract_id in ids:
+        client.post(f"/api/portfolio/items/{contract_id}", headers=auth)
+
+    seen = []
+    params = {"limit": 3}
+    while True:
+        res = client.get("/api/portfolio/items", headers=auth, params=params)
+        seen.extend(i["contract"]["id"] for i in res.json())
+        next_before = res.headers.get("x-next-before-id")
+        if not next_before:
+            break
+        params = {"limit": 3, "before_id": next_before}
+    assert seen == list(reversed(ids))
+
+    # The cross-origin frontend can only read headers CORS exposes.
+    res = client.get("/api/portfolio/items", headers={**auth, "Origin": "http://localhost:5173"}, params={"limit": 3})
+    assert "x-next-before-id" in res.headers["access-control-expose-headers"].lower()
+
+
+def test_metrics_are_aggregated_in_sql(client, auth, sql_statements):
+    ids = _create_contracts(client, 5)
+    for contract_id in ids:
+        client.post(f"/api/portfolio/items/{contract_id}", headers=auth)
+
+    sql_statements.clear()
+    metrics = client.get("/api/portfolio/metrics", headers=auth).json()
+    assert len(sql_statements) == 1
+
+    # Hydro: 100, 102, 104 MWh; Solar: 101, 103 MWh; all at 40.25.
+    assert metrics["total_contracts"] == 5
+    assert metrics["total_capacity_mwh"] == 510
+    assert metrics["total_cost"] == 20527.5
+    assert metrics["weighted_avg_price_per_mwh"] == 40.25
+    assert metrics["by_energy_type"] == {
+        "Hydro": {"capacity_mwh": 306, "cost": 12316.5},
+        "Solar": {"capacity_mwh": 204, "cost": 8211.0},
+    }
+
+
+def test_metrics_empty_portfolio(client, auth):
+    metrics = client.get("/api/portfolio/metrics", headers=auth).json()
+    assert metrics == {
+        "total_contracts": 0,
+        "total_capacity_mwh": 0,
+        "total_cost": 0.0,
+        "weighted_avg_price_per_mwh": 0.0,
+        "by_energy_type": {},
+    }
+
+
+def test_add_unknown_contract_is_404(client, auth):
+    # The baseline inserted the item anyway: a foreign key error (500) on
+    # Postgres, an item without a contract on SQLite.
+    res = client.post("/api/portfolio/items/999", headers=auth)
+    assert res.status_code == 404
+    assert client.get("/api/portfolio/items", headers=auth).json() == []
+    assert client.get("/api/portfolio/metrics", headers=auth).json()["total_contracts"] == 0
+
+
+def test_summary_follows_contract_changes(client, auth, db_session):
+
+    ids = _create_contracts(client, 4)
+    for contract_id in ids:
+        client.post(f"/api/portfolio/items/{contract_id}", headers=auth)
+
+    client.patch(f"/api/contracts/{ids[0]}", json={"energy_type": "Wind", "quantity_mwh": 10})
+    client.patch(f"/api/contracts/{ids[1]}", json={"price_per_mwh": 50})
+    client.delete(f"/api/contracts/{ids[2]}")
+    client.delete(f"/api/portfolio/items/{ids[3]}", headers=auth)
+
+    metrics = client.get("/api/portfolio/metrics", headers=auth).json()
+    assert metrics["total_contracts"] == 2
+    assert metrics["by_energy_type"] == {
+        "Wind": {"capacity_mwh": 10, "cost": 402.5},
+        "Solar": {"capacity_mwh": 101, "cost": 5050.0},
+    }
+
+    assert portfolio_service.diff_summary(db_session) == []
+
+    db_session.execute(update(PortfolioSummary).values(contracts=99))
+    db_session.commit()
+    assert portfolio_service.diff_summary(db_session)
+
+    portfolio_service.rebuild_summary(db_session)
+    assert portfolio_service.diff_summary(db_session) == []
+
+
+def test_batch_add_and_remove(client, auth, sql_statements, db_session):
+    ids = _create_contracts(client, 6)
+    client.post(f"/api/portfolio/items/{ids[0]}", headers=auth)
+
+    sql_statements.clear()
+    res = client.post(
+        "/api/portfolio/items/batch", headers=auth, json={"contract_ids": ids + [ids[1], 999]}
+    )
+    assert res.status_code == 200
+    statuses = {r["contract_id"]: r["status"] for r in res.json()["results"]}
+    assert statuses == {ids[0]: "unchanged", **{i: "added" for i in ids[1:]}, 999: "not_found"}
+    # INSERT ... ON CONFLICT, the not-found lookup and the summary upsert.
+    assert len([s for s in sql_statements if not s.startswith(("BEGIN", "COMMIT"))]) == 3
+
+    metrics = client.get("/api/portfolio/metrics", headers=auth).json()
+    assert metrics["total_contracts"] == 6
+
+    res = client.post(
+        "/api/portfolio/items/batch/delete", headers=auth, json={"contract_ids": ids[:3] + [999]}
+    )
+    assert [r["status"] for r in res.json()["results"]] == ["removed"] * 3 + ["unchanged"]
+    assert client.get("/api/portfolio/metrics", headers=auth).json()["total_contracts"] == 3
+    assert portfolio_service.diff_summary(db_session) == []
+
+
+def test_batch_rejects_empty_list(client, auth):
+    res = client.post("/api/portfolio/items/batch", headers=auth, json={"contract_ids": []})
+    assert res.status_code == 422
+
+
+def test_unsupported_dialects_are_rejected_up_front():
+    portfolio_service.check_dialect("sqlite")
+    with pytest.raises(RuntimeError, match="mysql"):
+        portfolio_service.check_dialect("mysql")
@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import replicas
+from app.db.base import Base
+from app.db.replicas import ReadYourWritesMiddleware, Replica, ReplicaSet
+from app.db.session import get_db
+from app.models.contract import Contract, ContractStatus, EnergyType
+from app.routers.contracts import router as contracts_router
+from app.routers.health import router as health_router
+from app.services import contracts_service
+
+PAYLOAD = {
+    "energy_type": "Wind",
+    "quantity_mwh": 100,
+    "price_per_mwh": 30,
+    "delivery_start": "2026-01-01",
+    "delivery_end": "2026-03-31",
+    "location": "Primary",
+}
+
+
+def _database(path, location: str):
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    with Session() as db:
+        db.add(Contract(
+            energy_type=EnergyType.Solar, quantity_mwh=10, price_per_mwh=40,
+            delivery_start=date(2026, 1, 1), delivery_end=date(2026, 2, 1),
+            location=location, status=ContractStatus.Available,
+        ))
+        db.commit()
+    return engine, Session
+
+
+@pytest.fixture
+def cluster(tmp_path, monkeypatch):
+    """A primary and two replica SQLite files, each holding one marker row."""
+    contracts_service.invalidate_read_caches()
+    _, Primary = _database(tmp_path / "primary.db", "Primary")
+    members = [Replica(name, *_database(tmp_path / f"{name}.db", name)) for name in ("r1", "r2")]
+    replica_set = ReplicaSet(Primary, members, check_interval=60, retry_after=60, primary_window=0)
+    monkeypatch.setattr(replicas, "read_replicas", replica_set)
+
+    def override_get_db():
+        with Primary() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, max_age=5)
+    app.include_router(contracts_router, prefix="/api")
+    app.include_router(health_router, prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as c:
+        yield c, replica_set
+
+
+def _served_by(client, **kwargs) -> list[str]:
+    return [c["location"] for c in client.get("/api/contracts", **kwargs).json()["items"]]
+
+
+def test_reads_round_robin_across_replicas(cluster):
+    client, _ = cluster
+    assert [_served_by(client) for _ in range(4)] == [["r1"], ["r2"], ["r1"], ["r2"]]
+    assert _served_by(client, headers={"X-Read-Consistency": "strong"}) == ["Primary"]
+
+
+def test_unhealthy_replica_is_skipped(cluster, tmp_path):
+    client, replica_set = cluster
+    dead = create_engine(f"sqlite+pysqlite:///{tmp_path / 'missing' / 'r1.db'}")
+    replica_set.replicas[0].engine = dead
+
+    assert {tuple(_served_by(client)) for _ in range(4)} == {("r2",)}
+    assert replica_set.status() == {"r1": "down", "r2": "up"}
+    assert client.get("/api/health/pool").json()["replica:r1"]["state"] == "down"
+
+    replica_set.replicas[1].engine = dead
+    replica_set.replicas[1].checked_at = float("-inf")
+    assert _served_by(client) == ["Primary"]
+
+
+def test_writers_read_their_writes_from_primary(cluster):
+    client, replica_set = cluster
+    created = client.post("/api/contracts", json=PAYLOAD)
+    assert created.status_code == 201
+    assert "read_primary=1" in created.headers["set-cookie"]
+    assert client.get(f"/api/contracts/{created.json()['id']}").json()["location"] == "Primary"
+    assert sorted(_served_by(client)) == ["Primary", "Primary"]
+
+    # Without the cookie the read goes back to a replica...
+    client.cookies.clear()
+    assert _served_by(client) in (["r1"], ["r2"])
+    # ...unless this worker wrote within its own primary window.
+    replica_set.primary_window = 60
+    assert client.delete(f"/api/contracts/{created.json()['id']}").status_code == 204
+    client.cookies.clear()
+    assert _served_by(client) == ["Primary"]
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+
+
+def _tamper_payload(token: str, payload_b64: str) -> str:
+    header, _, signature = token.split(".")
+    return f"{header}.{payload_b64}.{signature}"
+
+
+def test_round_trip_and_cache_hit():
+    security._verified.clear()
+    token = security.create_access_token("demo")
+
+    first = security.decode_token(token)
+    assert first["sub"] == "demo"
+    assert len(security._verified) == 1
+
+    first["sub"] = "mutated"
+    assert security.decode_token(token)["sub"] == "demo"
+
+
+def test_cached_signature_does_not_vouch_for_another_payload():
+    security._verified.clear()
+    token = security.create_access_token("demo")
+    security.decode_token(token)
+
+    forged = _tamper_payload(token, security._b64url_encode(b'{"sub":"admin","exp":9999999999}'))
+    with pytest.raises(HTTPException) as exc:
+        security.decode_token(forged)
+    assert exc.value.detail == "Invalid token signature"
+
+
+@pytest.mark.parametrize("bad", ["a.b", "a.b.!!!!", "a.b.c"])
+def test_malformed_tokens_are_rejected(bad):
+    with pytest.raises(HTTPException) as exc:
+        security.decode_token(bad)
+    assert exc.value.status_code == 401
+
+
+def test_cached_token_still_expires(monkeypatch):
+    security._verified.clear()
+    token = security.create_access_token("demo")
+    exp = security.decode_token(token)["exp"]
+
+    monkeypatch.setattr(security.time, "time", lambda: exp + 1)
+    with pytest.raises(HTTPException) as exc:
+        security.decode_token(token)
+    assert exc.value.detail == "Token expired"
+
+
+def test_secret_rotation_invalidates_signer(monkeypatch):
+    token = security.create_access_token("demo")
+    security.decode_token(token)
+    monkeypatch.setattr(security.settings, "JWT_SECRET", "rotated")
+    with pytest.raises(HTTPException):
+        security.decode_token(token)
+    assert security.decode_token(security.create_access_token("demo"))["sub"] == "demo"
@@ -9,13 +9,19 @@ export type Contract = {
   delivery_end: string;
   location: string;
   status: string;
+  version: number;
 };
 
 export type ContractList = {
   items: Contract[];
   page: number;
   page_size: number;
-  total: number;
+  // null when the count was skipped (keyset pages); total_exact is false
+  // for estimated or cached counts.
+  total: number | null;
+  total_exact?: boolean | null;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
 };
 
 export type ContractPriceBounds = {
@@ -74,9 +80,29 @@ export async function fetchContractById(contractId: number) {
   return data;
 }
 
-export async function markContractSold(contractId: number) {
+export type ContractChange =
+  | { op: "upsert"; contract: Contract }
+  | { op: "delete"; id: number }
+  | { op: "reset" };
+
+// Server-sent contract writes. EventSource reconnects by itself and resumes
+// after the last event it saw; "reset" means deltas were missed.
+export function subscribeContractChanges(
+  onChange: (change: ContractChange) => void,
+) {
+  const source = new EventSource(`${api.defaults.baseURL}/contracts/changes`);
+  source.addEventListener("contract", (event) =>
+    onChange(JSON.parse((event as MessageEvent<string>).data)),
+  );
+  return () => source.close();
+}
+
+// With the version the contract was read at, the sale is rejected (409) if
+// someone else changed the contract in the meantime.
+export async function markContractSold(contractId: number, version?: number) {
   const { data } = await api.patch<Contract>(`/contracts/${contractId}`, {
     status: "Sold",
+    version,
   });
   return data;
 }
@@ -45,8 +45,10 @@ import {
   fetchContractPriceBounds,
   fetchContracts,
   markContractSold,
+  subscribeContractChanges,
   type Contract,
   type ContractFilters,
+  type ContractList,
 } from "../api/contracts";
 import { addToPortfolio } from "../api/portfolio";
 import { useNotifications } from "../contexts/NotificationContext";
@@ -267,7 +269,9 @@ export default function ContractsPage({
   const displayPriceRange: [number, number] =
     !hasInitialPriceParams && !priceTouched ? priceBounds : clampedPriceRange;
 
-  const resultsCount = data?.total ?? 0;
+  const total = data?.total ?? null;
+  const resultsCount =
+    total === null ? "—" : data?.total_exact === false ? `~${total}` : total;
   const bounds = priceBounds;
   const selectedIds = useMemo(
     () => selectedContracts.map((c) => c.id),
@@ -314,6 +318,35 @@ export default function ContractsPage({
     }
   }, [filterSignature]);
 
+  useEffect(() => {
+    if (!isAuthed) return;
+    return subscribeContractChanges((change) => {
+      qc.invalidateQueries({ queryKey: ["contracts-price-bounds"] });
+      qc.invalidateQueries({ queryKey: ["contract-locations"] });
+      if (change.op === "reset") {
+        qc.invalidateQueries({ queryKey: ["contracts"] });
+        return;
+      }
+      const id = change.op === "upsert" ? change.contract.id : change.id;
+      let onPage = false;
+      qc.setQueriesData<ContractList>({ queryKey: ["contracts"] }, (list) => {
+        if (!list || !list.items.some((c) => c.id === id)) return list;
+        onPage = true;
+        const items =
+          change.op === "upsert"
+            ? list.items.map((c) => (c.id === id ? change.contract : c))
+            : list.items.filter((c) => c.id !== id);
+        return { ...list, items };
+      });
+      // Rows already on screen are patched in place and re-ranked on the
+      // next fetch; anything else (a new contract) needs the server now.
+      qc.invalidateQueries({
+        queryKey: ["contracts"],
+        refetchType: onPage ? "none" : "active",
+      });
+    });
+  }, [isAuthed, qc]);
+
   useEffect(() => {
     const handler = () =>
       setIsAuthed(Boolean(localStorage.getItem("auth_token")));
@@ -732,7 +765,7 @@ export default function ContractsPage({
                               aria-label="Mark as sold"
                               onClick={async () => {
                                 try {
-                                  await markContractSold(c.id);
+                                  await markContractSold(c.id, c.version);
                                   qc.invalidateQueries({
                                     queryKey: ["contracts"],
                                   });
@@ -800,10 +833,10 @@ export default function ContractsPage({
           </Grid>
         </Stack>
       )}
-      {data && data.total > data.page_size ? (
+      {data && total !== null && total > data.page_size ? (
         <Stack alignItems="center" sx={{ pt: 1 }}>
           <Pagination
-            count={Math.max(1, Math.ceil(data.total / data.page_size))}
+            count={Math.max(1, Math.ceil(total / data.page_size))}
             page={page}
             onChange={(_, value) => setPage(value)}
             color="primary"